@@ -4,6 +4,9 @@ MAX_CHUNK_SIZE = 3900
 MAX_CHUNK_OVERLAP = 200
 NUM_OUTPUTS = 256
 
+# default number of pooled keep-alive HTTP connections (same as requests)
+DEFAULT_POOL_SIZE = 10
+
 
 INDEX_STRUCT_KEY = "index_struct"
 DOCSTORE_KEY = "docstore"
@@ -172,6 +172,19 @@ class DocumentStore(DataClassJsonMixin):
         """Get the stored hash for a document, if it exists."""
         return self.ref_doc_info[doc_id].get("doc_hash", None)
 
+    def get_ref_doc_hashes(self) -> Dict[str, str]:
+        """Get the stored hashes of all reference documents.
+
+        Nodes stored in the docstore are excluded, so this only returns hashes
+        of the source documents the nodes were parsed from.
+
+        """
+        return {
+            doc_id: info["doc_hash"]
+            for doc_id, info in self.ref_doc_info.items()
+            if "doc_hash" in info and doc_id not in self.docs
+        }
+
     def document_exists(self, doc_id: str) -> bool:
         """Check if document exists."""
         return doc_id in self.docs
@@ -1,18 +1,25 @@
 """Base embeddings file."""
 
 import asyncio
+import hashlib
+import logging
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Callable, Coroutine, List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple, cast
 
 import numpy as np
 
-from gpt_index.utils import globals_helper
+from gpt_index.embeddings.cache import BaseEmbeddingCache
+from gpt_index.utils import AdaptiveBackoff, globals_helper
+
+logger = logging.getLogger(__name__)
 
 # TODO: change to numpy array
 EMB_TYPE = List
 
 DEFAULT_EMBED_BATCH_SIZE = 10
+DEFAULT_MAX_RETRIES = 6
 
 
 class SimilarityMode(str, Enum):
@@ -46,9 +53,34 @@ def similarity(
 
 
 class BaseEmbedding:
-    """Base class for embeddings."""
-
-    def __init__(self, embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE) -> None:
+    """Base class for embeddings.
+
+    Args:
+        embed_batch_size (int): Maximum number of texts to embed per API call.
+        embed_batch_max_tokens (Optional[int]): Maximum number of tokens to embed
+            per API call. If set, texts are batched by cumulative token count,
+            capped at `embed_batch_size` texts per batch. A text longer than
+            this limit is embedded in a batch of its own. Defaults to None.
+        embedding_cache (Optional[BaseEmbeddingCache]): Optional cache for text
+            embeddings, keyed by model name and text hash. If set, cached texts
+            are not re-embedded, and duplicate texts are embedded once.
+        num_workers (Optional[int]): Maximum number of batches embedded
+            concurrently. For queued text embeddings, sync calls use a thread pool
+            of this size, and async calls are limited by a semaphore.
+            Defaults to None (sync calls are serial, async calls are unbounded).
+        max_retries (int): Maximum number of tries per batch when the embedding
+            API throttles requests. Throttled batches back off adaptively.
+
+    """
+
+    def __init__(
+        self,
+        embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+        embed_batch_max_tokens: Optional[int] = None,
+        embedding_cache: Optional[BaseEmbeddingCache] = None,
+        num_workers: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
         """Init params."""
         self._total_tokens_used = 0
         self._last_token_usage: Optional[int] = None
@@ -58,6 +90,22 @@ class BaseEmbedding:
         if embed_batch_size <= 0:
             raise ValueError("embed_batch_size must be > 0")
         self._embed_batch_size = embed_batch_size
+        if embed_batch_max_tokens is not None and embed_batch_max_tokens <= 0:
+            raise ValueError("embed_batch_max_tokens must be > 0")
+        self._embed_batch_max_tokens = embed_batch_max_tokens
+        self._embedding_cache = embedding_cache
+        self._cache_hits = 0
+        self._cache_misses = 0
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
+        self._num_workers = num_workers
+        self._max_retries = max_retries
+        self._backoff = AdaptiveBackoff()
+
+    @property
+    def model_name(self) -> str:
+        """Get the name of the embedding model, used in embedding cache keys."""
+        return type(self).__name__
 
     @abstractmethod
     def _get_query_embedding(self, query: str) -> List[float]:
@@ -70,6 +118,57 @@ class BaseEmbedding:
         self._total_tokens_used += query_tokens_count
         return query_embedding
 
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        """Asynchronously get query embedding.
+
+        By default, this falls back to _get_query_embedding.
+        Meant to be overriden if there is a true async implementation.
+
+        """
+        return self._get_query_embedding(query)
+
+    async def aget_query_embedding(self, query: str) -> List[float]:
+        """Asynchronously get query embedding."""
+        query_embedding = await self._aget_query_embedding(query)
+        query_tokens_count = len(self._tokenizer(query))
+        self._total_tokens_used += query_tokens_count
+        return query_embedding
+
+    def _get_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Get query embeddings.
+
+        By default, this is a wrapper around _get_query_embedding.
+        Meant to be overriden for batch queries.
+
+        """
+        return [self._get_query_embedding(query) for query in queries]
+
+    def get_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Get query embeddings for a batch of queries."""
+        query_embeddings = self._get_query_embeddings(queries)
+        for query in queries:
+            self._total_tokens_used += len(self._tokenizer(query))
+        return query_embeddings
+
+    async def _aget_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Asynchronously get query embeddings.
+
+        By default, this is a wrapper around _aget_query_embedding.
+        Meant to be overriden for batch queries.
+
+        """
+        result = await asyncio.gather(
+            *[self._aget_query_embedding(query) for query in queries]
+        )
+        return result
+
+    async def aget_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Asynchronously get query embeddings for a batch of queries."""
+        query_embeddings = await self._aget_query_embeddings(queries)
+        for query in queries:
+            self._total_tokens_used += len(self._tokenizer(query))
+        return query_embeddings
+
     def get_agg_embedding_from_queries(
         self,
         queries: List[str],
@@ -80,6 +179,18 @@ class BaseEmbedding:
         agg_fn = agg_fn or mean_agg
         return agg_fn(query_embeddings)
 
+    async def aget_agg_embedding_from_queries(
+        self,
+        queries: List[str],
+        agg_fn: Optional[Callable[..., List[float]]] = None,
+    ) -> List[float]:
+        """Asynchronously get aggregated embedding from multiple queries."""
+        query_embeddings = await asyncio.gather(
+            *[self.aget_query_embedding(query) for query in queries]
+        )
+        agg_fn = agg_fn or mean_agg
+        return agg_fn(query_embeddings)
+
     @abstractmethod
     def _get_text_embedding(self, text: str) -> List[float]:
         """Get text embedding."""
@@ -117,11 +228,160 @@ class BaseEmbedding:
 
     def get_text_embedding(self, text: str) -> List[float]:
         """Get text embedding."""
+        cached_embeddings, texts_to_embed = self._lookup_embedding_cache([text])
+        if len(texts_to_embed) == 0:
+            return cast(List[float], cached_embeddings[0])
         text_embedding = self._get_text_embedding(text)
         text_tokens_count = len(self._tokenizer(text))
         self._total_tokens_used += text_tokens_count
+        self._update_embedding_cache(
+            [text], cached_embeddings, texts_to_embed, [text_embedding]
+        )
         return text_embedding
 
+    def _get_embedding_cache_key(self, text: str) -> str:
+        """Get embedding cache key for text."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{text_hash}"
+
+    def _lookup_embedding_cache(
+        self, texts: List[str]
+    ) -> Tuple[List[Optional[List[float]]], List[str]]:
+        """Look up texts in the embedding cache.
+
+        Returns the cached embedding (or None) for each text, and the texts
+        that still need to be embedded. If a cache is set, the texts to embed
+        are deduplicated.
+
+        """
+        if self._embedding_cache is None:
+            return [None] * len(texts), texts
+
+        keys = [self._get_embedding_cache_key(text) for text in texts]
+        cached_embeddings = self._embedding_cache.get_many(keys)
+        # dict keeps insertion order, so this dedupes and keeps queue order
+        texts_to_embed = list(
+            {
+                text: None
+                for text, embedding in zip(texts, cached_embeddings)
+                if embedding is None
+            }
+        )
+        self._cache_misses += len(texts_to_embed)
+        self._cache_hits += len(texts) - len(texts_to_embed)
+        return cached_embeddings, texts_to_embed
+
+    def _update_embedding_cache(
+        self,
+        texts: List[str],
+        cached_embeddings: List[Optional[List[float]]],
+        texts_to_embed: List[str],
+        new_embeddings: List[List[float]],
+    ) -> List[List[float]]:
+        """Add new embeddings to the embedding cache.
+
+        Returns the embedding for each text in `texts`, merging cached
+        embeddings with the newly computed ones.
+
+        """
+        if self._embedding_cache is None:
+            # nothing was cached, every text was embedded
+            return new_embeddings
+
+        new_embedding_dict = dict(zip(texts_to_embed, new_embeddings))
+        self._embedding_cache.put_many(
+            [
+                (self._get_embedding_cache_key(text), embedding)
+                for text, embedding in new_embedding_dict.items()
+            ]
+        )
+        return [
+            embedding if embedding is not None else new_embedding_dict[text]
+            for text, embedding in zip(texts, cached_embeddings)
+        ]
+
+    def _is_throttling_error(self, error: Exception) -> bool:
+        """Check whether an error means the embedding API throttled a request.
+
+        Throttled requests are retried with an adaptive backoff.
+        Meant to be overriden by embedding models that can be throttled.
+
+        """
+        return False
+
+    def _get_text_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts to embed into batches, and count their tokens.
+
+        A batch is flushed once it holds `embed_batch_size` texts, or once the
+        next text would push it over `embed_batch_max_tokens`.
+
+        """
+        text_batches: List[List[str]] = []
+        cur_batch: List[str] = []
+        cur_batch_tokens = 0
+        for text in texts:
+            text_tokens_count = len(self._tokenizer(text))
+            self._total_tokens_used += text_tokens_count
+            if cur_batch and (
+                len(cur_batch) == self._embed_batch_size
+                or (
+                    self._embed_batch_max_tokens is not None
+                    and cur_batch_tokens + text_tokens_count
+                    > self._embed_batch_max_tokens
+                )
+            ):
+                # flush
+                text_batches.append(cur_batch)
+                cur_batch = []
+                cur_batch_tokens = 0
+            cur_batch.append(text)
+            cur_batch_tokens += text_tokens_count
+        if cur_batch:
+            text_batches.append(cur_batch)
+        return text_batches
+
+    def _get_text_embeddings_with_backoff(self, texts: List[str]) -> List[List[float]]:
+        """Get text embeddings, backing off and retrying if throttled."""
+        tries = 0
+        while True:
+            self._backoff.wait()
+            try:
+                embeddings = self._get_text_embeddings(texts)
+            except Exception as e:
+                tries += 1
+                if not self._is_throttling_error(e) or tries >= self._max_retries:
+                    raise
+                self._backoff.on_throttle()
+                logger.warning(
+                    "Embedding request throttled, backing off %.1fs",
+                    self._backoff.backoff_secs,
+                )
+                continue
+            self._backoff.on_success()
+            return embeddings
+
+    async def _aget_text_embeddings_with_backoff(
+        self, texts: List[str]
+    ) -> List[List[float]]:
+        """Asynchronously get text embeddings, backing off and retrying if throttled."""
+        tries = 0
+        while True:
+            await asyncio.sleep(self._backoff.get_wait_secs())
+            try:
+                embeddings = await self._aget_text_embeddings(texts)
+            except Exception as e:
+                tries += 1
+                if not self._is_throttling_error(e) or tries >= self._max_retries:
+                    raise
+                self._backoff.on_throttle()
+                logger.warning(
+                    "Embedding request throttled, backing off %.1fs",
+                    self._backoff.backoff_secs,
+                )
+                continue
+            self._backoff.on_success()
+            return embeddings
+
     def queue_text_for_embeddding(self, text_id: str, text: str) -> None:
         """Queue text for embedding.
 
@@ -137,22 +397,28 @@ class BaseEmbedding:
 
         """
         text_queue = self._text_queue
-        cur_batch: List[Tuple[str, str]] = []
-        result_ids: List[str] = []
-        result_embeddings: List[List[float]] = []
-        for idx, (text_id, text) in enumerate(text_queue):
-            cur_batch.append((text_id, text))
-            text_tokens_count = len(self._tokenizer(text))
-            self._total_tokens_used += text_tokens_count
-            if idx == len(text_queue) - 1 or len(cur_batch) == self._embed_batch_size:
-                # flush
-                cur_batch_ids = [text_id for text_id, _ in cur_batch]
-                cur_batch_texts = [text for _, text in cur_batch]
-                embeddings = self._get_text_embeddings(cur_batch_texts)
-                result_ids.extend(cur_batch_ids)
-                result_embeddings.extend(embeddings)
+        result_ids = [text_id for text_id, _ in text_queue]
+        texts = [text for _, text in text_queue]
+        cached_embeddings, texts_to_embed = self._lookup_embedding_cache(texts)
+
+        text_batches = self._get_text_batches(texts_to_embed)
+        if self._num_workers is None or self._num_workers == 1:
+            batch_embeddings = [
+                self._get_text_embeddings_with_backoff(text_batch)
+                for text_batch in text_batches
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=self._num_workers) as executor:
+                batch_embeddings = list(
+                    executor.map(self._get_text_embeddings_with_backoff, text_batches)
+                )
+        new_embeddings = [
+            embedding for embeddings in batch_embeddings for embedding in embeddings
+        ]
 
-                cur_batch = []
+        result_embeddings = self._update_embedding_cache(
+            texts, cached_embeddings, texts_to_embed, new_embeddings
+        )
 
         # reset queue
         self._text_queue = []
@@ -167,29 +433,28 @@ class BaseEmbedding:
         Argument `text_queue` must be passed in to avoid updating it async.
 
         """
-        cur_batch: List[Tuple[str, str]] = []
-        result_ids: List[str] = []
-        result_embeddings: List[List[float]] = []
-        embeddings_coroutines: List[Coroutine] = []
-        for idx, (text_id, text) in enumerate(text_queue):
-            cur_batch.append((text_id, text))
-            text_tokens_count = len(self._tokenizer(text))
-            self._total_tokens_used += text_tokens_count
-            if idx == len(text_queue) - 1 or len(cur_batch) == self._embed_batch_size:
-                # flush
-                cur_batch_ids = [text_id for text_id, _ in cur_batch]
-                cur_batch_texts = [text for _, text in cur_batch]
-                embeddings_coroutines.append(
-                    self._aget_text_embeddings(cur_batch_texts)
-                )
-                result_ids.extend(cur_batch_ids)
+        result_ids = [text_id for text_id, _ in text_queue]
+        texts = [text for _, text in text_queue]
+        cached_embeddings, texts_to_embed = self._lookup_embedding_cache(texts)
+
+        text_batches = self._get_text_batches(texts_to_embed)
+        semaphore = asyncio.Semaphore(self._num_workers or max(len(text_batches), 1))
+
+        async def _aget_batch_embeddings(text_batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._aget_text_embeddings_with_backoff(text_batch)
 
         # flatten the results of asyncio.gather, which is a list of embeddings lists
-        result_embeddings = [
+        new_embeddings = [
             embedding
-            for embeddings in await asyncio.gather(*embeddings_coroutines)
+            for embeddings in await asyncio.gather(
+                *[_aget_batch_embeddings(text_batch) for text_batch in text_batches]
+            )
             for embedding in embeddings
         ]
+        result_embeddings = self._update_embedding_cache(
+            texts, cached_embeddings, texts_to_embed, new_embeddings
+        )
 
         return result_ids, result_embeddings
 
@@ -207,6 +472,16 @@ class BaseEmbedding:
         """Get the total tokens used so far."""
         return self._total_tokens_used
 
+    @property
+    def cache_hits(self) -> int:
+        """Get the number of texts served from the embedding cache."""
+        return self._cache_hits
+
+    @property
+    def cache_misses(self) -> int:
+        """Get the number of texts embedded because of embedding cache misses."""
+        return self._cache_misses
+
     @property
     def last_token_usage(self) -> int:
         """Get the last token usage."""
@@ -0,0 +1,169 @@
+"""Embedding cache.
+
+Caches text embeddings, keyed by embedding model name and text hash, so that
+re-indexing unchanged (or duplicate) text does not call the embedding model again.
+
+"""
+
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_LRU_SIZE = 10000
+# max number of bound parameters per sqlite statement
+SQLITE_MAX_VARIABLES = 500
+
+
+class BaseEmbeddingCache(ABC):
+    """Base embedding cache."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get embedding for key, or None if the key is not cached."""
+
+    @abstractmethod
+    def put(self, key: str, embedding: List[float]) -> None:
+        """Put embedding for key."""
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Get embeddings for keys.
+
+        By default, this is a wrapper around get.
+
+        """
+        return [self.get(key) for key in keys]
+
+    def put_many(self, items: Sequence[Tuple[str, List[float]]]) -> None:
+        """Put embeddings for keys.
+
+        By default, this is a wrapper around put.
+
+        """
+        for key, embedding in items:
+            self.put(key, embedding)
+
+
+class InMemoryEmbeddingCache(BaseEmbeddingCache):
+    """In-memory LRU embedding cache.
+
+    Args:
+        max_size (int): Maximum number of embeddings to keep.
+            Least recently used embeddings are evicted first.
+
+    """
+
+    def __init__(self, max_size: int = DEFAULT_LRU_SIZE) -> None:
+        """Init params."""
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        self._max_size = max_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get embedding for key."""
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+
+    def put(self, key: str, embedding: List[float]) -> None:
+        """Put embedding for key."""
+        with self._lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Get number of cached embeddings."""
+        return len(self._cache)
+
+
+class SQLiteEmbeddingCache(BaseEmbeddingCache):
+    """SQLite embedding cache.
+
+    Embeddings are persisted in a local SQLite file as float32 blobs, so the
+    cache survives across processes. An in-memory LRU cache sits in front of
+    the SQLite file.
+
+    Args:
+        path (str): Path to the SQLite file. Use ":memory:" for a
+            non-persistent cache.
+        lru_size (int): Size of the in-memory LRU cache. Set to 0 to disable.
+
+    """
+
+    def __init__(self, path: str, lru_size: int = DEFAULT_LRU_SIZE) -> None:
+        """Init params."""
+        self._path = path
+        self._lru = InMemoryEmbeddingCache(lru_size) if lru_size > 0 else None
+        # NOTE: the connection is shared across threads, guarded by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get embedding for key."""
+        return self.get_many([key])[0]
+
+    def put(self, key: str, embedding: List[float]) -> None:
+        """Put embedding for key."""
+        self.put_many([(key, embedding)])
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        """Get embeddings for keys, checking the LRU cache first."""
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        missing_keys = []
+        for i, key in enumerate(keys):
+            if self._lru is not None:
+                results[i] = self._lru.get(key)
+            if results[i] is None:
+                missing_keys.append(key)
+
+        found = {}
+        with self._lock:
+            for start in range(0, len(missing_keys), SQLITE_MAX_VARIABLES):
+                batch_keys = missing_keys[start : start + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(batch_keys))
+                rows = self._conn.execute(
+                    f"SELECT key, embedding FROM embeddings "
+                    f"WHERE key IN ({placeholders})",
+                    batch_keys,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        for i, key in enumerate(keys):
+            if results[i] is None and key in found:
+                results[i] = found[key]
+                if self._lru is not None:
+                    self._lru.put(key, found[key])
+        return results
+
+    def put_many(self, items: Sequence[Tuple[str, List[float]]]) -> None:
+        """Put embeddings for keys."""
+        rows = [
+            (key, np.asarray(embedding, dtype=np.float32).tobytes())
+            for key, embedding in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                rows,
+            )
+        if self._lru is not None:
+            self._lru.put_many(items)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
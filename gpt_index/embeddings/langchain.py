@@ -21,6 +21,15 @@ class LangchainEmbedding(BaseEmbedding):
         super().__init__(**kwargs)
         self._langchain_embedding = langchain_embedding
 
+    @property
+    def model_name(self) -> str:
+        """Get the name of the wrapped embedding model."""
+        class_name = type(self._langchain_embedding).__name__
+        model_name = getattr(self._langchain_embedding, "model_name", None)
+        if model_name is None:
+            return class_name
+        return f"{class_name}:{model_name}"
+
     def _get_query_embedding(self, query: str) -> List[float]:
         """Get query embedding."""
         return self._langchain_embedding.embed_query(query)
@@ -1,10 +1,10 @@
 """OpenAI embeddings file."""
 
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import openai
-from tenacity import retry, stop_after_attempt, wait_random_exponential
+from tenacity import RetryError, retry, stop_after_attempt, wait_random_exponential
 
 from gpt_index.embeddings.base import BaseEmbedding
 
@@ -211,37 +211,73 @@ class OpenAIEmbedding(BaseEmbedding):
         self.model = OpenAIEmbeddingModelType(model)
         self.deployment_name = deployment_name
 
+    @property
+    def model_name(self) -> str:
+        """Get the name of the embedding model."""
+        if self.deployment_name is not None:
+            return self.deployment_name
+        return f"{self.model.value}:{self.mode.value}"
+
+    def _is_throttling_error(self, error: Exception) -> bool:
+        """Check whether an error means OpenAI throttled a request."""
+        last_error: Optional[BaseException] = error
+        if isinstance(error, RetryError):
+            # the embedding helpers retry on their own before giving up
+            last_error = error.last_attempt.exception()
+        return isinstance(
+            last_error,
+            (
+                openai.error.RateLimitError,
+                openai.error.ServiceUnavailableError,
+                openai.error.TryAgain,
+            ),
+        )
+
+    def _get_engine(self, mode_model_dict: Dict[Tuple[OAEM, str], OAEMM]) -> str:
+        """Get the engine for the mode and model, or the deployment name."""
+        if self.deployment_name is not None:
+            return self.deployment_name
+        key = (self.mode, self.model)
+        if key not in mode_model_dict:
+            raise ValueError(f"Invalid mode, model combination: {key}")
+        return mode_model_dict[key]
+
+    def _get_query_engine(self) -> str:
+        """Get the engine used to embed queries."""
+        return self._get_engine(_QUERY_MODE_MODEL_DICT)
+
+    def _get_text_engine(self) -> str:
+        """Get the engine used to embed texts."""
+        return self._get_engine(_TEXT_MODE_MODEL_DICT)
+
     def _get_query_embedding(self, query: str) -> List[float]:
         """Get query embedding."""
-        if self.deployment_name is not None:
-            engine = self.deployment_name
-        else:
-            key = (self.mode, self.model)
-            if key not in _QUERY_MODE_MODEL_DICT:
-                raise ValueError(f"Invalid mode, model combination: {key}")
-            engine = _QUERY_MODE_MODEL_DICT[key]
+        engine = self._get_query_engine()
         return get_embedding(query, engine=engine)
 
+    def _get_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Get query embeddings in a single batched call."""
+        engine = self._get_query_engine()
+        return get_embeddings(queries, engine=engine)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        """Asynchronously get query embedding."""
+        engine = self._get_query_engine()
+        return await aget_embedding(query, engine=engine)
+
+    async def _aget_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Asynchronously get query embeddings in a single batched call."""
+        engine = self._get_query_engine()
+        return await aget_embeddings(queries, engine=engine)
+
     def _get_text_embedding(self, text: str) -> List[float]:
         """Get text embedding."""
-        if self.deployment_name is not None:
-            engine = self.deployment_name
-        else:
-            key = (self.mode, self.model)
-            if key not in _TEXT_MODE_MODEL_DICT:
-                raise ValueError(f"Invalid mode, model combination: {key}")
-            engine = _TEXT_MODE_MODEL_DICT[key]
+        engine = self._get_text_engine()
         return get_embedding(text, engine=engine)
 
     async def _aget_text_embedding(self, text: str) -> List[float]:
         """Asynchronously get text embedding."""
-        if self.deployment_name is not None:
-            engine = self.deployment_name
-        else:
-            key = (self.mode, self.model)
-            if key not in _TEXT_MODE_MODEL_DICT:
-                raise ValueError(f"Invalid mode, model combination: {key}")
-            engine = _TEXT_MODE_MODEL_DICT[key]
+        engine = self._get_text_engine()
         return await aget_embedding(text, engine=engine)
 
     def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -251,24 +287,17 @@ class OpenAIEmbedding(BaseEmbedding):
         Can be overriden for batch queries.
 
         """
-        if self.deployment_name is not None:
-            engine = self.deployment_name
-        else:
-            key = (self.mode, self.model)
-            if key not in _TEXT_MODE_MODEL_DICT:
-                raise ValueError(f"Invalid mode, model combination: {key}")
-            engine = _TEXT_MODE_MODEL_DICT[key]
-        embeddings = get_embeddings(texts, engine=engine)
+        engine = self._get_text_engine()
+        # NOTE: batches are retried with the adaptive backoff of BaseEmbedding,
+        # so call get_embeddings without its own tenacity retries
+        embeddings = get_embeddings.__wrapped__(texts, engine=engine)  # type: ignore
         return embeddings
 
     async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Asynchronously get text embeddings."""
-        if self.deployment_name is not None:
-            engine = self.deployment_name
-        else:
-            key = (self.mode, self.model)
-            if key not in _TEXT_MODE_MODEL_DICT:
-                raise ValueError(f"Invalid mode, model combination: {key}")
-            engine = _TEXT_MODE_MODEL_DICT[key]
-        embeddings = await aget_embeddings(texts, engine=engine)
+        engine = self._get_text_engine()
+        # NOTE: see _get_text_embeddings on why retries are skipped here
+        embeddings = await aget_embeddings.__wrapped__(  # type: ignore
+            texts, engine=engine
+        )
         return embeddings
@@ -2,7 +2,18 @@
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from gpt_index.constants import DOCSTORE_KEY, INDEX_STRUCT_KEY
 from gpt_index.data_structs.data_structs_v2 import V2IndexStruct
@@ -16,11 +27,14 @@ from gpt_index.indices.service_context import ServiceContext
 from gpt_index.readers.schema.base import Document
 from gpt_index.response.schema import RESPONSE_TYPE
 from gpt_index.token_counter.token_counter import llm_token_counter
+from gpt_index.utils import iter_batch
 
 IS = TypeVar("IS", bound=V2IndexStruct)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_INSERT_BATCH_SIZE = 100
+
 
 # map from mode to query class
 QueryMap = Dict[str, Type[BaseGPTIndexQuery]]
@@ -104,6 +118,44 @@ class BaseGPTIndex(Generic[IS], ABC):
             **kwargs,
         )
 
+    @classmethod
+    def from_document_iter(
+        cls,
+        documents: Iterable[Document],
+        batch_size: int = DEFAULT_INSERT_BATCH_SIZE,
+        docstore: Optional[DocumentStore] = None,
+        service_context: Optional[ServiceContext] = None,
+        **kwargs: Any,
+    ) -> "BaseGPTIndex":
+        """Create index from an iterable of documents.
+
+        Documents are pulled lazily and parsed, embedded and inserted in batches
+        of `batch_size`, so only one batch of documents (and their nodes) is
+        materialized at a time. The index is built from the first batch, and
+        the remaining batches are inserted with `insert_iter`.
+
+        NOTE: for indices whose structure depends on seeing all nodes at once
+        (e.g. the tree index), this gives the same result as building from
+        the first batch and then inserting the rest.
+
+        Args:
+            documents (Iterable[Document]): Documents to build the index from,
+                e.g. a generator over a reader.
+            batch_size (int): Number of documents to parse and insert at a time.
+
+        """
+        document_batches = iter_batch(documents, batch_size)
+        first_batch: List[Document] = next(iter(document_batches), [])
+        index = cls.from_documents(
+            first_batch,
+            docstore=docstore,
+            service_context=service_context,
+            **kwargs,
+        )
+        for document_batch in document_batches:
+            index._insert_document_batch(document_batch)
+        return index
+
     @property
     def index_struct(self) -> IS:
         """Get the index struct."""
@@ -143,6 +195,56 @@ class BaseGPTIndex(Generic[IS], ABC):
         nodes = self.service_context.node_parser.get_nodes_from_documents([document])
         self.insert_nodes(nodes, **insert_kwargs)
 
+    async def _ainsert(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
+        """Asynchronously insert nodes to the index struct.
+
+        Defaults to the sync `_insert`; indices override this to await
+        their LLM calls.
+
+        """
+        self._insert(nodes, **insert_kwargs)
+
+    @llm_token_counter("insert")
+    async def ainsert_nodes(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
+        """Asynchronously insert nodes."""
+        self.docstore.add_documents(nodes, allow_update=True)
+        await self._ainsert(nodes, **insert_kwargs)
+
+    async def ainsert(self, document: Document, **insert_kwargs: Any) -> None:
+        """Asynchronously insert a document."""
+        nodes = self.service_context.node_parser.get_nodes_from_documents([document])
+        await self.ainsert_nodes(nodes, **insert_kwargs)
+
+    def insert_iter(
+        self,
+        documents: Iterable[Document],
+        batch_size: int = DEFAULT_INSERT_BATCH_SIZE,
+        **insert_kwargs: Any,
+    ) -> None:
+        """Insert an iterable of documents.
+
+        Documents are pulled lazily and parsed, embedded and inserted in batches
+        of `batch_size`, so only one batch of documents (and their nodes) is
+        materialized at a time.
+
+        Args:
+            documents (Iterable[Document]): Documents to insert,
+                e.g. a generator over a reader.
+            batch_size (int): Number of documents to parse and insert at a time.
+
+        """
+        for document_batch in iter_batch(documents, batch_size):
+            self._insert_document_batch(document_batch, **insert_kwargs)
+
+    def _insert_document_batch(
+        self, documents: Sequence[Document], **insert_kwargs: Any
+    ) -> None:
+        """Parse a batch of documents and insert their nodes."""
+        for doc in documents:
+            self._docstore.set_document_hash(doc.get_doc_id(), doc.get_doc_hash())
+        nodes = self.service_context.node_parser.get_nodes_from_documents(documents)
+        self.insert_nodes(nodes, **insert_kwargs)
+
     @abstractmethod
     def _delete(self, doc_id: str, **delete_kwargs: Any) -> None:
         """Delete a document."""
@@ -159,6 +261,28 @@ class BaseGPTIndex(Generic[IS], ABC):
         logger.debug(f"> Deleting document: {doc_id}")
         self._delete(doc_id, **delete_kwargs)
 
+    def _delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete documents.
+
+        By default, this deletes each document separately.
+        Meant to be overriden by indices that can delete many documents at once.
+
+        """
+        for doc_id in doc_ids:
+            self._delete(doc_id, **delete_kwargs)
+
+    def delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete documents from the index.
+
+        All nodes in the index related to the documents will be deleted.
+
+        Args:
+            doc_ids (Sequence[str]): document ids
+
+        """
+        logger.debug(f"> Deleting {len(doc_ids)} documents")
+        self._delete_many(doc_ids, **delete_kwargs)
+
     def update(self, document: Document, **update_kwargs: Any) -> None:
         """Update a document.
 
@@ -170,27 +294,90 @@ class BaseGPTIndex(Generic[IS], ABC):
             delete_kwargs (Dict): kwargs to pass to delete
 
         """
-        self.delete(document.get_doc_id(), **update_kwargs.pop("delete_kwargs", {}))
-        self.insert(document, **update_kwargs.pop("insert_kwargs", {}))
+        self._update_document_batch(
+            [document],
+            delete_kwargs=update_kwargs.pop("delete_kwargs", {}),
+            insert_kwargs=update_kwargs.pop("insert_kwargs", {}),
+        )
+
+    def _update_document_batch(
+        self,
+        documents: Sequence[Document],
+        delete_kwargs: Optional[Dict] = None,
+        insert_kwargs: Optional[Dict] = None,
+    ) -> None:
+        """Replace the stored versions of a batch of documents.
+
+        By default, this deletes the stored versions and inserts the new ones.
+        Meant to be overriden by indices that can reuse work from the stored
+        versions.
+
+        """
+        self.delete_many(
+            [doc.get_doc_id() for doc in documents], **(delete_kwargs or {})
+        )
+        self._insert_document_batch(documents, **(insert_kwargs or {}))
 
     def refresh(
-        self, documents: Sequence[Document], **update_kwargs: Any
+        self,
+        documents: Sequence[Document],
+        delete_removed: bool = False,
+        batch_size: int = DEFAULT_INSERT_BATCH_SIZE,
+        **update_kwargs: Any,
     ) -> List[bool]:
         """Refresh an index with documents that have changed.
 
         This allows users to save LLM and Embedding model calls, while only
         updating documents that have any changes in text or extra_info. It
         will also insert any documents that previously were not stored.
+
+        Changes are detected against the stored document hashes in one pass.
+        Removed documents are deleted at once, and the changed and new
+        documents are replaced in batches of `batch_size`
+        (e.g. so that their embeddings are computed in batches).
+
+        Args:
+            documents (Sequence[Document]): documents to refresh.
+            delete_removed (bool): also delete documents that were previously
+                inserted, but are not in `documents`. Only use this when
+                `documents` is the full set of source documents of the index
+                (and the docstore is not shared with other indices).
+            batch_size (int): Number of documents to parse and insert at a time.
+            insert_kwargs (Dict): kwargs to pass to insert
+            delete_kwargs (Dict): kwargs to pass to delete
+
+        Returns:
+            List[bool]: whether each document was refreshed.
+
         """
-        refreshed_documents = [False] * len(documents)
-        for i, document in enumerate(documents):
-            existing_doc_hash = self._docstore.get_document_hash(document.get_doc_id())
-            if existing_doc_hash != document.get_doc_hash():
-                self.update(document, **update_kwargs)
-                refreshed_documents[i] = True
-            elif existing_doc_hash is None:
-                self.insert(document, **update_kwargs.pop("insert_kwargs", {}))
-                refreshed_documents[i] = True
+        delete_kwargs = update_kwargs.pop("delete_kwargs", {})
+        insert_kwargs = update_kwargs.pop("insert_kwargs", {})
+        existing_doc_hashes = self._docstore.get_ref_doc_hashes()
+
+        refreshed_documents = []
+        documents_to_update = []
+        for document in documents:
+            existing_doc_hash = existing_doc_hashes.get(document.get_doc_id())
+            is_refreshed = existing_doc_hash != document.get_doc_hash()
+            refreshed_documents.append(is_refreshed)
+            if is_refreshed:
+                documents_to_update.append(document)
+
+        if delete_removed:
+            doc_ids = {document.get_doc_id() for document in documents}
+            removed_doc_ids = [
+                doc_id for doc_id in existing_doc_hashes if doc_id not in doc_ids
+            ]
+            self.delete_many(removed_doc_ids, **delete_kwargs)
+            for doc_id in removed_doc_ids:
+                self._docstore.delete_document(doc_id, raise_error=False)
+
+        # NOTE: new documents go through the same path as changed documents,
+        # deleting their (non-existent) stored versions is a no-op
+        for document_batch in iter_batch(documents_to_update, batch_size):
+            self._update_document_batch(
+                document_batch, delete_kwargs=delete_kwargs, insert_kwargs=insert_kwargs
+            )
 
         return refreshed_documents
 
@@ -234,23 +421,8 @@ class BaseGPTIndex(Generic[IS], ABC):
 
 
         """
-        mode_enum = QueryMode(mode)
-        self._preprocess_query(mode_enum, query_kwargs)
-        # TODO: pass in query config directly
-        query_config = QueryConfig(
-            index_struct_type=self._index_struct.get_type(),
-            query_mode=mode_enum,
-            query_kwargs=query_kwargs,
-        )
-        query_runner = QueryRunner(
-            index_struct=self._index_struct,
-            service_context=self._service_context,
-            query_context={self._index_struct.index_id: self.query_context},
-            docstore=self._docstore,
-            query_configs=[query_config],
-            query_transform=query_transform,
-            recursive=False,
-            use_async=use_async,
+        query_runner = self._get_query_runner(
+            mode, query_transform, use_async, query_kwargs
         )
         return query_runner.query(query_str)
 
@@ -272,12 +444,24 @@ class BaseGPTIndex(Generic[IS], ABC):
 
 
         """
-        # TODO: currently we don't have async versions of all
-        # underlying functions. Setting use_async=True
-        # will cause async nesting errors because we assume
-        # it's called in a synchronous setting.
+        # NOTE: retrieval, postprocessing and synthesis are awaited end to end.
+        # `use_async` only makes synchronous code paths run their LLM calls
+        # concurrently (in a new event loop), which would nest event loops here.
         use_async = False
 
+        query_runner = self._get_query_runner(
+            mode, query_transform, use_async, query_kwargs
+        )
+        return await query_runner.aquery(query_str)
+
+    def _get_query_runner(
+        self,
+        mode: str,
+        query_transform: Optional[BaseQueryTransform],
+        use_async: bool,
+        query_kwargs: Dict[str, Any],
+    ) -> QueryRunner:
+        """Get query runner over this index."""
         mode_enum = QueryMode(mode)
         self._preprocess_query(mode_enum, query_kwargs)
         # TODO: pass in query config directly
@@ -286,7 +470,7 @@ class BaseGPTIndex(Generic[IS], ABC):
             query_mode=mode_enum,
             query_kwargs=query_kwargs,
         )
-        query_runner = QueryRunner(
+        return QueryRunner(
             index_struct=self._index_struct,
             service_context=self._service_context,
             query_context={self._index_struct.index_id: self.query_context},
@@ -296,7 +480,44 @@ class BaseGPTIndex(Generic[IS], ABC):
             recursive=False,
             use_async=use_async,
         )
-        return await query_runner.aquery(query_str)
+
+    def query_batch(
+        self,
+        query_strs: Sequence[Union[str, QueryBundle]],
+        mode: str = QueryMode.DEFAULT,
+        query_transform: Optional[BaseQueryTransform] = None,
+        use_async: bool = False,
+        **query_kwargs: Any,
+    ) -> List[RESPONSE_TYPE]:
+        """Answer a batch of queries.
+
+        Same as `query`, but for many queries at once. For indices that support
+        it (e.g. vector store indices), all queries are embedded in one call
+        and retrieved with a single similarity computation. Responses are then
+        synthesized concurrently if `use_async` is set, and sequentially
+        otherwise.
+
+        """
+        # the query objects decide how to synthesize the batch
+        query_kwargs["use_async"] = use_async
+        query_runner = self._get_query_runner(
+            mode, query_transform, use_async, query_kwargs
+        )
+        return query_runner.query_batch(query_strs)
+
+    async def aquery_batch(
+        self,
+        query_strs: Sequence[Union[str, QueryBundle]],
+        mode: str = QueryMode.DEFAULT,
+        query_transform: Optional[BaseQueryTransform] = None,
+        **query_kwargs: Any,
+    ) -> List[RESPONSE_TYPE]:
+        """Asynchronously answer a batch of queries."""
+        # NOTE: see aquery on why use_async is False
+        query_runner = self._get_query_runner(
+            mode, query_transform, False, query_kwargs
+        )
+        return await query_runner.aquery_batch(query_strs)
 
     @classmethod
     @abstractmethod
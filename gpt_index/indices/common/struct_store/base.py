@@ -9,6 +9,7 @@ from gpt_index.data_structs.table import StructDatapoint
 from gpt_index.indices.response.builder import ResponseBuilder, TextChunk
 from gpt_index.indices.service_context import ServiceContext
 from gpt_index.langchain_helpers.chain_wrapper import LLMPredictor
+from gpt_index.llm_predictor.scheduler import LLMScheduler
 from gpt_index.langchain_helpers.sql_wrapper import SQLDatabase
 from gpt_index.langchain_helpers.text_splitter import TextSplitter
 from gpt_index.prompts.default_prompt_selectors import (
@@ -130,9 +131,11 @@ class BaseStructDatapointExtractor:
         llm_predictor: LLMPredictor,
         schema_extract_prompt: SchemaExtractPrompt,
         output_parser: OUTPUT_PARSER_TYPE,
+        llm_scheduler: Optional[LLMScheduler] = None,
     ) -> None:
         """Initialize params."""
         self._llm_predictor = llm_predictor
+        self._llm_scheduler = llm_scheduler or LLMScheduler()
         self._schema_extract_prompt = schema_extract_prompt
         self._output_parser = output_parser
 
@@ -168,6 +171,15 @@ class BaseStructDatapointExtractor:
     def _insert_datapoint(self, datapoint: StructDatapoint) -> None:
         """Insert datapoint into index."""
 
+    def _insert_datapoints(self, datapoints: Sequence[StructDatapoint]) -> None:
+        """Insert datapoints into index.
+
+        Subclasses can override this to insert datapoints in bulk.
+
+        """
+        for datapoint in datapoints:
+            self._insert_datapoint(datapoint)
+
     @abstractmethod
     def _get_col_types_map(self) -> Dict[str, type]:
         """Get col types map for schema."""
@@ -176,8 +188,8 @@ class BaseStructDatapointExtractor:
     def _get_schema_text(self) -> str:
         """Get schema text for extracting relevant info from unstructured text."""
 
-    def insert_datapoint_from_nodes(self, nodes: Sequence[Node]) -> None:
-        """Extract datapoint from a document and insert it."""
+    def _get_datapoint_from_nodes(self, nodes: Sequence[Node]) -> StructDatapoint:
+        """Extract datapoint from a document."""
         text_chunks = [node.get_text() for node in nodes]
         fields = {}
         for i, text_chunk in enumerate(text_chunks):
@@ -185,7 +197,8 @@ class BaseStructDatapointExtractor:
             logger.info(f"> Adding chunk {i}: {fmt_text_chunk}")
             # if embedding specified in document, pass it to the Node
             schema_text = self._get_schema_text()
-            response_str, _ = self._llm_predictor.predict(
+            response_str, _ = self._llm_scheduler.predict(
+                self._llm_predictor,
                 self._schema_extract_prompt,
                 text=text_chunk,
                 schema=schema_text,
@@ -196,7 +209,20 @@ class BaseStructDatapointExtractor:
             # validate fields with col_types_map
             new_cur_fields = self._clean_and_validate_fields(cur_fields)
             fields.update(new_cur_fields)
-        struct_datapoint = StructDatapoint(fields)
-        if struct_datapoint is not None:
-            self._insert_datapoint(struct_datapoint)
-            logger.debug(f"> Added datapoint: {fields}")
+        return StructDatapoint(fields)
+
+    def insert_datapoint_from_nodes(self, nodes: Sequence[Node]) -> None:
+        """Extract datapoint from a document and insert it."""
+        struct_datapoint = self._get_datapoint_from_nodes(nodes)
+        self._insert_datapoint(struct_datapoint)
+        logger.debug(f"> Added datapoint: {struct_datapoint.fields}")
+
+    def insert_datapoints_from_node_groups(
+        self, node_groups: Sequence[Sequence[Node]]
+    ) -> None:
+        """Extract one datapoint per group of nodes and insert them in bulk."""
+        struct_datapoints = [
+            self._get_datapoint_from_nodes(nodes) for nodes in node_groups
+        ]
+        self._insert_datapoints(struct_datapoints)
+        logger.debug(f"> Added {len(struct_datapoints)} datapoints")
@@ -1,6 +1,6 @@
 """SQL StructDatapointExtractor."""
 
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, Optional, Sequence, cast
 
 from sqlalchemy import Table
 
@@ -11,6 +11,7 @@ from gpt_index.indices.common.struct_store.base import (
 )
 from gpt_index.langchain_helpers.chain_wrapper import LLMPredictor
 from gpt_index.langchain_helpers.sql_wrapper import SQLDatabase
+from gpt_index.llm_predictor.scheduler import LLMScheduler
 from gpt_index.prompts.prompts import SchemaExtractPrompt
 
 
@@ -26,9 +27,15 @@ class SQLStructDatapointExtractor(BaseStructDatapointExtractor):
         table_name: Optional[str] = None,
         table: Optional[Table] = None,
         ref_doc_id_column: Optional[str] = None,
+        llm_scheduler: Optional[LLMScheduler] = None,
     ) -> None:
         """Initialize params."""
-        super().__init__(llm_predictor, schema_extract_prompt, output_parser)
+        super().__init__(
+            llm_predictor,
+            schema_extract_prompt,
+            output_parser,
+            llm_scheduler=llm_scheduler,
+        )
         self._sql_database = sql_database
         # currently the user must specify a table info
         if table_name is None and table is None:
@@ -63,3 +70,13 @@ class SQLStructDatapointExtractor(BaseStructDatapointExtractor):
         self._sql_database.insert_into_table(
             self._table_name, cast(Dict[Any, Any], datapoint_dict)
         )
+
+    def _insert_datapoints(self, datapoints: Sequence[StructDatapoint]) -> None:
+        """Insert datapoints into index, in bulk."""
+        self._sql_database.insert_many_into_table(
+            self._table_name,
+            [
+                cast(Dict[Any, Any], datapoint.to_dict()["fields"])
+                for datapoint in datapoints
+            ],
+        )
@@ -138,8 +138,10 @@ class GPTTreeIndexBuilder:
 
         if self._use_async:
             tasks = [
-                self._service_context.llm_predictor.apredict(
-                    self.summary_prompt, context_str=text_chunk
+                self._service_context.llm_scheduler.apredict(
+                    self._service_context.llm_predictor,
+                    self.summary_prompt,
+                    context_str=text_chunk,
                 )
                 for text_chunk in text_chunks
             ]
@@ -147,8 +149,10 @@ class GPTTreeIndexBuilder:
             summaries = [output[0] for output in outputs]
         else:
             summaries = [
-                self._service_context.llm_predictor.predict(
-                    self.summary_prompt, context_str=text_chunk
+                self._service_context.llm_scheduler.predict(
+                    self._service_context.llm_predictor,
+                    self.summary_prompt,
+                    context_str=text_chunk,
                 )[0]
                 for text_chunk in text_chunks
             ]
@@ -187,8 +191,10 @@ class GPTTreeIndexBuilder:
         )
 
         tasks = [
-            self._service_context.llm_predictor.apredict(
-                self.summary_prompt, context_str=text_chunk
+            self._service_context.llm_scheduler.apredict(
+                self._service_context.llm_predictor,
+                self.summary_prompt,
+                context_str=text_chunk,
             )
             for text_chunk in text_chunks
         ]
@@ -8,6 +8,7 @@ existing keywords in the table.
 
 """
 
+import asyncio
 from abc import abstractmethod
 from typing import Any, Optional, Sequence, Set
 
@@ -111,9 +112,15 @@ class BaseGPTKeywordTableIndex(BaseGPTIndex[KeywordTable]):
     async def _async_add_nodes_to_index(
         self, index_struct: KeywordTable, nodes: Sequence[Node]
     ) -> None:
-        """Add document to index."""
-        for n in nodes:
-            keywords = await self._async_extract_keywords(n.get_text())
+        """Add document to index.
+
+        Keywords of all nodes are extracted concurrently.
+
+        """
+        keywords_list = await asyncio.gather(
+            *[self._async_extract_keywords(n.get_text()) for n in nodes]
+        )
+        for n, keywords in zip(nodes, keywords_list):
             index_struct.add_node(list(keywords), n)
 
     def _build_index_from_nodes(self, nodes: Sequence[Node]) -> KeywordTable:
@@ -170,7 +177,8 @@ class GPTKeywordTableIndex(BaseGPTKeywordTableIndex):
 
     def _extract_keywords(self, text: str) -> Set[str]:
         """Extract keywords from text."""
-        response, _ = self._service_context.llm_predictor.predict(
+        response, _ = self._service_context.llm_scheduler.predict(
+            self._service_context.llm_predictor,
             self.keyword_extract_template,
             text=text,
         )
@@ -179,7 +187,8 @@ class GPTKeywordTableIndex(BaseGPTKeywordTableIndex):
 
     async def _async_extract_keywords(self, text: str) -> Set[str]:
         """Extract keywords from text."""
-        response, _ = await self._service_context.llm_predictor.apredict(
+        response, _ = await self._service_context.llm_scheduler.apredict(
+            self._service_context.llm_predictor,
             self.keyword_extract_template,
             text=text,
         )
@@ -11,6 +11,7 @@ existing keywords in the table.
 import logging
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from gpt_index.async_utils import run_async_tasks
 from gpt_index.data_structs.data_structs_v2 import KG
 from gpt_index.data_structs.node_v2 import Node
 from gpt_index.indices.base import BaseGPTIndex, QueryMap
@@ -36,6 +37,9 @@ class GPTKnowledgeGraphIndex(BaseGPTIndex[KG]):
         kg_triple_extract_template (KnowledgeGraphPrompt): The prompt to use for
             extracting triplets.
         max_triplets_per_chunk (int): The maximum number of triplets to extract.
+        include_embeddings (bool): Whether to embed the extracted triplets.
+        use_async (bool): Whether to use asynchronous calls, extracting the
+            triplets of all nodes concurrently. Defaults to False.
 
     """
 
@@ -48,11 +52,13 @@ class GPTKnowledgeGraphIndex(BaseGPTIndex[KG]):
         kg_triple_extract_template: Optional[KnowledgeGraphPrompt] = None,
         max_triplets_per_chunk: int = 10,
         include_embeddings: bool = False,
+        use_async: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize params."""
         # need to set parameters before building index in base class.
         self.include_embeddings = include_embeddings
+        self._use_async = use_async
         self.max_triplets_per_chunk = max_triplets_per_chunk
         self.kg_triple_extract_template = (
             kg_triple_extract_template or DEFAULT_KG_TRIPLET_EXTRACT_PROMPT
@@ -79,7 +85,17 @@ class GPTKnowledgeGraphIndex(BaseGPTIndex[KG]):
 
     def _extract_triplets(self, text: str) -> List[Tuple[str, str, str]]:
         """Extract keywords from text."""
-        response, _ = self._service_context.llm_predictor.predict(
+        response, _ = self._service_context.llm_scheduler.predict(
+            self._service_context.llm_predictor,
+            self.kg_triple_extract_template,
+            text=text,
+        )
+        return self._parse_triplet_response(response)
+
+    async def _aextract_triplets(self, text: str) -> List[Tuple[str, str, str]]:
+        """Asynchronously extract keywords from text."""
+        response, _ = await self._service_context.llm_scheduler.apredict(
+            self._service_context.llm_predictor,
             self.kg_triple_extract_template,
             text=text,
         )
@@ -97,52 +113,65 @@ class GPTKnowledgeGraphIndex(BaseGPTIndex[KG]):
             results.append((subj.strip(), pred.strip(), obj.strip()))
         return results
 
-    def _build_index_from_nodes(self, nodes: Sequence[Node]) -> KG:
-        """Build the index from nodes."""
-        # do simple concatenation
-        index_struct = KG(table={})
-        for n in nodes:
-            triplets = self._extract_triplets(n.get_text())
+    def _get_triplets_list(
+        self, nodes: Sequence[Node]
+    ) -> List[List[Tuple[str, str, str]]]:
+        """Extract the triplets of each node, concurrently if use_async."""
+        if self._use_async:
+            tasks = [self._aextract_triplets(n.get_text()) for n in nodes]
+            return run_async_tasks(tasks)
+        return [self._extract_triplets(n.get_text()) for n in nodes]
+
+    def _add_triplet_embeddings(
+        self, index_struct: KG, triplet_strs: List[str]
+    ) -> None:
+        """Embed triplets that are not embedded yet.
+
+        Triplets are de-duplicated and embedded together, so that embedding
+        batches are not limited to the triplets of a single node.
+
+        """
+        embed_model = self._service_context.embed_model
+        text_queue: List[Tuple[str, str]] = [
+            (triplet_str, triplet_str)
+            for triplet_str in dict.fromkeys(triplet_strs)
+            if triplet_str not in index_struct.embedding_dict
+        ]
+        if self._use_async:
+            embed_outputs = run_async_tasks(
+                [embed_model.aget_queued_text_embeddings(text_queue)]
+            )[0]
+        else:
+            for text_id, text in text_queue:
+                embed_model.queue_text_for_embeddding(text_id, text)
+            embed_outputs = embed_model.get_queued_text_embeddings()
+        for rel_text, rel_embed in zip(*embed_outputs):
+            index_struct.add_to_embedding_dict(rel_text, rel_embed)
+
+    def _add_nodes_to_index(self, index_struct: KG, nodes: Sequence[Node]) -> None:
+        """Add nodes to index."""
+        triplet_strs = []
+        for n, triplets in zip(nodes, self._get_triplets_list(nodes)):
             logger.debug(f"> Extracted triplets: {triplets}")
             for triplet in triplets:
                 subj, _, obj = triplet
                 index_struct.upsert_triplet(triplet)
                 index_struct.add_node([subj, obj], n)
+                triplet_strs.append(str(triplet))
 
-            if self.include_embeddings:
-                for i, triplet in enumerate(triplets):
-                    self._service_context.embed_model.queue_text_for_embeddding(
-                        str(triplet), str(triplet)
-                    )
-
-                embed_outputs = (
-                    self._service_context.embed_model.get_queued_text_embeddings()
-                )
-                for rel_text, rel_embed in zip(*embed_outputs):
-                    index_struct.add_to_embedding_dict(rel_text, rel_embed)
+        if self.include_embeddings:
+            self._add_triplet_embeddings(index_struct, triplet_strs)
 
+    def _build_index_from_nodes(self, nodes: Sequence[Node]) -> KG:
+        """Build the index from nodes."""
+        # do simple concatenation
+        index_struct = KG(table={})
+        self._add_nodes_to_index(index_struct, nodes)
         return index_struct
 
     def _insert(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
         """Insert a document."""
-        for n in nodes:
-            triplets = self._extract_triplets(n.get_text())
-            logger.debug(f"Extracted triplets: {triplets}")
-            for triplet in triplets:
-                subj, _, obj = triplet
-                triplet_str = str(triplet)
-                self._index_struct.upsert_triplet(triplet)
-                self._index_struct.add_node([subj, obj], n)
-                if (
-                    self.include_embeddings
-                    and triplet_str not in self._index_struct.embedding_dict
-                ):
-                    rel_embedding = (
-                        self._service_context.embed_model.get_text_embedding(
-                            triplet_str
-                        )
-                    )
-                    self.index_struct.add_to_embedding_dict(triplet_str, rel_embedding)
+        self._add_nodes_to_index(self._index_struct, nodes)
 
     def upsert_triplet(self, triplet: Tuple[str, str, str]) -> None:
         """Insert triplets.
@@ -93,6 +93,14 @@ class GPTListIndex(BaseGPTIndex[IndexList]):
         nodes_to_keep = [n for n in cur_nodes if n.ref_doc_id != doc_id]
         self._index_struct.nodes = [n.get_doc_id() for n in nodes_to_keep]
 
+    def _delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete documents, in a single pass over the nodes."""
+        doc_id_set = set(doc_ids)
+        cur_node_ids = self._index_struct.nodes
+        cur_nodes = self._docstore.get_nodes(cur_node_ids)
+        nodes_to_keep = [n for n in cur_nodes if n.ref_doc_id not in doc_id_set]
+        self._index_struct.nodes = [n.get_doc_id() for n in nodes_to_keep]
+
     def _preprocess_query(self, mode: QueryMode, query_kwargs: Any) -> None:
         """Preprocess query."""
         super()._preprocess_query(mode, query_kwargs)
@@ -1,12 +1,13 @@
 """Embedding query for list index."""
 import logging
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, cast
 
 from gpt_index.data_structs.data_structs_v2 import IndexList
 from gpt_index.data_structs.node_v2 import Node
 from gpt_index.indices.list.query import BaseGPTListIndexQuery
 from gpt_index.indices.query.embedding_utils import (
     SimilarityTracker,
+    aembed_nodes,
     get_top_k_embeddings,
 )
 from gpt_index.indices.query.schema import QueryBundle
@@ -53,7 +54,33 @@ class GPTListIndexEmbeddingQuery(BaseGPTListIndexQuery):
         # top k nodes
         nodes = self._docstore.get_nodes(node_ids)
         query_embedding, node_embeddings = self._get_embeddings(query_bundle, nodes)
+        return self._get_top_k_nodes(
+            nodes, query_embedding, node_embeddings, similarity_tracker
+        )
+
+    async def _aretrieve(
+        self,
+        query_bundle: QueryBundle,
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        """Asynchronously get nodes for response."""
+        node_ids = self.index_struct.nodes
+        nodes = self._docstore.get_nodes(node_ids)
+        query_embedding, node_embeddings = await self._aget_embeddings(
+            query_bundle, nodes
+        )
+        return self._get_top_k_nodes(
+            nodes, query_embedding, node_embeddings, similarity_tracker
+        )
 
+    def _get_top_k_nodes(
+        self,
+        nodes: List[Node],
+        query_embedding: List[float],
+        node_embeddings: List[List[float]],
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        """Get the top k nodes by similarity to the query embedding."""
         top_similarities, top_idxs = get_top_k_embeddings(
             query_embedding,
             node_embeddings,
@@ -91,3 +118,16 @@ class GPTListIndexEmbeddingQuery(BaseGPTListIndexQuery):
 
             node_embeddings.append(node.embedding)
         return query_bundle.embedding, node_embeddings
+
+    async def _aget_embeddings(
+        self, query_bundle: QueryBundle, nodes: List[Node]
+    ) -> Tuple[List[float], List[List[float]]]:
+        """Asynchronously get the query and node embeddings."""
+        embed_model = self._service_context.embed_model
+        if query_bundle.embedding is None:
+            query_bundle.embedding = await embed_model.aget_agg_embedding_from_queries(
+                query_bundle.embedding_strs
+            )
+        await aembed_nodes(embed_model, nodes)
+        node_embeddings = [cast(List[float], node.embedding) for node in nodes]
+        return query_bundle.embedding, node_embeddings
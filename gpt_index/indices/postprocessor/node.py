@@ -1,5 +1,6 @@
 """Node postprocessor."""
 
+import asyncio
 import re
 from abc import abstractmethod
 from typing import Dict, List, Optional, cast
@@ -28,6 +29,17 @@ class BaseNodePostprocessor(BasePostprocessor, BaseModel):
     ) -> List[Node]:
         """Postprocess nodes."""
 
+    async def apostprocess_nodes(
+        self, nodes: List[Node], extra_info: Optional[Dict] = None
+    ) -> List[Node]:
+        """Asynchronously postprocess nodes.
+
+        By default, this falls back to postprocess_nodes.
+        Meant to be overriden by postprocessors that make embedding or LLM calls.
+
+        """
+        return self.postprocess_nodes(nodes, extra_info=extra_info)
+
 
 class KeywordNodePostprocessor(BaseNodePostprocessor):
     """Keyword-based Node processor."""
@@ -83,7 +95,7 @@ class SimilarityPostprocessor(BaseNodePostprocessor):
                 similarity = cast(SimilarityTracker, similarity_tracker).find(node)
                 if similarity is None:
                     should_use_node = False
-                if cast(float, similarity) < cast(float, self.similarity_cutoff):
+                elif cast(float, similarity) < cast(float, self.similarity_cutoff):
                     should_use_node = False
 
             if should_use_node:
@@ -282,6 +294,38 @@ class AutoPrevNextNodePostprocessor(BaseNodePostprocessor):
             return "none"
         raise ValueError(f"Invalid prediction: {raw_pred}")
 
+    def _get_response_builder(self, node: Node) -> ResponseBuilder:
+        """Get response builder to infer the prev/next mode of a node."""
+        # use response builder instead of llm_predictor directly
+        # to be more robust to handling long context
+        response_builder = ResponseBuilder(
+            self.service_context,
+            QuestionAnswerPrompt(self.infer_prev_next_tmpl),
+            RefinePrompt(self.refine_prev_next_tmpl),
+        )
+        response_builder.add_text_chunks([TextChunk(node.get_text())])
+        return response_builder
+
+    def _add_nodes_for_prediction(
+        self, all_nodes: Dict[str, Node], node: Node, raw_pred: str
+    ) -> None:
+        """Add the node, and its prev/next nodes given the predicted mode."""
+        all_nodes[node.get_doc_id()] = node
+        mode = self._parse_prediction(raw_pred)
+
+        logger.debug(f"> Postprocessor Predicted mode: {mode}")
+        if self.verbose:
+            print(f"> Postprocessor Predicted mode: {mode}")
+
+        if mode == "next":
+            all_nodes.update(get_forward_nodes(node, self.num_nodes, self.docstore))
+        elif mode == "previous":
+            all_nodes.update(get_backward_nodes(node, self.num_nodes, self.docstore))
+        elif mode == "none":
+            pass
+        else:
+            raise ValueError(f"Invalid mode: {mode}")
+
     def postprocess_nodes(
         self, nodes: List[Node], extra_info: Optional[Dict] = None
     ) -> List[Node]:
@@ -291,43 +335,42 @@ class AutoPrevNextNodePostprocessor(BaseNodePostprocessor):
 
         query_bundle = cast(QueryBundle, extra_info["query_bundle"])
 
-        infer_prev_next_prompt = QuestionAnswerPrompt(
-            self.infer_prev_next_tmpl,
-        )
-        refine_infer_prev_next_prompt = RefinePrompt(self.refine_prev_next_tmpl)
-
         all_nodes: Dict[str, Node] = {}
         for node in nodes:
-            all_nodes[node.get_doc_id()] = node
-            # use response builder instead of llm_predictor directly
-            # to be more robust to handling long context
-            response_builder = ResponseBuilder(
-                self.service_context,
-                infer_prev_next_prompt,
-                refine_infer_prev_next_prompt,
-            )
-            response_builder.add_text_chunks([TextChunk(node.get_text())])
-            raw_pred = response_builder.get_response(
+            raw_pred = self._get_response_builder(node).get_response(
                 query_str=query_bundle.query_str,
                 response_mode="tree_summarize",
             )
-            raw_pred = cast(str, raw_pred)
-            mode = self._parse_prediction(raw_pred)
+            self._add_nodes_for_prediction(all_nodes, node, cast(str, raw_pred))
 
-            logger.debug(f"> Postprocessor Predicted mode: {mode}")
-            if self.verbose:
-                print(f"> Postprocessor Predicted mode: {mode}")
+        sorted_nodes = sorted(all_nodes.values(), key=lambda x: x.get_doc_id())
+        return list(sorted_nodes)
 
-            if mode == "next":
-                all_nodes.update(get_forward_nodes(node, self.num_nodes, self.docstore))
-            elif mode == "previous":
-                all_nodes.update(
-                    get_backward_nodes(node, self.num_nodes, self.docstore)
+    async def apostprocess_nodes(
+        self, nodes: List[Node], extra_info: Optional[Dict] = None
+    ) -> List[Node]:
+        """Asynchronously postprocess nodes.
+
+        The prev/next mode of every node is inferred concurrently.
+
+        """
+        if extra_info is None or "query_bundle" not in extra_info:
+            raise ValueError("Missing query bundle in extra info.")
+
+        query_bundle = cast(QueryBundle, extra_info["query_bundle"])
+
+        raw_preds = await asyncio.gather(
+            *[
+                self._get_response_builder(node).aget_response(
+                    query_str=query_bundle.query_str,
+                    response_mode="tree_summarize",
                 )
-            elif mode == "none":
-                pass
-            else:
-                raise ValueError(f"Invalid mode: {mode}")
+                for node in nodes
+            ]
+        )
+        all_nodes: Dict[str, Node] = {}
+        for node, raw_pred in zip(nodes, raw_preds):
+            self._add_nodes_for_prediction(all_nodes, node, cast(str, raw_pred))
 
         sorted_nodes = sorted(all_nodes.values(), key=lambda x: x.get_doc_id())
         return list(sorted_nodes)
@@ -12,7 +12,7 @@ from gpt_index.data_structs.node_v2 import Node
 from gpt_index.langchain_helpers.chain_wrapper import LLMPredictor
 from gpt_index.langchain_helpers.text_splitter import TokenTextSplitter
 from gpt_index.prompts.base import Prompt
-from gpt_index.utils import globals_helper
+from gpt_index.utils import count_tokens, globals_helper
 
 
 class PromptHelper:
@@ -97,8 +97,7 @@ class PromptHelper:
         Limit by embedding_limit and chunk_size_limit if specified.
 
         """
-        prompt_tokens = self._tokenizer(prompt_text)
-        num_prompt_tokens = len(prompt_tokens)
+        num_prompt_tokens = count_tokens(prompt_text, self._tokenizer)
 
         # NOTE: if embedding limit is specified, then chunk_size must not be larger than
         # embedding_limit
@@ -192,14 +191,19 @@ class PromptHelper:
         return "\n".join(results)
 
     def get_numbered_text_from_nodes(
-        self, node_list: List[Node], prompt: Optional[Prompt] = None
+        self,
+        node_list: List[Node],
+        prompt: Optional[Prompt] = None,
+        num_chunks: Optional[int] = None,
     ) -> str:
         """Get text from nodes in the format of a numbered list.
 
-        Used by tree-structured indices.
+        Used by tree-structured indices. If num_chunks is specified, the
+        prompt is assumed to be shared by that many chunks (e.g. when
+        other chunks are added to the same prompt).
 
         """
-        num_nodes = len(node_list)
+        num_nodes = num_chunks or len(node_list)
         text_splitter = None
         if prompt is not None:
             # add padding given the number, and the newlines
@@ -1,7 +1,9 @@
 """Base query classes."""
 
+import asyncio
 import logging
 from abc import ABC
+from functools import partial
 from typing import (
     Any,
     Dict,
@@ -15,6 +17,7 @@ from typing import (
 
 from langchain.input import print_text
 
+from gpt_index.async_utils import run_async_tasks
 from gpt_index.data_structs.data_structs_v2 import V2IndexStruct
 from gpt_index.data_structs.node_v2 import Node, NodeWithScore
 from gpt_index.docstore import DocumentStore
@@ -247,7 +250,64 @@ class BaseGPTIndexQuery(Generic[IS], ABC):
         """
         similarity_tracker = SimilarityTracker()
         nodes = self._retrieve(query_bundle, similarity_tracker=similarity_tracker)
+        return self._postprocess_nodes(nodes, query_bundle, similarity_tracker)
 
+    async def aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        """Asynchronously get list of tuples of node and similarity for response.
+
+        See `retrieve` for more details.
+
+        """
+        similarity_tracker = SimilarityTracker()
+        nodes = await self._aretrieve(
+            query_bundle, similarity_tracker=similarity_tracker
+        )
+        return await self._apostprocess_nodes(nodes, query_bundle, similarity_tracker)
+
+    def retrieve_batch(
+        self, query_bundles: List[QueryBundle]
+    ) -> List[List[NodeWithScore]]:
+        """Get list of tuples of node and similarity for a batch of queries.
+
+        Same as `retrieve`, but allows subclasses to share work (e.g. embedding
+        calls, similarity computation) across queries.
+
+        """
+        similarity_trackers = [SimilarityTracker() for _ in query_bundles]
+        nodes_list = self._retrieve_batch(query_bundles, similarity_trackers)
+        return [
+            self._postprocess_nodes(nodes, query_bundle, similarity_tracker)
+            for nodes, query_bundle, similarity_tracker in zip(
+                nodes_list, query_bundles, similarity_trackers
+            )
+        ]
+
+    async def aretrieve_batch(
+        self, query_bundles: List[QueryBundle]
+    ) -> List[List[NodeWithScore]]:
+        """Asynchronously get list of tuples of node and similarity for a batch.
+
+        See `retrieve_batch` for more details.
+
+        """
+        similarity_trackers = [SimilarityTracker() for _ in query_bundles]
+        nodes_list = await self._aretrieve_batch(query_bundles, similarity_trackers)
+        return await asyncio.gather(
+            *[
+                self._apostprocess_nodes(nodes, query_bundle, similarity_tracker)
+                for nodes, query_bundle, similarity_tracker in zip(
+                    nodes_list, query_bundles, similarity_trackers
+                )
+            ]
+        )
+
+    def _postprocess_nodes(
+        self,
+        nodes: List[Node],
+        query_bundle: QueryBundle,
+        similarity_tracker: SimilarityTracker,
+    ) -> List[NodeWithScore]:
+        """Run node postprocessors over retrieved nodes."""
         postprocess_info = {
             "similarity_tracker": similarity_tracker,
             "query_bundle": query_bundle,
@@ -258,6 +318,21 @@ class BaseGPTIndexQuery(Generic[IS], ABC):
         # TODO: create a `display` method to allow subclasses to print the Node
         return similarity_tracker.get_zipped_nodes(nodes)
 
+    async def _apostprocess_nodes(
+        self,
+        nodes: List[Node],
+        query_bundle: QueryBundle,
+        similarity_tracker: SimilarityTracker,
+    ) -> List[NodeWithScore]:
+        """Asynchronously run node postprocessors over retrieved nodes."""
+        postprocess_info = {
+            "similarity_tracker": similarity_tracker,
+            "query_bundle": query_bundle,
+        }
+        for node_processor in self.node_preprocessors:
+            nodes = await node_processor.apostprocess_nodes(nodes, postprocess_info)
+        return similarity_tracker.get_zipped_nodes(nodes)
+
     def _retrieve(
         self,
         query_bundle: QueryBundle,
@@ -266,6 +341,66 @@ class BaseGPTIndexQuery(Generic[IS], ABC):
         """Get nodes for response."""
         return []
 
+    async def _aretrieve(
+        self,
+        query_bundle: QueryBundle,
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        """Asynchronously get nodes for response.
+
+        By default, this runs _retrieve in the event loop's default executor,
+        so that blocking embedding or LLM calls do not stall the loop.
+        Meant to be overriden by queries that can make those calls natively
+        async (e.g. vector store, list embedding and tree select queries).
+        Keyword table and knowledge graph queries still use the executor.
+
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            partial(
+                self._retrieve, query_bundle, similarity_tracker=similarity_tracker
+            ),
+        )
+
+    def _retrieve_batch(
+        self,
+        query_bundles: List[QueryBundle],
+        similarity_trackers: List[SimilarityTracker],
+    ) -> List[List[Node]]:
+        """Get nodes for a batch of queries.
+
+        By default, this is a wrapper around _retrieve.
+        Meant to be overriden by queries that can retrieve many queries at once.
+
+        """
+        return [
+            self._retrieve(query_bundle, similarity_tracker=similarity_tracker)
+            for query_bundle, similarity_tracker in zip(
+                query_bundles, similarity_trackers
+            )
+        ]
+
+    async def _aretrieve_batch(
+        self,
+        query_bundles: List[QueryBundle],
+        similarity_trackers: List[SimilarityTracker],
+    ) -> List[List[Node]]:
+        """Asynchronously get nodes for a batch of queries.
+
+        By default, this runs _aretrieve concurrently for each query.
+        Meant to be overriden by queries that can retrieve many queries at once.
+
+        """
+        return await asyncio.gather(
+            *[
+                self._aretrieve(query_bundle, similarity_tracker=similarity_tracker)
+                for query_bundle, similarity_tracker in zip(
+                    query_bundles, similarity_trackers
+                )
+            ]
+        )
+
     def _get_extra_info_for_response(
         self,
         nodes: List[Node],
@@ -385,7 +520,7 @@ class BaseGPTIndexQuery(Generic[IS], ABC):
     async def _aquery(self, query_bundle: QueryBundle) -> RESPONSE_TYPE:
         """Answer a query asynchronously."""
         # TODO: remove _query and just use query
-        nodes = self.retrieve(query_bundle)
+        nodes = await self.aretrieve(query_bundle)
         response = await self.asynthesize(query_bundle, nodes)
         return response
 
@@ -400,3 +535,36 @@ class BaseGPTIndexQuery(Generic[IS], ABC):
         """Answer a query."""
         # TODO: support include summary
         return await self._aquery(query_bundle)
+
+    @llm_token_counter("query_batch")
+    def query_batch(self, query_bundles: List[QueryBundle]) -> List[RESPONSE_TYPE]:
+        """Answer a batch of queries.
+
+        Nodes are retrieved for all queries at once. Responses are then
+        synthesized concurrently if `use_async` is set, and sequentially
+        otherwise (use `aquery_batch` from within a running event loop).
+
+        """
+        nodes_list = self.retrieve_batch(query_bundles)
+        if self._use_async:
+            tasks = [
+                self.asynthesize(query_bundle, nodes)
+                for query_bundle, nodes in zip(query_bundles, nodes_list)
+            ]
+            return run_async_tasks(tasks)
+        return [
+            self.synthesize(query_bundle, nodes)
+            for query_bundle, nodes in zip(query_bundles, nodes_list)
+        ]
+
+    @llm_token_counter("query_batch")
+    async def aquery_batch(
+        self, query_bundles: List[QueryBundle]
+    ) -> List[RESPONSE_TYPE]:
+        """Asynchronously answer a batch of queries."""
+        nodes_list = await self.aretrieve_batch(query_bundles)
+        tasks = [
+            self.asynthesize(query_bundle, nodes)
+            for query_bundle, nodes in zip(query_bundles, nodes_list)
+        ]
+        return await asyncio.gather(*tasks)
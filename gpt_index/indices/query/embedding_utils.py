@@ -1,9 +1,97 @@
 """Embedding utils for queries."""
 
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 from gpt_index.data_structs.node_v2 import Node, NodeWithScore
-from gpt_index.embeddings.base import similarity as default_similarity_fn
+from gpt_index.embeddings.base import BaseEmbedding, SimilarityMode
+
+
+def get_batch_similarities_from_matrix(
+    query_embeddings: Union[List[List[float]], np.ndarray],
+    embedding_matrix: np.ndarray,
+    norms: Optional[np.ndarray] = None,
+    mode: SimilarityMode = SimilarityMode.DEFAULT,
+) -> np.ndarray:
+    """Get similarities between queries and every row of an embedding matrix.
+
+    All similarities are computed with a single matrix product.
+    For `SimilarityMode.EUCLIDEAN`, the negated distance is returned,
+    so that a higher score always means a more similar embedding.
+
+    Args:
+        query_embeddings (Union[List[List[float]], np.ndarray]): Query embeddings.
+        embedding_matrix (np.ndarray): Matrix of shape (num_embeddings, dim).
+        norms (Optional[np.ndarray]): Precomputed L2 norms of the rows of
+            `embedding_matrix`. Computed on the fly if not provided.
+        mode (SimilarityMode): Similarity mode.
+
+    Returns:
+        np.ndarray: Similarities of shape (num_queries, num_embeddings).
+
+    """
+    query_matrix = np.asarray(query_embeddings, dtype=embedding_matrix.dtype)
+    products = query_matrix @ embedding_matrix.T
+    if mode == SimilarityMode.DOT_PRODUCT:
+        return products
+
+    if norms is None:
+        norms = np.linalg.norm(embedding_matrix, axis=1)
+    query_norms = np.linalg.norm(query_matrix, axis=1)[:, np.newaxis]
+    if mode == SimilarityMode.EUCLIDEAN:
+        sq_dists = norms[np.newaxis, :] ** 2 - 2 * products + query_norms**2
+        return -np.sqrt(np.maximum(sq_dists, 0))
+
+    denoms = query_norms * norms[np.newaxis, :]
+    similarities = np.zeros_like(products)
+    np.divide(products, denoms, out=similarities, where=denoms != 0)
+    return similarities
+
+
+def get_similarities_from_matrix(
+    query_embedding: List[float],
+    embedding_matrix: np.ndarray,
+    norms: Optional[np.ndarray] = None,
+    mode: SimilarityMode = SimilarityMode.DEFAULT,
+) -> np.ndarray:
+    """Get similarities between a query and every row of an embedding matrix.
+
+    See `get_batch_similarities_from_matrix` for more details.
+
+    """
+    return get_batch_similarities_from_matrix(
+        [query_embedding], embedding_matrix, norms=norms, mode=mode
+    )[0]
+
+
+def get_top_k_indices(
+    similarities: np.ndarray,
+    similarity_top_k: Optional[int] = None,
+    similarity_cutoff: Optional[float] = None,
+) -> np.ndarray:
+    """Get indices of the top k similarities, sorted in descending order.
+
+    Uses `np.argpartition` so that only the top k candidates are sorted.
+
+    """
+    num_similarities = len(similarities)
+    if num_similarities == 0:
+        return np.array([], dtype=np.int64)
+
+    if not similarity_top_k or similarity_top_k >= num_similarities:
+        # stable sort, to keep insertion order between ties
+        top_indices = np.argsort(-similarities, kind="stable")
+    else:
+        candidates = np.argpartition(-similarities, similarity_top_k - 1)[
+            :similarity_top_k
+        ]
+        # sort candidates by similarity, breaking ties by insertion order
+        top_indices = candidates[np.lexsort((candidates, -similarities[candidates]))]
+
+    if similarity_cutoff is not None:
+        top_indices = top_indices[similarities[top_indices] > similarity_cutoff]
+    return top_indices
 
 
 def get_top_k_embeddings(
@@ -18,34 +106,57 @@ def get_top_k_embeddings(
     if embedding_ids is None:
         embedding_ids = [i for i in range(len(embeddings))]
 
-    similarity_fn = similarity_fn or default_similarity_fn
+    if len(embeddings) == 0:
+        return [], []
+
+    if similarity_fn is None:
+        similarities = get_similarities_from_matrix(
+            query_embedding, np.asarray(embeddings, dtype=np.float64)
+        )
+    else:
+        similarities = np.array(
+            [similarity_fn(query_embedding, emb) for emb in embeddings]
+        )
+
+    top_indices = get_top_k_indices(
+        similarities,
+        similarity_top_k=similarity_top_k,
+        similarity_cutoff=similarity_cutoff,
+    )
 
-    similarities = []
-    for emb in embeddings:
-        similarity = similarity_fn(query_embedding, emb)
-        similarities.append(similarity)
+    result_similarities = [float(similarities[i]) for i in top_indices]
+    result_ids = [embedding_ids[i] for i in top_indices]
 
-    sorted_tups = sorted(
-        zip(similarities, embedding_ids), key=lambda x: x[0], reverse=True
-    )
+    return result_similarities, result_ids
 
-    if similarity_cutoff is not None:
-        sorted_tups = [tup for tup in sorted_tups if tup[0] > similarity_cutoff]
 
-    similarity_top_k = similarity_top_k or len(sorted_tups)
-    result_tups = sorted_tups[:similarity_top_k]
+async def aembed_nodes(embed_model: BaseEmbedding, nodes: List[Node]) -> None:
+    """Asynchronously set the embedding of nodes that do not have one.
 
-    result_similarities = [s for s, _ in result_tups]
-    result_ids = [n for _, n in result_tups]
+    Missing embeddings are computed in batched async embedding calls.
 
-    return result_similarities, result_ids
+    """
+    text_queue = [
+        (str(idx), node.get_text())
+        for idx, node in enumerate(nodes)
+        if node.embedding is None
+    ]
+    if len(text_queue) == 0:
+        return
+    result_ids, result_embeddings = await embed_model.aget_queued_text_embeddings(
+        text_queue
+    )
+    for idx, embedding in zip(result_ids, result_embeddings):
+        nodes[int(idx)].embedding = embedding
 
 
 class SimilarityTracker:
     """Helper class to manage node similarities during lifecycle of a single query."""
 
-    # TODO: smarter way to store this information
-    lookup: Dict[str, float] = {}
+    def __init__(self) -> None:
+        """Init params."""
+        # TODO: smarter way to store this information
+        self.lookup: Dict[str, float] = {}
 
     def _hash(self, node: Node) -> str:
         """Generate a unique key for each node."""
@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 from gpt_index.data_structs.data_structs_v2 import CompositeIndex
 from gpt_index.data_structs.data_structs_v2 import V2IndexStruct
@@ -14,6 +14,7 @@ from gpt_index.docstore import DocumentStore
 from gpt_index.indices.query.base import BaseGPTIndexQuery
 from gpt_index.indices.query.query_combiner.base import (
     BaseQueryCombiner,
+    SingleQueryCombiner,
     get_default_query_combiner,
 )
 from gpt_index.indices.query.query_transform.base import (
@@ -269,7 +270,7 @@ class QueryRunner:
         if self._recursive:
             logger.debug(f"> Query level : {level} on {index_struct.get_type()}")
             # call recursively
-            nodes = query_obj.retrieve(query_bundle)
+            nodes = await query_obj.aretrieve(query_bundle)
 
             # do recursion here
             tasks = []
@@ -359,3 +360,63 @@ class QueryRunner:
             query_str_or_bundle, index_id=index_id
         )
         return await query_combiner.arun(query_bundle, level)
+
+    def _prepare_batch_query_objects(
+        self,
+        query_strs_or_bundles: Sequence[Union[str, QueryBundle]],
+    ) -> Optional[Tuple[BaseGPTIndexQuery, List[QueryBundle]]]:
+        """Prepare query object and transformed query bundles for a batch query.
+
+        Returns None if the queries can't be batched, i.e. for composable graphs,
+        recursive queries, or query combiners that issue multiple queries.
+
+        """
+        if self._recursive or isinstance(self._index_struct, CompositeIndex):
+            return None
+
+        query_bundles = []
+        for query_str_or_bundle in query_strs_or_bundles:
+            query_combiner, query_bundle = self._prepare_query_objects(
+                query_str_or_bundle
+            )
+            if not isinstance(query_combiner, SingleQueryCombiner):
+                return None
+            query_bundles.append(query_bundle)
+
+        query_transform = self._get_query_transform(self._index_struct)
+        transform_extra_info = {"index_struct": self._index_struct}
+        updated_query_bundles = [
+            query_transform(query_bundle, extra_info=transform_extra_info)
+            for query_bundle in query_bundles
+        ]
+        return self._get_query_obj(self._index_struct), updated_query_bundles
+
+    def query_batch(
+        self,
+        query_strs_or_bundles: Sequence[Union[str, QueryBundle]],
+    ) -> List[RESPONSE_TYPE]:
+        """Run a batch of queries.
+
+        When possible, nodes are retrieved for all queries at once (e.g. with a
+        single embedding call and similarity computation), and responses are
+        synthesized concurrently. Otherwise, queries are run one at a time.
+
+        """
+        prepared = self._prepare_batch_query_objects(query_strs_or_bundles)
+        if prepared is None:
+            return [self.query(query) for query in query_strs_or_bundles]
+        query_obj, query_bundles = prepared
+        return query_obj.query_batch(query_bundles)
+
+    async def aquery_batch(
+        self,
+        query_strs_or_bundles: Sequence[Union[str, QueryBundle]],
+    ) -> List[RESPONSE_TYPE]:
+        """Run a batch of queries asynchronously."""
+        prepared = self._prepare_batch_query_objects(query_strs_or_bundles)
+        if prepared is None:
+            return await asyncio.gather(
+                *[self.aquery(query) for query in query_strs_or_bundles]
+            )
+        query_obj, query_bundles = prepared
+        return await query_obj.aquery_batch(query_bundles)
@@ -4,14 +4,17 @@ This class provides general functions for taking in a set of text
 and generating a response.
 
 Will support different modes, from 1) stuffing chunks into prompt,
-2) create and refine separately over each chunk, 3) tree summarization.
+2) create and refine separately over each chunk, 3) tree summarization,
+4) answering each chunk concurrently and reducing the answers with a tree.
 
 """
+import asyncio
 import logging
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Generator, List, Optional, Tuple, cast
 
+from gpt_index.async_utils import run_async_tasks
 from gpt_index.data_structs.data_structs_v2 import IndexGraph
 from gpt_index.data_structs.node_v2 import Node, NodeWithScore
 from gpt_index.docstore import DocumentStore
@@ -33,6 +36,7 @@ class ResponseMode(str, Enum):
     DEFAULT = "default"
     COMPACT = "compact"
     TREE_SUMMARIZE = "tree_summarize"
+    MAP_REDUCE = "map_reduce"
     NO_TEXT = "no_text"
 
 
@@ -116,8 +120,15 @@ class ResponseBuilder:
         response: RESPONSE_TEXT_TYPE,
         query_str: str,
         text_chunk: str,
+        streaming: Optional[bool] = None,
     ) -> RESPONSE_TEXT_TYPE:
-        """Refine response."""
+        """Refine response.
+
+        If streaming (defaults to the builder setting), only the refine step
+        over the last text chunk is streamed.
+
+        """
+        streaming = self._streaming if streaming is None else streaming
         # TODO: consolidate with logic in response/schema.py
         if isinstance(response, Generator):
             response = get_response_text(response)
@@ -134,12 +145,65 @@ class ResponseBuilder:
             )
         )
         text_chunks = refine_text_splitter.split_text(text_chunk)
-        for cur_text_chunk in text_chunks:
-            if not self._streaming:
+        for idx, cur_text_chunk in enumerate(text_chunks):
+            if not streaming or idx < len(text_chunks) - 1:
                 (
                     response,
                     formatted_prompt,
-                ) = self._service_context.llm_predictor.predict(
+                ) = self._service_context.llm_scheduler.predict(
+                    self._service_context.llm_predictor,
+                    refine_template,
+                    context_msg=cur_text_chunk,
+                )
+            else:
+                response, formatted_prompt = self._service_context.llm_predictor.stream(
+                    refine_template,
+                    context_msg=cur_text_chunk,
+                )
+            refine_template = self.refine_template.partial_format(
+                query_str=query_str, existing_answer=response
+            )
+
+            self._log_prompt_and_response(
+                formatted_prompt, response, log_prefix="Refined"
+            )
+        return response
+
+    async def arefine_response_single(
+        self,
+        response: RESPONSE_TEXT_TYPE,
+        query_str: str,
+        text_chunk: str,
+        streaming: Optional[bool] = None,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously refine response.
+
+        NOTE: streaming responses are created with the synchronous `stream`,
+        which returns a generator without waiting on the LLM.
+
+        """
+        streaming = self._streaming if streaming is None else streaming
+        if isinstance(response, Generator):
+            response = get_response_text(response)
+
+        fmt_text_chunk = truncate_text(text_chunk, 50)
+        logger.debug(f"> Refine context: {fmt_text_chunk}")
+        refine_template = self.refine_template.partial_format(
+            query_str=query_str, existing_answer=response
+        )
+        refine_text_splitter = (
+            self._service_context.prompt_helper.get_text_splitter_given_prompt(
+                refine_template, 1
+            )
+        )
+        text_chunks = refine_text_splitter.split_text(text_chunk)
+        for idx, cur_text_chunk in enumerate(text_chunks):
+            if not streaming or idx < len(text_chunks) - 1:
+                (
+                    response,
+                    formatted_prompt,
+                ) = await self._service_context.llm_scheduler.apredict(
+                    self._service_context.llm_predictor,
                     refine_template,
                     context_msg=cur_text_chunk,
                 )
@@ -161,8 +225,15 @@ class ResponseBuilder:
         self,
         query_str: str,
         text_chunk: str,
+        streaming: Optional[bool] = None,
     ) -> RESPONSE_TEXT_TYPE:
-        """Give response given a query and a corresponding text chunk."""
+        """Give response given a query and a corresponding text chunk.
+
+        If streaming (defaults to the builder setting), only the last LLM call
+        is streamed, earlier ones are made without streaming.
+
+        """
+        streaming = self._streaming if streaming is None else streaming
         text_qa_template = self.text_qa_template.partial_format(query_str=query_str)
         qa_text_splitter = (
             self._service_context.prompt_helper.get_text_splitter_given_prompt(
@@ -172,19 +243,21 @@ class ResponseBuilder:
         text_chunks = qa_text_splitter.split_text(text_chunk)
         response: Optional[RESPONSE_TEXT_TYPE] = None
         # TODO: consolidate with loop in get_response_default
-        for cur_text_chunk in text_chunks:
-            if response is None and not self._streaming:
+        for idx, cur_text_chunk in enumerate(text_chunks):
+            is_last = idx == len(text_chunks) - 1
+            if response is None and not (streaming and is_last):
                 (
                     response,
                     formatted_prompt,
-                ) = self._service_context.llm_predictor.predict(
+                ) = self._service_context.llm_scheduler.predict(
+                    self._service_context.llm_predictor,
                     text_qa_template,
                     context_str=cur_text_chunk,
                 )
                 self._log_prompt_and_response(
                     formatted_prompt, response, log_prefix="Initial"
                 )
-            elif response is None and self._streaming:
+            elif response is None:
                 response, formatted_prompt = self._service_context.llm_predictor.stream(
                     text_qa_template,
                     context_str=cur_text_chunk,
@@ -197,6 +270,58 @@ class ResponseBuilder:
                     cast(RESPONSE_TEXT_TYPE, response),
                     query_str,
                     cur_text_chunk,
+                    streaming=streaming and is_last,
+                )
+        if isinstance(response, str):
+            response = response or "Empty Response"
+        else:
+            response = cast(Generator, response)
+        return response
+
+    async def agive_response_single(
+        self,
+        query_str: str,
+        text_chunk: str,
+        streaming: Optional[bool] = None,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously give response given a query and a text chunk."""
+        streaming = self._streaming if streaming is None else streaming
+        text_qa_template = self.text_qa_template.partial_format(query_str=query_str)
+        qa_text_splitter = (
+            self._service_context.prompt_helper.get_text_splitter_given_prompt(
+                text_qa_template, 1
+            )
+        )
+        text_chunks = qa_text_splitter.split_text(text_chunk)
+        response: Optional[RESPONSE_TEXT_TYPE] = None
+        for idx, cur_text_chunk in enumerate(text_chunks):
+            is_last = idx == len(text_chunks) - 1
+            if response is None and not (streaming and is_last):
+                (
+                    response,
+                    formatted_prompt,
+                ) = await self._service_context.llm_scheduler.apredict(
+                    self._service_context.llm_predictor,
+                    text_qa_template,
+                    context_str=cur_text_chunk,
+                )
+                self._log_prompt_and_response(
+                    formatted_prompt, response, log_prefix="Initial"
+                )
+            elif response is None:
+                response, formatted_prompt = self._service_context.llm_predictor.stream(
+                    text_qa_template,
+                    context_str=cur_text_chunk,
+                )
+                self._log_prompt_and_response(
+                    formatted_prompt, response, log_prefix="Initial"
+                )
+            else:
+                response = await self.arefine_response_single(
+                    cast(RESPONSE_TEXT_TYPE, response),
+                    query_str,
+                    cur_text_chunk,
+                    streaming=streaming and is_last,
                 )
         if isinstance(response, str):
             response = response or "Empty Response"
@@ -210,10 +335,15 @@ class ResponseBuilder:
         text_chunks: List[TextChunk],
         prev_response: Optional[str] = None,
     ) -> RESPONSE_TEXT_TYPE:
-        """Give response over chunks."""
+        """Give response over chunks.
+
+        If streaming, only the response over the last chunk is streamed.
+
+        """
         prev_response_obj = cast(Optional[RESPONSE_TEXT_TYPE], prev_response)
         response: Optional[RESPONSE_TEXT_TYPE] = None
-        for text_chunk in text_chunks:
+        for idx, text_chunk in enumerate(text_chunks):
+            streaming = self._streaming and idx == len(text_chunks) - 1
             if prev_response_obj is None:
                 # if this is the first chunk, and text chunk already
                 # is an answer, then return it
@@ -222,12 +352,40 @@ class ResponseBuilder:
                 # otherwise give response
                 else:
                     response = self.give_response_single(
-                        query_str,
-                        text_chunk.text,
+                        query_str, text_chunk.text, streaming=streaming
                     )
             else:
                 response = self.refine_response_single(
-                    prev_response_obj, query_str, text_chunk.text
+                    prev_response_obj, query_str, text_chunk.text, streaming=streaming
+                )
+            prev_response_obj = response
+        if isinstance(response, str):
+            response = response or "Empty Response"
+        else:
+            response = cast(Generator, response)
+        return response
+
+    async def aget_response_over_chunks(
+        self,
+        query_str: str,
+        text_chunks: List[TextChunk],
+        prev_response: Optional[str] = None,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously give response over chunks."""
+        prev_response_obj = cast(Optional[RESPONSE_TEXT_TYPE], prev_response)
+        response: Optional[RESPONSE_TEXT_TYPE] = None
+        for idx, text_chunk in enumerate(text_chunks):
+            streaming = self._streaming and idx == len(text_chunks) - 1
+            if prev_response_obj is None:
+                if text_chunk.is_answer:
+                    response = text_chunk.text
+                else:
+                    response = await self.agive_response_single(
+                        query_str, text_chunk.text, streaming=streaming
+                    )
+            else:
+                response = await self.arefine_response_single(
+                    prev_response_obj, query_str, text_chunk.text, streaming=streaming
                 )
             prev_response_obj = response
         if isinstance(response, str):
@@ -243,10 +401,41 @@ class ResponseBuilder:
             query_str, self._texts, prev_response=prev_response
         )
 
+    async def _aget_response_default(
+        self, query_str: str, prev_response: Optional[str]
+    ) -> RESPONSE_TEXT_TYPE:
+        return await self.aget_response_over_chunks(
+            query_str, self._texts, prev_response=prev_response
+        )
+
     def _get_response_compact(
         self, query_str: str, prev_response: Optional[str]
     ) -> RESPONSE_TEXT_TYPE:
         """Get compact response."""
+        with temp_set_attrs(
+            self._service_context.prompt_helper, use_chunk_size_limit=False
+        ):
+            new_text_chunks = self._get_compact_text_chunks(query_str)
+            response = self.get_response_over_chunks(
+                query_str, new_text_chunks, prev_response=prev_response
+            )
+        return response
+
+    async def _aget_response_compact(
+        self, query_str: str, prev_response: Optional[str]
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously get compact response."""
+        with temp_set_attrs(
+            self._service_context.prompt_helper, use_chunk_size_limit=False
+        ):
+            new_text_chunks = self._get_compact_text_chunks(query_str)
+            response = await self.aget_response_over_chunks(
+                query_str, new_text_chunks, prev_response=prev_response
+            )
+        return response
+
+    def _get_compact_text_chunks(self, query_str: str) -> List[TextChunk]:
+        """Compact text chunks to fill the biggest prompt."""
         # use prompt helper to fix compact text_chunks under the prompt limitation
         # TODO: This is a temporary fix - reason it's temporary is that
         # the refine template does not account for size of previous answer.
@@ -256,27 +445,21 @@ class ResponseBuilder:
         max_prompt = self._service_context.prompt_helper.get_biggest_prompt(
             [text_qa_template, refine_template]
         )
-        with temp_set_attrs(
-            self._service_context.prompt_helper, use_chunk_size_limit=False
-        ):
-            new_texts = self._service_context.prompt_helper.compact_text_chunks(
-                max_prompt, [t.text for t in self._texts]
-            )
-            new_text_chunks = [TextChunk(text=t) for t in new_texts]
-            response = self.get_response_over_chunks(
-                query_str, new_text_chunks, prev_response=prev_response
-            )
-        return response
+        new_texts = self._service_context.prompt_helper.compact_text_chunks(
+            max_prompt, [t.text for t in self._texts]
+        )
+        return [TextChunk(text=t) for t in new_texts]
 
     def _get_tree_index_builder_and_nodes(
         self,
         summary_template: SummaryPrompt,
-        query_str: str,
+        texts: List[TextChunk],
         num_children: int = 10,
+        use_async: bool = False,
     ) -> Tuple[GPTTreeIndexBuilder, List[Node]]:
         """Get tree index builder."""
         # first join all the text chunks into a single text
-        all_text = "\n\n".join([t.text for t in self._texts])
+        all_text = "\n\n".join([t.text for t in texts])
         # then get text splitter
         text_splitter = (
             self._service_context.prompt_helper.get_text_splitter_given_prompt(
@@ -293,7 +476,7 @@ class ResponseBuilder:
             summary_template,
             service_context=self._service_context,
             docstore=docstore,
-            use_async=self._use_async,
+            use_async=use_async,
         )
         return index_builder, nodes
 
@@ -319,6 +502,28 @@ class ResponseBuilder:
             response = response or "Empty Response"
         return response
 
+    async def _aget_tree_response_over_root_nodes(
+        self,
+        query_str: str,
+        prev_response: Optional[str],
+        root_nodes: Dict[int, Node],
+        text_qa_template: QuestionAnswerPrompt,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously get response from tree builder over root nodes."""
+        node_list = get_sorted_node_list(root_nodes)
+        node_text = self._service_context.prompt_helper.get_text_from_nodes(
+            node_list, prompt=text_qa_template
+        )
+        # NOTE: the final response could be a string or a stream
+        response = await self.aget_response_over_chunks(
+            query_str,
+            [TextChunk(node_text)],
+            prev_response=prev_response,
+        )
+        if isinstance(response, str):
+            response = response or "Empty Response"
+        return response
+
     def _get_response_tree_summarize(
         self,
         query_str: str,
@@ -326,11 +531,28 @@ class ResponseBuilder:
         num_children: int = 10,
     ) -> RESPONSE_TEXT_TYPE:
         """Get tree summarize response."""
+        return self._get_tree_summarize_over_texts(
+            query_str,
+            prev_response,
+            self._texts,
+            num_children=num_children,
+            use_async=self._use_async,
+        )
+
+    def _get_tree_summarize_over_texts(
+        self,
+        query_str: str,
+        prev_response: Optional[str],
+        texts: List[TextChunk],
+        num_children: int = 10,
+        use_async: bool = False,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Summarize the given texts with a tree and answer over the root nodes."""
         text_qa_template = self.text_qa_template.partial_format(query_str=query_str)
         summary_template = SummaryPrompt.from_prompt(text_qa_template)
 
         index_builder, nodes = self._get_tree_index_builder_and_nodes(
-            summary_template, query_str, num_children
+            summary_template, texts, num_children=num_children, use_async=use_async
         )
         index_graph = IndexGraph()
         for node in nodes:
@@ -354,11 +576,23 @@ class ResponseBuilder:
         num_children: int = 10,
     ) -> RESPONSE_TEXT_TYPE:
         """Get tree summarize response."""
+        return await self._aget_tree_summarize_over_texts(
+            query_str, prev_response, self._texts, num_children=num_children
+        )
+
+    async def _aget_tree_summarize_over_texts(
+        self,
+        query_str: str,
+        prev_response: Optional[str],
+        texts: List[TextChunk],
+        num_children: int = 10,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously summarize the given texts with a tree."""
         text_qa_template = self.text_qa_template.partial_format(query_str=query_str)
         summary_template = SummaryPrompt.from_prompt(text_qa_template)
 
         index_builder, nodes = self._get_tree_index_builder_and_nodes(
-            summary_template, query_str, num_children
+            summary_template, texts, num_children=num_children, use_async=True
         )
         index_graph = IndexGraph()
         for node in nodes:
@@ -371,10 +605,90 @@ class ResponseBuilder:
             index: index_builder.docstore.get_node(node_id)
             for index, node_id in root_node_ids.items()
         }
-        return self._get_tree_response_over_root_nodes(
+        return await self._aget_tree_response_over_root_nodes(
             query_str, prev_response, root_nodes, text_qa_template
         )
 
+    def _get_response_map_reduce(
+        self,
+        query_str: str,
+        prev_response: Optional[str],
+        num_children: int = 10,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Get map-reduce response.
+
+        Answer every compacted chunk (map), then summarize the partial answers
+        with a tree (reduce), so that the number of dependent LLM calls grows
+        logarithmically rather than linearly with the chunks. Both steps run
+        concurrently if `use_async` is set.
+
+        """
+        with temp_set_attrs(
+            self._service_context.prompt_helper, use_chunk_size_limit=False
+        ):
+            text_chunks = self._get_compact_text_chunks(query_str)
+            if len(text_chunks) <= 1:
+                return self.get_response_over_chunks(
+                    query_str, text_chunks, prev_response=prev_response
+                )
+
+            # partial answers are never streamed, only the final one is
+            answers: List[str]
+            if self._use_async:
+                tasks = [
+                    self.agive_response_single(
+                        query_str, text_chunk.text, streaming=False
+                    )
+                    for text_chunk in text_chunks
+                ]
+                answers = run_async_tasks(tasks)
+            else:
+                answers = [
+                    cast(
+                        str,
+                        self.give_response_single(
+                            query_str, text_chunk.text, streaming=False
+                        ),
+                    )
+                    for text_chunk in text_chunks
+                ]
+        return self._get_tree_summarize_over_texts(
+            query_str,
+            prev_response,
+            [TextChunk(answer) for answer in answers],
+            num_children=num_children,
+            use_async=self._use_async,
+        )
+
+    async def _aget_response_map_reduce(
+        self,
+        query_str: str,
+        prev_response: Optional[str],
+        num_children: int = 10,
+    ) -> RESPONSE_TEXT_TYPE:
+        """Asynchronously get map-reduce response."""
+        with temp_set_attrs(
+            self._service_context.prompt_helper, use_chunk_size_limit=False
+        ):
+            text_chunks = self._get_compact_text_chunks(query_str)
+            if len(text_chunks) <= 1:
+                return await self.aget_response_over_chunks(
+                    query_str, text_chunks, prev_response=prev_response
+                )
+
+            # partial answers are never streamed, only the final one is
+            tasks = [
+                self.agive_response_single(query_str, text_chunk.text, streaming=False)
+                for text_chunk in text_chunks
+            ]
+            answers: List[str] = await asyncio.gather(*tasks)
+        return await self._aget_tree_summarize_over_texts(
+            query_str,
+            prev_response,
+            [TextChunk(answer) for answer in answers],
+            num_children=num_children,
+        )
+
     def get_response(
         self,
         query_str: str,
@@ -391,6 +705,10 @@ class ResponseBuilder:
             return self._get_response_tree_summarize(
                 query_str, prev_response, **response_kwargs
             )
+        elif mode == ResponseMode.MAP_REDUCE:
+            return self._get_response_map_reduce(
+                query_str, prev_response, **response_kwargs
+            )
         else:
             raise ValueError(f"Invalid mode: {mode}")
 
@@ -401,15 +719,18 @@ class ResponseBuilder:
         mode: ResponseMode = ResponseMode.DEFAULT,
         **response_kwargs: Any,
     ) -> RESPONSE_TEXT_TYPE:
-        """Get response."""
-        # NOTE: for default and compact response modes, return synchronous version
+        """Asynchronously get response."""
         if mode == ResponseMode.DEFAULT:
-            return self._get_response_default(query_str, prev_response)
+            return await self._aget_response_default(query_str, prev_response)
         elif mode == ResponseMode.COMPACT:
-            return self._get_response_compact(query_str, prev_response)
+            return await self._aget_response_compact(query_str, prev_response)
         elif mode == ResponseMode.TREE_SUMMARIZE:
             return await self._aget_response_tree_summarize(
                 query_str, prev_response, **response_kwargs
             )
+        elif mode == ResponseMode.MAP_REDUCE:
+            return await self._aget_response_map_reduce(
+                query_str, prev_response, **response_kwargs
+            )
         else:
             raise ValueError(f"Invalid mode: {mode}")
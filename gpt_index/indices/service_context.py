@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 from gpt_index.embeddings.base import BaseEmbedding
@@ -6,6 +6,7 @@ from gpt_index.embeddings.openai import OpenAIEmbedding
 from gpt_index.indices.prompt_helper import PromptHelper
 from gpt_index.langchain_helpers.chain_wrapper import LLMPredictor
 from gpt_index.langchain_helpers.text_splitter import TokenTextSplitter
+from gpt_index.llm_predictor.scheduler import LLMScheduler
 from gpt_index.logger import LlamaLogger
 from gpt_index.node_parser.interface import NodeParser
 from gpt_index.node_parser.simple import SimpleNodeParser
@@ -33,6 +34,7 @@ class ServiceContext:
     - node_parser: NodeParser
     - llama_logger: LlamaLogger
     - chunk_size_limit: chunk size limit
+    - llm_scheduler: LLMScheduler, which async LLM calls are submitted through
 
     """
 
@@ -42,6 +44,7 @@ class ServiceContext:
     node_parser: NodeParser
     llama_logger: LlamaLogger
     chunk_size_limit: Optional[int] = None
+    llm_scheduler: LLMScheduler = field(default_factory=LLMScheduler)
 
     @classmethod
     def from_defaults(
@@ -52,6 +55,7 @@ class ServiceContext:
         node_parser: Optional[NodeParser] = None,
         llama_logger: Optional[LlamaLogger] = None,
         chunk_size_limit: Optional[int] = None,
+        llm_scheduler: Optional[LLMScheduler] = None,
     ) -> "ServiceContext":
         """Create a ServiceContext from defaults.
         If an argument is specified, then use the argument value provided for that
@@ -64,6 +68,7 @@ class ServiceContext:
             node_parser (Optional[NodeParser]): NodeParser
             llama_logger (Optional[LlamaLogger]): LlamaLogger
             chunk_size_limit (Optional[int]): chunk_size_limit
+            llm_scheduler (Optional[LLMScheduler]): LLMScheduler
 
         """
         llm_predictor = llm_predictor or LLMPredictor()
@@ -76,6 +81,7 @@ class ServiceContext:
             chunk_size_limit=chunk_size_limit
         )
         llama_logger = llama_logger or LlamaLogger()
+        llm_scheduler = llm_scheduler or LLMScheduler()
 
         return cls(
             llm_predictor=llm_predictor,
@@ -84,4 +90,5 @@ class ServiceContext:
             node_parser=node_parser,
             llama_logger=llama_logger,
             chunk_size_limit=chunk_size_limit,
+            llm_scheduler=llm_scheduler,
         )
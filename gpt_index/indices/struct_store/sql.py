@@ -30,6 +30,10 @@ class GPTSQLStructStoreIndex(BaseGPTStructStoreIndex[SQLStructTable]):
     During query time, the user can either specify a raw SQL query
     or a natural language query to retrieve their data.
 
+    NOTE: when building from documents, datapoints are extracted from all
+    nodes first and then inserted in a single transaction. If an extraction
+    fails partway through, no rows are inserted.
+
     Args:
         documents (Optional[Sequence[DOCUMENTS_INPUT]]): Documents to index.
             NOTE: in the SQL index, this is an optional field.
@@ -104,9 +108,12 @@ class GPTSQLStructStoreIndex(BaseGPTStructStoreIndex[SQLStructTable]):
                 table_name=self._table_name,
                 table=self._table,
                 ref_doc_id_column=self._ref_doc_id_column,
+                llm_scheduler=self._service_context.llm_scheduler,
+            )
+            # one datapoint per node, inserted in bulk
+            data_extractor.insert_datapoints_from_node_groups(
+                [[node] for node in nodes]
             )
-            for node in nodes:
-                data_extractor.insert_datapoint_from_nodes([node])
         return index_struct
 
     def _insert(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
@@ -119,6 +126,7 @@ class GPTSQLStructStoreIndex(BaseGPTStructStoreIndex[SQLStructTable]):
             table_name=self._table_name,
             table=self._table,
             ref_doc_id_column=self._ref_doc_id_column,
+            llm_scheduler=self._service_context.llm_scheduler,
         )
         data_extractor.insert_datapoint_from_nodes(nodes)
 
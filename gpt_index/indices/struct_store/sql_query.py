@@ -147,7 +147,8 @@ class GPTNLStructStoreIndexQuery(BaseGPTIndexQuery[SQLStructTable]):
         """Answer a query."""
         table_desc_str = self._get_table_context(query_bundle)
         logger.info(f"> Table desc str: {table_desc_str}")
-        response_str, _ = await self._service_context.llm_predictor.apredict(
+        response_str, _ = await self._service_context.llm_scheduler.apredict(
+            self._service_context.llm_predictor,
             self._text_to_sql_prompt,
             query_str=query_bundle.query_str,
             schema=table_desc_str,
@@ -45,6 +45,11 @@ class GPTTreeIndex(BaseGPTIndex[IndexGraph]):
             (see :ref:`Prompt-Templates`).
         num_children (int): The number of children each node should have.
         build_tree (bool): Whether to build the tree during index construction.
+        batch_insert (bool): Whether to insert nodes in batches: route all new
+            nodes down the tree with one insert prompt per parent, then
+            consolidate and re-summarize each touched parent once. LLM calls
+            are made concurrently if use_async is set. `ainsert` always
+            inserts in batches.
 
     """
 
@@ -60,6 +65,7 @@ class GPTTreeIndex(BaseGPTIndex[IndexGraph]):
         num_children: int = 10,
         build_tree: bool = True,
         use_async: bool = False,
+        batch_insert: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize params."""
@@ -69,6 +75,7 @@ class GPTTreeIndex(BaseGPTIndex[IndexGraph]):
         self.insert_prompt: TreeInsertPrompt = insert_prompt or DEFAULT_INSERT_PROMPT
         self.build_tree = build_tree
         self._use_async = use_async
+        self._batch_insert = batch_insert
         super().__init__(
             nodes=nodes,
             index_struct=index_struct,
@@ -111,18 +118,34 @@ class GPTTreeIndex(BaseGPTIndex[IndexGraph]):
         index_graph = index_builder.build_from_nodes(nodes, build_tree=self.build_tree)
         return index_graph
 
-    def _insert(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
-        """Insert a document."""
+    def _get_inserter(self) -> GPTTreeIndexInserter:
+        """Get the inserter of the index."""
         # TODO: allow to customize insert prompt
-        inserter = GPTTreeIndexInserter(
+        return GPTTreeIndexInserter(
             self.index_struct,
             num_children=self.num_children,
             insert_prompt=self.insert_prompt,
             summary_prompt=self.summary_template,
             service_context=self._service_context,
             docstore=self._docstore,
+            use_async=self._use_async,
         )
-        inserter.insert(nodes)
+
+    def _insert(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
+        """Insert a document."""
+        inserter = self._get_inserter()
+        if self._batch_insert:
+            inserter.insert_batch(nodes)
+        else:
+            inserter.insert(nodes)
+
+    async def _ainsert(self, nodes: Sequence[Node], **insert_kwargs: Any) -> None:
+        """Asynchronously insert a document.
+
+        Nodes are always inserted in a batch, see `batch_insert`.
+
+        """
+        await self._get_inserter().ainsert_batch(nodes)
 
     def _delete(self, doc_id: str, **delete_kwargs: Any) -> None:
         """Delete a document."""
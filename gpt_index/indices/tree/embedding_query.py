@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional, Tuple, cast
 
 from gpt_index.data_structs.data_structs_v2 import IndexGraph
 from gpt_index.data_structs.node_v2 import Node
+from gpt_index.indices.query.embedding_utils import aembed_nodes
 from gpt_index.indices.query.schema import QueryBundle
 from gpt_index.indices.tree.leaf_query import GPTTreeIndexLeafQuery
 from gpt_index.indices.utils import get_sorted_node_list
@@ -121,12 +122,34 @@ class GPTTreeIndexEmbeddingQuery(GPTTreeIndexLeafQuery):
             similarities.append(similarity)
         return similarities
 
+    async def _aget_query_text_embedding_similarities(
+        self, query_bundle: QueryBundle, nodes: List[Node]
+    ) -> List[float]:
+        """Asynchronously get query text embedding similarity."""
+        embed_model = self._service_context.embed_model
+        if query_bundle.embedding is None:
+            query_bundle.embedding = await embed_model.aget_agg_embedding_from_queries(
+                query_bundle.embedding_strs
+            )
+        await aembed_nodes(embed_model, nodes)
+        return [
+            embed_model.similarity(
+                query_bundle.embedding, cast(List[float], node.embedding)
+            )
+            for node in nodes
+        ]
+
     def _get_most_similar_nodes(
         self, nodes: List[Node], query_bundle: QueryBundle
     ) -> Tuple[List[Node], List[int]]:
         """Get the node with the highest similarity to the query."""
         similarities = self._get_query_text_embedding_similarities(query_bundle, nodes)
+        return self._get_top_nodes(nodes, similarities)
 
+    def _get_top_nodes(
+        self, nodes: List[Node], similarities: List[float]
+    ) -> Tuple[List[Node], List[int]]:
+        """Get the child_branch_factor nodes with the highest similarity."""
         selected_nodes: List[Node] = []
         selected_indices: List[int] = []
         for node, _ in sorted(
@@ -148,3 +171,15 @@ class GPTTreeIndexEmbeddingQuery(GPTTreeIndexLeafQuery):
     ) -> List[Node]:
         selected_nodes, _ = self._get_most_similar_nodes(cur_node_list, query_bundle)
         return selected_nodes
+
+    async def _aselect_nodes(
+        self,
+        cur_node_list: List[Node],
+        query_bundle: QueryBundle,
+        level: int = 0,
+    ) -> List[Node]:
+        similarities = await self._aget_query_text_embedding_similarities(
+            query_bundle, cur_node_list
+        )
+        selected_nodes, _ = self._get_top_nodes(cur_node_list, similarities)
+        return selected_nodes
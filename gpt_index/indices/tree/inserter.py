@@ -1,7 +1,10 @@
 """GPT Tree Index inserter."""
 
-from typing import Optional, Sequence
+import asyncio
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
+from gpt_index.async_utils import run_async_tasks
 from gpt_index.data_structs.data_structs_v2 import IndexGraph
 from gpt_index.data_structs.node_v2 import Node
 from gpt_index.docstore import DocumentStore
@@ -9,13 +12,24 @@ from gpt_index.indices.service_context import ServiceContext
 from gpt_index.indices.utils import extract_numbers_given_response, get_sorted_node_list
 from gpt_index.prompts.base import Prompt
 from gpt_index.prompts.default_prompts import (
+    DEFAULT_INSERT_BATCH_PROMPT,
     DEFAULT_INSERT_PROMPT,
     DEFAULT_SUMMARY_PROMPT,
 )
 
 
 class GPTTreeIndexInserter:
-    """LlamaIndex inserter."""
+    """LlamaIndex inserter.
+
+    Args:
+        insert_batch_prompt (Prompt): Insert prompt used by `insert_batch` to
+            select a child for several new chunks at once.
+        num_chunks_per_insert_prompt (int): Maximum number of new chunks to
+            select a child for in a single insert batch prompt.
+        use_async (bool): Whether `insert_batch` makes the LLM calls of a
+            level concurrently (with asyncio).
+
+    """
 
     def __init__(
         self,
@@ -25,6 +39,9 @@ class GPTTreeIndexInserter:
         insert_prompt: Prompt = DEFAULT_INSERT_PROMPT,
         summary_prompt: Prompt = DEFAULT_SUMMARY_PROMPT,
         docstore: Optional[DocumentStore] = None,
+        insert_batch_prompt: Prompt = DEFAULT_INSERT_BATCH_PROMPT,
+        num_chunks_per_insert_prompt: int = 10,
+        use_async: bool = False,
     ) -> None:
         """Initialize with params."""
         if num_children < 2:
@@ -32,9 +49,12 @@ class GPTTreeIndexInserter:
         self.num_children = num_children
         self.summary_prompt = summary_prompt
         self.insert_prompt = insert_prompt
+        self.insert_batch_prompt = insert_batch_prompt
+        self.num_chunks_per_insert_prompt = num_chunks_per_insert_prompt
         self.index_graph = index_graph
         self._service_context = service_context
         self._docstore = docstore or DocumentStore()
+        self._use_async = use_async
 
     def _insert_under_parent_and_consolidate(
         self, text_node: Node, parent_node: Optional[Node]
@@ -65,8 +85,10 @@ class GPTTreeIndexInserter:
             text_chunk1 = self._service_context.prompt_helper.get_text_from_nodes(
                 half1, prompt=self.summary_prompt
             )
-            summary1, _ = self._service_context.llm_predictor.predict(
-                self.summary_prompt, context_str=text_chunk1
+            summary1, _ = self._service_context.llm_scheduler.predict(
+                self._service_context.llm_predictor,
+                self.summary_prompt,
+                context_str=text_chunk1,
             )
             node1 = Node(
                 text=summary1,
@@ -76,8 +98,10 @@ class GPTTreeIndexInserter:
             text_chunk2 = self._service_context.prompt_helper.get_text_from_nodes(
                 half2, prompt=self.summary_prompt
             )
-            summary2, _ = self._service_context.llm_predictor.predict(
-                self.summary_prompt, context_str=text_chunk2
+            summary2, _ = self._service_context.llm_scheduler.predict(
+                self._service_context.llm_predictor,
+                self.summary_prompt,
+                context_str=text_chunk2,
             )
             node2 = Node(
                 text=summary2,
@@ -120,7 +144,8 @@ class GPTTreeIndexInserter:
                     cur_graph_node_list, prompt=self.insert_prompt
                 )
             )
-            response, _ = self._service_context.llm_predictor.predict(
+            response, _ = self._service_context.llm_scheduler.predict(
+                self._service_context.llm_predictor,
                 self.insert_prompt,
                 new_chunk_text=node.get_text(),
                 num_chunks=len(cur_graph_node_list),
@@ -147,8 +172,10 @@ class GPTTreeIndexInserter:
             text_chunk = self._service_context.prompt_helper.get_text_from_nodes(
                 cur_graph_node_list, prompt=self.summary_prompt
             )
-            new_summary, _ = self._service_context.llm_predictor.predict(
-                self.summary_prompt, context_str=text_chunk
+            new_summary, _ = self._service_context.llm_scheduler.predict(
+                self._service_context.llm_predictor,
+                self.summary_prompt,
+                context_str=text_chunk,
             )
 
             parent_node.text = new_summary
@@ -157,3 +184,365 @@ class GPTTreeIndexInserter:
         """Insert into index_graph."""
         for node in nodes:
             self._insert_node(node)
+
+    def _get_child_list(self, parent_node: Optional[Node]) -> List[Node]:
+        """Get the sorted children of a parent node."""
+        cur_graph_node_ids = self.index_graph.get_children(parent_node)
+        cur_graph_nodes = self._docstore.get_node_dict(cur_graph_node_ids)
+        return get_sorted_node_list(cur_graph_nodes)
+
+    def _is_leaf(self, node: Node) -> bool:
+        """Check if a node is a leaf node."""
+        children_ids = self.index_graph.node_id_to_children_ids.get(
+            node.get_doc_id(), []
+        )
+        return len(children_ids) == 0
+
+    def _get_select_children_args(
+        self, child_list: List[Node], new_nodes: List[Node]
+    ) -> Dict[str, Any]:
+        """Get the insert batch prompt args to select children for new nodes."""
+        num_chunks = len(child_list) + len(new_nodes)
+        new_chunk_text = (
+            self._service_context.prompt_helper.get_numbered_text_from_nodes(
+                new_nodes, prompt=self.insert_batch_prompt, num_chunks=num_chunks
+            )
+        )
+        numbered_text = (
+            self._service_context.prompt_helper.get_numbered_text_from_nodes(
+                child_list, prompt=self.insert_batch_prompt, num_chunks=num_chunks
+            )
+        )
+        return {
+            "new_chunk_text": new_chunk_text,
+            "num_chunks": len(child_list),
+            "context_list": numbered_text,
+        }
+
+    def _parse_selected_children(
+        self, response: str, child_list: List[Node], num_new_nodes: int
+    ) -> List[Optional[Node]]:
+        """Parse the child selected for each new node.
+
+        Returns None for new nodes without a valid selection.
+
+        """
+        # only look at the numbers after the answer prefix, if any
+        response = response.split("ANSWER:")[-1]
+        numbers = extract_numbers_given_response(response, n=num_new_nodes) or []
+        selected_nodes: List[Optional[Node]] = [None] * num_new_nodes
+        for idx, number in enumerate(numbers):
+            if 0 < int(number) <= len(child_list):
+                selected_nodes[idx] = child_list[int(number) - 1]
+        return selected_nodes
+
+    def _get_summary_args(self, node_list: List[Node]) -> Dict[str, Any]:
+        """Get the summary prompt args to summarize a list of nodes."""
+        text_chunk = self._service_context.prompt_helper.get_text_from_nodes(
+            node_list, prompt=self.summary_prompt
+        )
+        return {"context_str": text_chunk}
+
+    def _predict_all(
+        self, prompt: Prompt, prompt_args_list: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Make an LLM call per set of prompt args, concurrently if use_async."""
+        if self._use_async:
+            tasks = [
+                self._service_context.llm_scheduler.apredict(
+                    self._service_context.llm_predictor, prompt, **prompt_args
+                )
+                for prompt_args in prompt_args_list
+            ]
+            outputs: List[Tuple[str, str]] = run_async_tasks(tasks)
+        else:
+            outputs = [
+                self._service_context.llm_scheduler.predict(
+                    self._service_context.llm_predictor, prompt, **prompt_args
+                )
+                for prompt_args in prompt_args_list
+            ]
+        return [output[0] for output in outputs]
+
+    async def _apredict_all(
+        self, prompt: Prompt, prompt_args_list: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Make an LLM call per set of prompt args, concurrently."""
+        outputs = await asyncio.gather(
+            *[
+                self._service_context.llm_scheduler.apredict(
+                    self._service_context.llm_predictor, prompt, **prompt_args
+                )
+                for prompt_args in prompt_args_list
+            ]
+        )
+        return [output[0] for output in outputs]
+
+    def _add_insert_group(
+        self,
+        insert_groups: Dict[Optional[str], Tuple[Optional[Node], List[Node]]],
+        parent_node: Optional[Node],
+        nodes: List[Node],
+    ) -> None:
+        """Add nodes to insert directly under a parent node."""
+        parent_id = parent_node.get_doc_id() if parent_node is not None else None
+        insert_groups.setdefault(parent_id, (parent_node, []))[1].extend(nodes)
+
+    def _get_select_args_for_level(
+        self,
+        frontier: List[Tuple[Optional[Node], List[Node]]],
+        level_insert_groups: Dict[Optional[str], Tuple[Optional[Node], List[Node]]],
+    ) -> List[Tuple[Optional[Node], List[Node], List[Node]]]:
+        """Get the (parent, children, new nodes) to select children for.
+
+        New nodes that belong directly under their parent (because the
+        parent is empty or has leaf children) are added to the insert groups.
+
+        """
+        select_args: List[Tuple[Optional[Node], List[Node], List[Node]]] = []
+        for parent_node, cur_nodes in frontier:
+            child_list = self._get_child_list(parent_node)
+            # insert under parent if the parent is empty or has leaf children
+            if len(child_list) == 0 or self._is_leaf(child_list[0]):
+                self._add_insert_group(level_insert_groups, parent_node, cur_nodes)
+                continue
+            for i in range(0, len(cur_nodes), self.num_chunks_per_insert_prompt):
+                new_nodes = cur_nodes[i : i + self.num_chunks_per_insert_prompt]
+                select_args.append((parent_node, child_list, new_nodes))
+        return select_args
+
+    def _get_next_frontier(
+        self,
+        select_args: List[Tuple[Optional[Node], List[Node], List[Node]]],
+        responses: List[str],
+        level_insert_groups: Dict[Optional[str], Tuple[Optional[Node], List[Node]]],
+    ) -> List[Tuple[Optional[Node], List[Node]]]:
+        """Route new nodes to the selected children, for the next level."""
+        next_frontier: Dict[str, Tuple[Optional[Node], List[Node]]] = {}
+        for (parent_node, child_list, new_nodes), response in zip(
+            select_args, responses
+        ):
+            selected_nodes = self._parse_selected_children(
+                response, child_list, len(new_nodes)
+            )
+            for new_node, selected_node in zip(new_nodes, selected_nodes):
+                if selected_node is None:
+                    # NOTE: without a valid selection, insert under parent
+                    self._add_insert_group(level_insert_groups, parent_node, [new_node])
+                else:
+                    next_frontier.setdefault(
+                        selected_node.get_doc_id(), (selected_node, [])
+                    )[1].append(new_node)
+        return list(next_frontier.values())
+
+    def _insert_level(
+        self,
+        level_insert_groups: Dict[Optional[str], Tuple[Optional[Node], List[Node]]],
+    ) -> List[Optional[Node]]:
+        """Insert the nodes of a level under their parents.
+
+        Returns the parents that nodes were inserted under.
+
+        """
+        for parent_node, cur_nodes in level_insert_groups.values():
+            for node in cur_nodes:
+                self.index_graph.insert_under_parent(node, parent_node)
+        return [parent_node for parent_node, _ in level_insert_groups.values()]
+
+    def _get_consolidation_groups(
+        self, parent_nodes: List[Optional[Node]]
+    ) -> List[Tuple[Optional[Node], List[List[Node]]]]:
+        """Divide up the children of parents with more than num_children."""
+        consolidation_groups = []
+        for parent_node in parent_nodes:
+            cur_graph_node_list = self._get_child_list(parent_node)
+            num_nodes = len(cur_graph_node_list)
+            if num_nodes <= self.num_children:
+                continue
+            num_groups = max(2, math.ceil(num_nodes / self.num_children))
+            groups = [
+                cur_graph_node_list[
+                    i * num_nodes // num_groups : (i + 1) * num_nodes // num_groups
+                ]
+                for i in range(num_groups)
+            ]
+            consolidation_groups.append((parent_node, groups))
+        return consolidation_groups
+
+    def _replace_children(
+        self,
+        parent_node: Optional[Node],
+        groups: List[List[Node]],
+        summaries: List[str],
+    ) -> None:
+        """Replace groups of children of a parent with new summary nodes."""
+        new_nodes = [Node(text=summary) for summary in summaries]
+        for new_node, group in zip(new_nodes, groups):
+            self.index_graph.insert(new_node, children_nodes=group)
+
+        # replace the children of the parent node with the new nodes
+        if parent_node is not None:
+            self.index_graph.node_id_to_children_ids[parent_node.get_doc_id()] = list()
+        else:
+            self.index_graph.root_nodes = {}
+        for new_node in new_nodes:
+            self.index_graph.insert_under_parent(
+                new_node,
+                parent_node,
+                new_index=self.index_graph.get_index(new_node),
+            )
+        self._docstore.add_documents(new_nodes, allow_update=False)
+
+    def _apply_consolidation(
+        self,
+        consolidation_groups: List[Tuple[Optional[Node], List[List[Node]]]],
+        summaries: List[str],
+    ) -> List[Optional[Node]]:
+        """Apply the summaries of consolidation groups, in order.
+
+        Returns the consolidated parents.
+
+        """
+        summary_iter = iter(summaries)
+        for parent_node, groups in consolidation_groups:
+            self._replace_children(
+                parent_node, groups, [next(summary_iter) for _ in groups]
+            )
+        return [parent_node for parent_node, _ in consolidation_groups]
+
+    def _consolidate(self, parent_nodes: List[Optional[Node]]) -> None:
+        """Consolidate the children of parent nodes.
+
+        As long as a parent has more than num_children children, they are
+        divided up into groups, each replaced by a new intermediate summary
+        node. The summaries of a layer (across parents) are generated in one
+        batch of LLM calls.
+
+        """
+        consolidation_groups = self._get_consolidation_groups(parent_nodes)
+        while len(consolidation_groups) > 0:
+            summaries = self._predict_all(
+                self.summary_prompt,
+                [
+                    self._get_summary_args(group)
+                    for _, groups in consolidation_groups
+                    for group in groups
+                ],
+            )
+            parent_nodes = self._apply_consolidation(consolidation_groups, summaries)
+            consolidation_groups = self._get_consolidation_groups(parent_nodes)
+
+    async def _aconsolidate(self, parent_nodes: List[Optional[Node]]) -> None:
+        """Asynchronously consolidate the children of parent nodes.
+
+        See `_consolidate`.
+
+        """
+        consolidation_groups = self._get_consolidation_groups(parent_nodes)
+        while len(consolidation_groups) > 0:
+            summaries = await self._apredict_all(
+                self.summary_prompt,
+                [
+                    self._get_summary_args(group)
+                    for _, groups in consolidation_groups
+                    for group in groups
+                ],
+            )
+            parent_nodes = self._apply_consolidation(consolidation_groups, summaries)
+            consolidation_groups = self._get_consolidation_groups(parent_nodes)
+
+    def _update_summaries(self, parent_nodes: List[Node]) -> None:
+        """Update the summaries of parent nodes given their children."""
+        summaries = self._predict_all(
+            self.summary_prompt,
+            [
+                self._get_summary_args(self._get_child_list(parent_node))
+                for parent_node in parent_nodes
+            ],
+        )
+        for parent_node, summary in zip(parent_nodes, summaries):
+            parent_node.text = summary
+
+    async def _aupdate_summaries(self, parent_nodes: List[Node]) -> None:
+        """Asynchronously update the summaries of parent nodes."""
+        summaries = await self._apredict_all(
+            self.summary_prompt,
+            [
+                self._get_summary_args(self._get_child_list(parent_node))
+                for parent_node in parent_nodes
+            ],
+        )
+        for parent_node, summary in zip(parent_nodes, summaries):
+            parent_node.text = summary
+
+    def insert_batch(self, nodes: Sequence[Node]) -> None:
+        """Insert nodes into index_graph in a batch.
+
+        Nodes are routed down the tree level by level, with one insert prompt
+        per parent (and per num_chunks_per_insert_prompt new nodes) instead of
+        one per node. Every touched parent is then consolidated and
+        re-summarized once, from the deepest level up to the root nodes.
+        LLM calls within a level are made concurrently if use_async is set.
+
+        """
+        # per level: parent id -> (parent node, nodes to insert directly under it)
+        insert_groups: List[Dict[Optional[str], Tuple[Optional[Node], List[Node]]]] = []
+        # per level: parents that nodes were routed through (none for root level)
+        touched_levels: List[List[Node]] = [[]]
+
+        frontier: List[Tuple[Optional[Node], List[Node]]] = [(None, list(nodes))]
+        while len(frontier) > 0:
+            level_insert_groups: Dict[
+                Optional[str], Tuple[Optional[Node], List[Node]]
+            ] = {}
+            insert_groups.append(level_insert_groups)
+            select_args = self._get_select_args_for_level(frontier, level_insert_groups)
+            responses = self._predict_all(
+                self.insert_batch_prompt,
+                [
+                    self._get_select_children_args(child_list, new_nodes)
+                    for _, child_list, new_nodes in select_args
+                ],
+            )
+            frontier = self._get_next_frontier(
+                select_args, responses, level_insert_groups
+            )
+            touched_levels.append([cast(Node, node) for node, _ in frontier])
+
+        # insert and consolidate, then bubble updated summaries up the tree,
+        # so that every level is summarized from the final state of its children
+        for level in reversed(range(len(insert_groups))):
+            self._consolidate(self._insert_level(insert_groups[level]))
+            self._update_summaries(touched_levels[level])
+
+    async def ainsert_batch(self, nodes: Sequence[Node]) -> None:
+        """Asynchronously insert nodes into index_graph in a batch.
+
+        See `insert_batch`. LLM calls within a level are made concurrently.
+
+        """
+        insert_groups: List[Dict[Optional[str], Tuple[Optional[Node], List[Node]]]] = []
+        touched_levels: List[List[Node]] = [[]]
+
+        frontier: List[Tuple[Optional[Node], List[Node]]] = [(None, list(nodes))]
+        while len(frontier) > 0:
+            level_insert_groups: Dict[
+                Optional[str], Tuple[Optional[Node], List[Node]]
+            ] = {}
+            insert_groups.append(level_insert_groups)
+            select_args = self._get_select_args_for_level(frontier, level_insert_groups)
+            responses = await self._apredict_all(
+                self.insert_batch_prompt,
+                [
+                    self._get_select_children_args(child_list, new_nodes)
+                    for _, child_list, new_nodes in select_args
+                ],
+            )
+            frontier = self._get_next_frontier(
+                select_args, responses, level_insert_groups
+            )
+            touched_levels.append([cast(Node, node) for node, _ in frontier])
+
+        for level in reversed(range(len(insert_groups))):
+            await self._aconsolidate(self._insert_level(insert_groups[level]))
+            await self._aupdate_summaries(touched_levels[level])
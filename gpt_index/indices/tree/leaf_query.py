@@ -1,7 +1,7 @@
 """Leaf query mechanism."""
 
 import logging
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 from langchain.input import print_text
 
@@ -12,6 +12,7 @@ from gpt_index.indices.query.embedding_utils import SimilarityTracker
 from gpt_index.indices.query.schema import QueryBundle
 from gpt_index.indices.response.builder import ResponseBuilder
 from gpt_index.indices.utils import extract_numbers_given_response, get_sorted_node_list
+from gpt_index.prompts.base import Prompt
 from gpt_index.prompts.default_prompts import (
     DEFAULT_QUERY_PROMPT,
     DEFAULT_QUERY_PROMPT_MULTIPLE,
@@ -242,12 +243,10 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
         ).strip()
         return Response(response_str, source_nodes=self.response_builder.get_sources())
 
-    def _select_nodes(
-        self,
-        cur_node_list: List[Node],
-        query_bundle: QueryBundle,
-        level: int = 0,
-    ) -> List[Node]:
+    def _get_select_prompt_args(
+        self, cur_node_list: List[Node], query_bundle: QueryBundle
+    ) -> Tuple[Prompt, Dict[str, Any]]:
+        """Get the prompt and prompt args for selecting child nodes."""
         query_str = query_bundle.query_str
 
         if self.child_branch_factor == 1:
@@ -259,13 +258,7 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
                     cur_node_list, prompt=query_template
                 )
             )
-            (
-                response,
-                formatted_query_prompt,
-            ) = self._service_context.llm_predictor.predict(
-                query_template,
-                context_list=numbered_node_text,
-            )
+            return query_template, {"context_list": numbered_node_text}
         else:
             query_template_multiple = self.query_template_multiple.partial_format(
                 num_chunks=len(cur_node_list),
@@ -277,14 +270,47 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
                     cur_node_list, prompt=query_template_multiple
                 )
             )
-            (
-                response,
-                formatted_query_prompt,
-            ) = self._service_context.llm_predictor.predict(
-                query_template_multiple,
-                context_list=numbered_node_text,
-            )
+            return query_template_multiple, {"context_list": numbered_node_text}
 
+    def _select_nodes(
+        self,
+        cur_node_list: List[Node],
+        query_bundle: QueryBundle,
+        level: int = 0,
+    ) -> List[Node]:
+        prompt, prompt_args = self._get_select_prompt_args(cur_node_list, query_bundle)
+        response, formatted_query_prompt = self._service_context.llm_predictor.predict(
+            prompt, **prompt_args
+        )
+        return self._parse_selected_nodes(
+            response, formatted_query_prompt, cur_node_list, level=level
+        )
+
+    async def _aselect_nodes(
+        self,
+        cur_node_list: List[Node],
+        query_bundle: QueryBundle,
+        level: int = 0,
+    ) -> List[Node]:
+        prompt, prompt_args = self._get_select_prompt_args(cur_node_list, query_bundle)
+        (
+            response,
+            formatted_query_prompt,
+        ) = await self._service_context.llm_scheduler.apredict(
+            self._service_context.llm_predictor, prompt, **prompt_args
+        )
+        return self._parse_selected_nodes(
+            response, formatted_query_prompt, cur_node_list, level=level
+        )
+
+    def _parse_selected_nodes(
+        self,
+        response: str,
+        formatted_query_prompt: str,
+        cur_node_list: List[Node],
+        level: int = 0,
+    ) -> List[Node]:
+        """Parse the nodes selected by the LLM response."""
         logger.debug(
             f">[Level {level}] current prompt template: {formatted_query_prompt}"
         )
@@ -340,6 +366,22 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
 
         return selected_nodes
 
+    def _get_cur_node_list(self, cur_node_ids: Dict[int, str]) -> List[Node]:
+        """Get the sorted list of nodes at the current level."""
+        cur_nodes = {
+            index: self._docstore.get_node(node_id)
+            for index, node_id in cur_node_ids.items()
+        }
+        return get_sorted_node_list(cur_nodes)
+
+    def _get_children_node_ids(self, selected_nodes: List[Node]) -> Dict[int, str]:
+        """Get the children of the selected nodes."""
+        children_nodes = {}
+        for node in selected_nodes:
+            node_dict = self.index_struct.get_children(node)
+            children_nodes.update(node_dict)
+        return children_nodes
+
     def _retrieve_level(
         self,
         cur_node_ids: Dict[int, str],
@@ -347,11 +389,7 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
         level: int = 0,
     ) -> List[Node]:
         """Answer a query recursively."""
-        cur_nodes = {
-            index: self._docstore.get_node(node_id)
-            for index, node_id in cur_node_ids.items()
-        }
-        cur_node_list = get_sorted_node_list(cur_nodes)
+        cur_node_list = self._get_cur_node_list(cur_node_ids)
 
         if len(cur_node_list) > self.child_branch_factor:
             selected_nodes = self._select_nodes(
@@ -362,17 +400,38 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
         else:
             selected_nodes = cur_node_list
 
-        children_nodes = {}
-        for node in selected_nodes:
-            node_dict = self.index_struct.get_children(node)
-            children_nodes.update(node_dict)
-
+        children_nodes = self._get_children_node_ids(selected_nodes)
         if len(children_nodes) == 0:
             # NOTE: leaf level
             return selected_nodes
         else:
             return self._retrieve_level(children_nodes, query_bundle, level + 1)
 
+    async def _aretrieve_level(
+        self,
+        cur_node_ids: Dict[int, str],
+        query_bundle: QueryBundle,
+        level: int = 0,
+    ) -> List[Node]:
+        """Asynchronously answer a query recursively."""
+        cur_node_list = self._get_cur_node_list(cur_node_ids)
+
+        if len(cur_node_list) > self.child_branch_factor:
+            selected_nodes = await self._aselect_nodes(
+                cur_node_list,
+                query_bundle,
+                level=level,
+            )
+        else:
+            selected_nodes = cur_node_list
+
+        children_nodes = self._get_children_node_ids(selected_nodes)
+        if len(children_nodes) == 0:
+            # NOTE: leaf level
+            return selected_nodes
+        else:
+            return await self._aretrieve_level(children_nodes, query_bundle, level + 1)
+
     def _retrieve(
         self,
         query_bundle: QueryBundle,
@@ -384,3 +443,15 @@ class GPTTreeIndexLeafQuery(BaseGPTIndexQuery[IndexGraph]):
             query_bundle,
             level=0,
         )
+
+    async def _aretrieve(
+        self,
+        query_bundle: QueryBundle,
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        """Asynchronously get nodes for response."""
+        return await self._aretrieve_level(
+            self.index_struct.root_nodes,
+            query_bundle,
+            level=0,
+        )
@@ -4,10 +4,13 @@ An index that that is built on top of an existing vector store.
 
 """
 
+import hashlib
+import json
+import os
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from gpt_index.async_utils import run_async_tasks
-from gpt_index.constants import VECTOR_STORE_KEY
+from gpt_index.constants import DATA_KEY, TYPE_KEY, VECTOR_STORE_KEY
 from gpt_index.data_structs.data_structs_v2 import IndexDict
 from gpt_index.data_structs.node_v2 import ImageNode, IndexNode, Node
 from gpt_index.indices.base import BaseGPTIndex, QueryMap
@@ -16,12 +19,17 @@ from gpt_index.indices.service_context import ServiceContext
 from gpt_index.indices.vector_store.base_query import GPTVectorStoreIndexQuery
 from gpt_index.token_counter.token_counter import llm_token_counter
 from gpt_index.vector_stores.registry import (
+    VECTOR_STORE_CLASS_TO_VECTOR_STORE_TYPE,
     load_vector_store_from_dict,
     save_vector_store_to_dict,
 )
+from gpt_index.readers.schema.base import Document
 from gpt_index.vector_stores.simple import SimpleVectorStore
+from gpt_index.vector_stores.simple_ivf import SimpleIVFVectorStore
 from gpt_index.vector_stores.types import NodeEmbeddingResult, VectorStore
 
+INDEX_FILE_NAME = "index.json"
+
 
 class GPTVectorStoreIndex(BaseGPTIndex[IndexDict]):
     """Base GPT Vector Store Index.
@@ -235,6 +243,66 @@ class GPTVectorStoreIndex(BaseGPTIndex[IndexDict]):
         self._index_struct.delete(doc_id)
         self._vector_store.delete(doc_id)
 
+    def _delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete documents."""
+        for doc_id in doc_ids:
+            self._index_struct.delete(doc_id)
+        self._vector_store.delete_many(doc_ids)
+
+    def _get_stored_embeddings(self, doc_ids: Sequence[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of the nodes of documents, by text hash.
+
+        Only supported for local vector stores that do not store text: the node
+        texts are read from the docstore, and the embeddings from the vector store.
+
+        """
+        if self._vector_store.stores_text or not isinstance(
+            self._vector_store, (SimpleVectorStore, SimpleIVFVectorStore)
+        ):
+            return {}
+        embeddings = {}
+        for doc_id in doc_ids:
+            for text_id in self._index_struct.doc_id_dict.get(doc_id, []):
+                node = self._docstore.get_node(self._index_struct.nodes_dict[text_id])
+                text_hash = hashlib.sha256(node.get_text().encode("utf-8")).hexdigest()
+                embeddings[text_hash] = self._vector_store.get(text_id)
+        return embeddings
+
+    def _update_document_batch(
+        self,
+        documents: Sequence[Document],
+        delete_kwargs: Optional[Dict] = None,
+        insert_kwargs: Optional[Dict] = None,
+    ) -> None:
+        """Replace the stored versions of a batch of documents.
+
+        The documents are re-parsed, and every new node with the same text as a
+        node stored for these documents reuses the stored embedding, so only
+        changed chunks are embedded again.
+
+        """
+        doc_ids = [doc.get_doc_id() for doc in documents]
+        stored_embeddings = self._get_stored_embeddings(doc_ids)
+        self.delete_many(doc_ids, **(delete_kwargs or {}))
+
+        for doc in documents:
+            self._docstore.set_document_hash(doc.get_doc_id(), doc.get_doc_hash())
+        nodes = self.service_context.node_parser.get_nodes_from_documents(documents)
+        reused_nodes = []
+        for node in nodes:
+            if node.embedding is not None:
+                continue
+            text_hash = hashlib.sha256(node.get_text().encode("utf-8")).hexdigest()
+            if text_hash in stored_embeddings:
+                node.embedding = stored_embeddings[text_hash]
+                reused_nodes.append(node)
+        self.insert_nodes(nodes, **(insert_kwargs or {}))
+
+        # NOTE: reused embeddings live in the vector store,
+        # don't keep a second copy on the nodes in the docstore
+        for node in reused_nodes:
+            node.embedding = None
+
     @classmethod
     def load_from_dict(
         cls, result_dict: Dict[str, Any], **kwargs: Any
@@ -279,6 +347,64 @@ class GPTVectorStoreIndex(BaseGPTIndex[IndexDict]):
         out_dict[VECTOR_STORE_KEY] = save_vector_store_to_dict(self._vector_store)
         return out_dict
 
+    @classmethod
+    def load_from_dir(
+        cls, persist_dir: str, mmap: bool = True, **kwargs: Any
+    ) -> "BaseGPTIndex":
+        """Load index from a directory written by `save_to_dir`.
+
+        Embeddings of a SimpleVectorStore are memory-mapped by default, so
+        loading is near-instant and vectors are paged in lazily at query time.
+
+        Args:
+            persist_dir (str): The directory the index was saved to.
+            mmap (bool): Whether to memory-map the embeddings. Defaults to True.
+
+        Returns:
+            BaseGPTIndex: The loaded index.
+
+        """
+        with open(os.path.join(persist_dir, INDEX_FILE_NAME), "r") as f:
+            result_dict = json.load(f)
+
+        vector_store_config = result_dict[VECTOR_STORE_KEY][DATA_KEY]
+        for path_key in ["embeddings_path", "norms_path"]:
+            if path_key in vector_store_config:
+                vector_store_config[path_key] = os.path.join(
+                    persist_dir, vector_store_config[path_key]
+                )
+                vector_store_config["mmap"] = mmap
+        return cls.load_from_dict(result_dict, **kwargs)
+
+    def save_to_dir(
+        self, persist_dir: str, encoding: str = "ascii", **save_kwargs: Any
+    ) -> None:
+        """Save to a directory.
+
+        Same as `save_to_disk`, except that the embeddings of a SimpleVectorStore
+        are stored in binary `.npy` files next to the JSON file, instead of
+        as JSON lists of floats. Use `load_from_dir` to load the index back.
+
+        Args:
+            persist_dir (str): The directory to save the index to.
+            encoding (str): The encoding of the JSON file.
+
+        """
+        os.makedirs(persist_dir, exist_ok=True)
+        out_dict = super().save_to_dict()
+        if isinstance(self._vector_store, SimpleVectorStore):
+            out_dict[VECTOR_STORE_KEY] = {
+                TYPE_KEY: VECTOR_STORE_CLASS_TO_VECTOR_STORE_TYPE[SimpleVectorStore],
+                DATA_KEY: self._vector_store.persist(persist_dir),
+            }
+        else:
+            out_dict[VECTOR_STORE_KEY] = save_vector_store_to_dict(self._vector_store)
+
+        with open(
+            os.path.join(persist_dir, INDEX_FILE_NAME), "wt", encoding=encoding
+        ) as f:
+            json.dump(out_dict, f, **save_kwargs)
+
     @property
     def query_context(self) -> Dict[str, Any]:
         return {"vector_store": self._vector_store}
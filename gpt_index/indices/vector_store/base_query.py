@@ -1,11 +1,12 @@
 """Base vector store index query."""
 
-
+import asyncio
 from typing import Any, List, Optional
 
 from gpt_index.data_structs.data_structs_v2 import IndexDict
 
 from gpt_index.data_structs.node_v2 import Node
+from gpt_index.embeddings.base import mean_agg
 from gpt_index.indices.query.base import BaseGPTIndexQuery
 from gpt_index.indices.query.embedding_utils import SimilarityTracker
 from gpt_index.indices.query.schema import QueryBundle
@@ -15,6 +16,7 @@ from gpt_index.vector_stores.types import (
     VectorStore,
     VectorStoreQuery,
     VectorStoreQueryMode,
+    VectorStoreQueryResult,
 )
 
 
@@ -49,20 +51,9 @@ class GPTVectorStoreIndexQuery(BaseGPTIndexQuery[IndexDict]):
         self._vector_store_query_mode = VectorStoreQueryMode(vector_store_query_mode)
         self._alpha = alpha
 
-    def _retrieve(
-        self,
-        query_bundle: QueryBundle,
-        similarity_tracker: Optional[SimilarityTracker] = None,
-    ) -> List[Node]:
-        if self._vector_store.is_embedding_query:
-            if query_bundle.embedding is None:
-                query_bundle.embedding = (
-                    self._service_context.embed_model.get_agg_embedding_from_queries(
-                        query_bundle.embedding_strs
-                    )
-                )
-
-        query = VectorStoreQuery(
+    def _get_vector_store_query(self, query_bundle: QueryBundle) -> VectorStoreQuery:
+        """Get vector store query from query bundle."""
+        return VectorStoreQuery(
             query_embedding=query_bundle.embedding,
             similarity_top_k=self._similarity_top_k,
             doc_ids=self._doc_ids,
@@ -70,8 +61,13 @@ class GPTVectorStoreIndexQuery(BaseGPTIndexQuery[IndexDict]):
             mode=self._vector_store_query_mode,
             alpha=self._alpha,
         )
-        query_result = self._vector_store.query(query)
 
+    def _get_nodes_from_query_result(
+        self,
+        query_result: VectorStoreQueryResult,
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        """Get nodes from vector store query result."""
         if query_result.nodes is None:
             # NOTE: vector store does not keep text and returns node indices.
             # Need to recover all nodes from docstore
@@ -99,3 +95,116 @@ class GPTVectorStoreIndexQuery(BaseGPTIndexQuery[IndexDict]):
                 similarity_tracker.add(node, similarity)
 
         return query_result.nodes
+
+    def _retrieve(
+        self,
+        query_bundle: QueryBundle,
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        if self._vector_store.is_embedding_query:
+            if query_bundle.embedding is None:
+                query_bundle.embedding = (
+                    self._service_context.embed_model.get_agg_embedding_from_queries(
+                        query_bundle.embedding_strs
+                    )
+                )
+
+        query = self._get_vector_store_query(query_bundle)
+        query_result = self._vector_store.query(query)
+        return self._get_nodes_from_query_result(query_result, similarity_tracker)
+
+    async def _aretrieve(
+        self,
+        query_bundle: QueryBundle,
+        similarity_tracker: Optional[SimilarityTracker] = None,
+    ) -> List[Node]:
+        if self._vector_store.is_embedding_query:
+            if query_bundle.embedding is None:
+                embed_model = self._service_context.embed_model
+                query_bundle.embedding = (
+                    await embed_model.aget_agg_embedding_from_queries(
+                        query_bundle.embedding_strs
+                    )
+                )
+
+        query = self._get_vector_store_query(query_bundle)
+        # most vector stores make blocking (e.g. HTTP) calls, so query them
+        # in the default executor to avoid blocking the event loop
+        loop = asyncio.get_running_loop()
+        query_result = await loop.run_in_executor(None, self._vector_store.query, query)
+        return self._get_nodes_from_query_result(query_result, similarity_tracker)
+
+    def _retrieve_batch(
+        self,
+        query_bundles: List[QueryBundle],
+        similarity_trackers: List[SimilarityTracker],
+    ) -> List[List[Node]]:
+        """Get nodes for a batch of queries.
+
+        All missing query embeddings are computed in a single embedding call,
+        and the vector store is queried once for the whole batch.
+
+        """
+        bundles_to_embed = [qb for qb in query_bundles if qb.embedding is None]
+        if self._vector_store.is_embedding_query and len(bundles_to_embed) > 0:
+            all_embeddings = self._service_context.embed_model.get_query_embeddings(
+                self._get_all_embedding_strs(bundles_to_embed)
+            )
+            self._set_agg_embeddings(bundles_to_embed, all_embeddings)
+
+        return self._query_batch(query_bundles, similarity_trackers)
+
+    async def _aretrieve_batch(
+        self,
+        query_bundles: List[QueryBundle],
+        similarity_trackers: List[SimilarityTracker],
+    ) -> List[List[Node]]:
+        """Asynchronously get nodes for a batch of queries."""
+        bundles_to_embed = [qb for qb in query_bundles if qb.embedding is None]
+        if self._vector_store.is_embedding_query and len(bundles_to_embed) > 0:
+            embed_model = self._service_context.embed_model
+            all_embeddings = await embed_model.aget_query_embeddings(
+                self._get_all_embedding_strs(bundles_to_embed)
+            )
+            self._set_agg_embeddings(bundles_to_embed, all_embeddings)
+
+        # the vector store is queried in the default executor, as in _aretrieve
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._query_batch, query_bundles, similarity_trackers
+        )
+
+    def _get_all_embedding_strs(self, query_bundles: List[QueryBundle]) -> List[str]:
+        """Get the embedding strings of a batch of queries, flattened."""
+        return [
+            embedding_str
+            for query_bundle in query_bundles
+            for embedding_str in query_bundle.embedding_strs
+        ]
+
+    def _set_agg_embeddings(
+        self, query_bundles: List[QueryBundle], all_embeddings: List[List[float]]
+    ) -> None:
+        """Set the aggregated embedding of each query from flattened embeddings."""
+        offset = 0
+        for query_bundle in query_bundles:
+            num_strs = len(query_bundle.embedding_strs)
+            query_bundle.embedding = mean_agg(
+                all_embeddings[offset : offset + num_strs]
+            )
+            offset += num_strs
+
+    def _query_batch(
+        self,
+        query_bundles: List[QueryBundle],
+        similarity_trackers: List[SimilarityTracker],
+    ) -> List[List[Node]]:
+        """Query the vector store once for a batch of embedded queries."""
+        queries = [self._get_vector_store_query(qb) for qb in query_bundles]
+        query_results = self._vector_store.query_batch(queries)
+        return [
+            self._get_nodes_from_query_result(query_result, similarity_tracker)
+            for query_result, similarity_tracker in zip(
+                query_results, similarity_trackers
+            )
+        ]
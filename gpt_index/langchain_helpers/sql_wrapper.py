@@ -1,5 +1,6 @@
 """SQL wrapper around SQLDatabase in langchain."""
-from typing import Any, Dict, List, Tuple, Optional
+from itertools import groupby
+from typing import Any, Dict, List, Sequence, Tuple, Optional
 
 from langchain.sql_database import SQLDatabase as LangchainSQLDatabase
 from sqlalchemy import MetaData, create_engine, insert, text
@@ -71,6 +72,19 @@ class SQLDatabase(LangchainSQLDatabase):
         stmt = insert(table).values(**data)
         self._engine.execute(stmt)
 
+    def insert_many_into_table(self, table_name: str, data: Sequence[dict]) -> None:
+        """Insert rows into a table, in bulk.
+
+        Consecutive rows with the same columns are inserted with a single
+        `executemany` statement, all within one transaction, so rows are
+        inserted in the order they are given.
+
+        """
+        table = self.metadata_obj.tables[table_name]
+        with self._engine.begin() as connection:
+            for _, rows in groupby(data, key=lambda row: frozenset(row.keys())):
+                connection.execute(insert(table), list(rows))
+
     def run_sql(self, command: str) -> Tuple[str, Dict]:
         """Execute a SQL statement and return a string representing the results.
 
@@ -1,10 +1,10 @@
 """Text splitter implementations."""
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from langchain.text_splitter import TextSplitter
 
-from gpt_index.utils import globals_helper
+from gpt_index.utils import count_tokens, globals_helper
 
 
 @dataclass
@@ -43,6 +43,24 @@ class TokenTextSplitter(TextSplitter):
         self.tokenizer = tokenizer or globals_helper.tokenizer
         self._backup_separators = backup_separators
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get state for pickling.
+
+        The global tokenizer is not pickled; it is loaded again on unpickling
+        (e.g. once per worker process).
+
+        """
+        state = self.__dict__.copy()
+        if state["tokenizer"] is globals_helper.tokenizer:
+            state["tokenizer"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Set state when unpickling."""
+        self.__dict__.update(state)
+        if self.tokenizer is None:
+            self.tokenizer = globals_helper.tokenizer
+
     def _reduce_chunk_size(
         self, start_idx: int, cur_idx: int, splits: List[str]
     ) -> int:
@@ -51,8 +69,8 @@ class TokenTextSplitter(TextSplitter):
         Return the new cur_idx.
 
         """
-        current_doc_total = len(
-            self.tokenizer(self._separator.join(splits[start_idx:cur_idx]))
+        current_doc_total = count_tokens(
+            self._separator.join(splits[start_idx:cur_idx]), self.tokenizer
         )
         while current_doc_total > self._chunk_size:
             percent_to_reduce = (
@@ -60,11 +78,15 @@ class TokenTextSplitter(TextSplitter):
             ) / current_doc_total
             num_to_reduce = int(percent_to_reduce * (cur_idx - start_idx)) + 1
             cur_idx -= num_to_reduce
-            current_doc_total = len(
-                self.tokenizer(self._separator.join(splits[start_idx:cur_idx]))
+            current_doc_total = count_tokens(
+                self._separator.join(splits[start_idx:cur_idx]), self.tokenizer
             )
         return cur_idx
 
+    def _get_split_token_counts(self, splits: List[str]) -> List[int]:
+        """Get the number of tokens in each split (at least 1)."""
+        return [max(count_tokens(split, self.tokenizer), 1) for split in splits]
+
     def _preprocess_splits(self, splits: List[str], chunk_size: int) -> List[str]:
         """Process splits.
 
@@ -75,7 +97,7 @@ class TokenTextSplitter(TextSplitter):
         """
         new_splits = []
         for split in splits:
-            num_cur_tokens = len(self.tokenizer(split))
+            num_cur_tokens = count_tokens(split, self.tokenizer)
             if num_cur_tokens <= chunk_size:
                 new_splits.append(split)
             else:
@@ -90,7 +112,7 @@ class TokenTextSplitter(TextSplitter):
 
                 cur_splits2 = []
                 for cur_split in cur_splits:
-                    num_cur_tokens = len(self.tokenizer(cur_split))
+                    num_cur_tokens = count_tokens(cur_split, self.tokenizer)
                     if num_cur_tokens <= chunk_size:
                         cur_splits2.extend([cur_split])
                     else:
@@ -129,7 +151,7 @@ class TokenTextSplitter(TextSplitter):
         #       This reduces the effective chunk size that we can have
         if extra_info_str is not None:
             # NOTE: extra 2 newline chars for formatting when prepending in query
-            num_extra_tokens = len(self.tokenizer(f"{extra_info_str}\n\n")) + 1
+            num_extra_tokens = count_tokens(f"{extra_info_str}\n\n", self.tokenizer) + 1
             effective_chunk_size = self._chunk_size - num_extra_tokens
 
             if effective_chunk_size <= 0:
@@ -142,6 +164,9 @@ class TokenTextSplitter(TextSplitter):
         # First we naively split the large input into a bunch of smaller ones.
         splits = text.split(self._separator)
         splits = self._preprocess_splits(splits, effective_chunk_size)
+        # NOTE: count the tokens of each split once up front, instead of
+        # re-tokenizing splits as the window moves
+        split_token_counts = self._get_split_token_counts(splits)
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
         docs: List[TextSplit] = []
@@ -151,8 +176,7 @@ class TokenTextSplitter(TextSplitter):
         cur_total = 0
         prev_idx = 0  # store the previous end index
         while cur_idx < len(splits):
-            cur_token = splits[cur_idx]
-            num_cur_tokens = max(len(self.tokenizer(cur_token)), 1)
+            num_cur_tokens = split_token_counts[cur_idx]
             if num_cur_tokens > effective_chunk_size:
                 raise ValueError(
                     "A single term is larger than the allowed chunk size.\n"
@@ -186,8 +210,7 @@ class TokenTextSplitter(TextSplitter):
                 while cur_total > self._chunk_overlap and start_idx < cur_idx:
                     # # call tokenizer on entire overlap
                     # cur_total = self.tokenizer()
-                    cur_num_tokens = max(len(self.tokenizer(splits[start_idx])), 1)
-                    cur_total -= cur_num_tokens
+                    cur_total -= split_token_counts[start_idx]
                     start_idx += 1
                 # NOTE: This is a hack, make more general
                 if start_idx == cur_idx:
@@ -195,10 +218,8 @@ class TokenTextSplitter(TextSplitter):
             # Build up the current_doc with term d, and update the total counter with
             # the number of the number of tokens in d, wrt self.tokenizer
 
-            # we reassign cur_token and num_cur_tokens, because cur_idx
-            # may have changed
-            cur_token = splits[cur_idx]
-            num_cur_tokens = max(len(self.tokenizer(cur_token)), 1)
+            # we reassign num_cur_tokens, because cur_idx may have changed
+            num_cur_tokens = split_token_counts[cur_idx]
 
             cur_total += num_cur_tokens
             cur_idx += 1
@@ -226,8 +247,7 @@ class TokenTextSplitter(TextSplitter):
         cur_idx = 0
         cur_total = 0
         while cur_idx < len(splits):
-            cur_token = splits[cur_idx]
-            num_cur_tokens = max(len(self.tokenizer(cur_token)), 1)
+            num_cur_tokens = max(count_tokens(splits[cur_idx], self.tokenizer), 1)
             if cur_total + num_cur_tokens > self._chunk_size:
                 cur_idx = self._reduce_chunk_size(start_idx, cur_idx, splits)
                 break
@@ -321,7 +341,7 @@ class SentenceSplitter(TextSplitter):
         #       This reduces the effective chunk size that we can have
         if extra_info_str is not None:
             # NOTE: extra 2 newline chars for formatting when prepending in query
-            num_extra_tokens = len(self.tokenizer(f"{extra_info_str}\n\n")) + 1
+            num_extra_tokens = count_tokens(f"{extra_info_str}\n\n", self.tokenizer) + 1
             effective_chunk_size = self._chunk_size - num_extra_tokens
 
             if effective_chunk_size <= 0:
@@ -359,7 +379,7 @@ class SentenceSplitter(TextSplitter):
 
         new_splits: List[Split] = []
         for split in splits:
-            split_len = len(self.tokenizer(split))
+            split_len = count_tokens(split, self.tokenizer)
             if split_len <= effective_chunk_size:
                 new_splits.append(Split(split, True))
             else:
@@ -372,7 +392,7 @@ class SentenceSplitter(TextSplitter):
                 else:
                     splits2 = [split]
                 for split2 in splits2:
-                    if len(self.tokenizer(split2)) <= effective_chunk_size:
+                    if count_tokens(split2, self.tokenizer) <= effective_chunk_size:
                         new_splits.append(Split(split2, False))
                     else:
                         splits3 = split2.split(self._separator)
@@ -384,7 +404,7 @@ class SentenceSplitter(TextSplitter):
         cur_tokens = 0
         while len(new_splits) > 0:
             cur_token = new_splits[0]
-            cur_len = len(self.tokenizer(cur_token.text))
+            cur_len = count_tokens(cur_token.text, self.tokenizer)
             if cur_len > effective_chunk_size:
                 raise ValueError("Single token exceed chunk size")
             if cur_tokens + cur_len > effective_chunk_size:
@@ -2,9 +2,11 @@
 
 # TODO: move LLMPredictor to this folder
 from gpt_index.llm_predictor.base import LLMPredictor
+from gpt_index.llm_predictor.scheduler import LLMScheduler
 from gpt_index.llm_predictor.structured import StructuredLLMPredictor
 
 __all__ = [
     "LLMPredictor",
+    "LLMScheduler",
     "StructuredLLMPredictor",
 ]
@@ -1,17 +1,21 @@
 """Wrapper functions around an LLM chain."""
 
+import hashlib
+import json
 import logging
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generator, Optional, Protocol, Tuple
+from typing import Any, Dict, Generator, List, Optional, Protocol, Tuple
 
 import openai
 from langchain import Cohere, LLMChain, OpenAI
 from langchain.chat_models import ChatOpenAI
 from langchain.llms import AI21
-from langchain.schema import BaseLanguageModel
+from langchain.prompts.base import BasePromptTemplate
+from langchain.schema import BaseLanguageModel, BaseMessage
 
 from gpt_index.constants import MAX_CHUNK_SIZE, NUM_OUTPUTS
+from gpt_index.llm_predictor.cache import BaseLLMCache
 from gpt_index.prompts.base import Prompt
 from gpt_index.utils import (
     ErrorToRetry,
@@ -78,6 +82,32 @@ def _get_response_gen(openai_response_stream: Generator) -> Generator:
         yield response["choices"][0]["text"]
 
 
+def _get_chat_response_gen(openai_response_stream: Generator) -> Generator:
+    """Get response generator from openai chat completion stream."""
+    for response in openai_response_stream:
+        yield response["choices"][0]["delta"].get("content", "")
+
+
+def _stream_chat_completion(llm: ChatOpenAI, messages: List[BaseMessage]) -> Generator:
+    """Stream a chat completion from a ChatOpenAI LLM.
+
+    NOTE: langchain does not expose a streaming generator for chat models,
+    so this relies on private ChatOpenAI APIs.
+
+    """
+    if not hasattr(llm, "_create_message_dicts") or not hasattr(
+        llm, "completion_with_retry"
+    ):
+        raise ValueError(
+            "Streaming with ChatOpenAI is not supported by the installed "
+            "langchain version."
+        )
+    message_dicts, params = llm._create_message_dicts(messages, None)
+    params["stream"] = True
+    raw_response_gen = llm.completion_with_retry(messages=message_dicts, **params)
+    return _get_chat_response_gen(raw_response_gen)
+
+
 class BaseLLMPredictor(Protocol):
     """Base LLM Predictor."""
 
@@ -155,15 +185,25 @@ class LLMPredictor(BaseLLMPredictor):
         retry_on_throttling (bool): Whether to retry on rate limit errors.
             Defaults to true.
 
+        llm_cache (Optional[BaseLLMCache]): Optional cache for LLM responses,
+            keyed by the formatted prompt and the LLM params. Defaults to None.
+
     """
 
     def __init__(
-        self, llm: Optional[BaseLanguageModel] = None, retry_on_throttling: bool = True
+        self,
+        llm: Optional[BaseLanguageModel] = None,
+        retry_on_throttling: bool = True,
+        llm_cache: Optional[BaseLLMCache] = None,
     ) -> None:
         """Initialize params."""
         self._llm = llm or OpenAI(temperature=0, model_name="text-davinci-003")
         self.retry_on_throttling = retry_on_throttling
+        self._llm_cache = llm_cache
         self._total_tokens_used = 0
+        self._total_cached_tokens = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
         self.flag = True
         self._last_token_usage: Optional[int] = None
 
@@ -180,15 +220,23 @@ class LLMPredictor(BaseLLMPredictor):
         else:
             return LLMMetadata()
 
+    def _get_langchain_prompt(self, prompt: Prompt) -> BasePromptTemplate:
+        """Get the langchain prompt to make LLM calls with."""
+        return prompt.get_langchain_prompt(llm=self._llm)
+
+    def _get_messages(self, prompt: Prompt, **prompt_args: Any) -> List[BaseMessage]:
+        """Get the chat messages of a prompt, for chat models."""
+        lc_prompt = self._get_langchain_prompt(prompt)
+        full_prompt_args = prompt.get_full_format_args(prompt_args)
+        return lc_prompt.format_prompt(**full_prompt_args).to_messages()
+
     def _predict(self, prompt: Prompt, **prompt_args: Any) -> str:
         """Inner predict function.
 
         If retry_on_throttling is true, we will retry on rate limit errors.
 
         """
-        llm_chain = LLMChain(
-            prompt=prompt.get_langchain_prompt(llm=self._llm), llm=self._llm
-        )
+        llm_chain = LLMChain(prompt=self._get_langchain_prompt(prompt), llm=self._llm)
 
         # Note: we don't pass formatted_prompt to llm_chain.predict because
         # langchain does the same formatting under the hood
@@ -209,6 +257,56 @@ class LLMPredictor(BaseLLMPredictor):
             llm_prediction = llm_chain.predict(**full_prompt_args)
         return llm_prediction
 
+    def _get_llm_cache_params(self) -> Dict[str, Any]:
+        """Get the LLM params that are part of the cache key."""
+        return {
+            "llm": type(self._llm).__name__,
+            "temperature": getattr(self._llm, "temperature", None),
+            **getattr(self._llm, "_identifying_params", {}),
+        }
+
+    def _lookup_llm_cache(self, formatted_prompt: str) -> Tuple[str, Optional[str]]:
+        """Look up the response for a formatted prompt in the LLM cache.
+
+        Returns the cache key and the cached response (or None).
+
+        """
+        if self._llm_cache is None:
+            return "", None
+        key_dict = {"prompt": formatted_prompt, **self._get_llm_cache_params()}
+        key_str = json.dumps(key_dict, sort_keys=True, default=str)
+        cache_key = hashlib.sha256(key_str.encode("utf-8")).hexdigest()
+        llm_prediction = self._llm_cache.get(cache_key)
+        if llm_prediction is None:
+            self._cache_misses += 1
+        else:
+            self._cache_hits += 1
+        return cache_key, llm_prediction
+
+    def _update_llm_cache(self, cache_key: str, llm_prediction: str) -> None:
+        """Put a new response in the LLM cache."""
+        if self._llm_cache is not None:
+            self._llm_cache.put(cache_key, llm_prediction)
+
+    def _update_token_usage(
+        self, formatted_prompt: str, llm_prediction: str, is_cached: bool = False
+    ) -> None:
+        """Update token usage.
+
+        Tokens of responses served from the LLM cache are counted in
+        total_cached_tokens instead of total_tokens_used.
+
+        """
+        # We assume that the value of formatted_prompt is exactly the thing
+        # eventually sent to OpenAI, or whatever LLM downstream
+        prompt_tokens_count = self._count_tokens(formatted_prompt)
+        prediction_tokens_count = self._count_tokens(llm_prediction)
+        tokens_count = prompt_tokens_count + prediction_tokens_count
+        if is_cached:
+            self._total_cached_tokens += tokens_count
+        else:
+            self._total_tokens_used += tokens_count
+
     def predict(self, prompt: Prompt, **prompt_args: Any) -> Tuple[str, str]:
         """Predict the answer to a query.
 
@@ -220,14 +318,17 @@ class LLMPredictor(BaseLLMPredictor):
 
         """
         formatted_prompt = prompt.format(llm=self._llm, **prompt_args)
-        llm_prediction = self._predict(prompt, **prompt_args)
+        cache_key, cached_prediction = self._lookup_llm_cache(formatted_prompt)
+        if cached_prediction is None:
+            llm_prediction = self._predict(prompt, **prompt_args)
+            self._update_llm_cache(cache_key, llm_prediction)
+        else:
+            llm_prediction = cached_prediction
         logger.debug(llm_prediction)
 
-        # We assume that the value of formatted_prompt is exactly the thing
-        # eventually sent to OpenAI, or whatever LLM downstream
-        prompt_tokens_count = self._count_tokens(formatted_prompt)
-        prediction_tokens_count = self._count_tokens(llm_prediction)
-        self._total_tokens_used += prompt_tokens_count + prediction_tokens_count
+        self._update_token_usage(
+            formatted_prompt, llm_prediction, is_cached=cached_prediction is not None
+        )
         return llm_prediction, formatted_prompt
 
     def stream(self, prompt: Prompt, **prompt_args: Any) -> Tuple[Generator, str]:
@@ -236,26 +337,60 @@ class LLMPredictor(BaseLLMPredictor):
         NOTE: this is a beta feature. Will try to build or use
         better abstractions about response handling.
 
+        Only supported for OpenAI and ChatOpenAI LLMs. Token usage is
+        counted once the returned generator has been consumed.
+
         Args:
             prompt (Prompt): Prompt to use for prediction.
 
         Returns:
-            str: The predicted answer.
+            Tuple[Generator, str]: Tuple of the generator over the predicted
+                answer and the formatted prompt.
 
         """
-        if not isinstance(self._llm, OpenAI):
-            raise ValueError("stream is only supported for OpenAI LLMs")
         formatted_prompt = prompt.format(llm=self._llm, **prompt_args)
-        raw_response_gen = self._llm.stream(formatted_prompt)
-        response_gen = _get_response_gen(raw_response_gen)
-        # NOTE/TODO: token counting doesn't work with streaming
+        if isinstance(self._llm, OpenAI):
+            raw_response_gen = self._llm.stream(formatted_prompt)
+            response_gen = _get_response_gen(raw_response_gen)
+        elif isinstance(self._llm, ChatOpenAI):
+            response_gen = _stream_chat_completion(
+                self._llm, self._get_messages(prompt, **prompt_args)
+            )
+        else:
+            raise ValueError("stream is only supported for OpenAI and ChatOpenAI LLMs")
+        response_gen = self._get_token_counted_gen(response_gen, formatted_prompt)
         return response_gen, formatted_prompt
 
+    def _get_token_counted_gen(
+        self, response_gen: Generator, formatted_prompt: str
+    ) -> Generator:
+        """Yield from the response generator, then update token usage."""
+        response_text = ""
+        for response in response_gen:
+            response_text += response
+            yield response
+        self._update_token_usage(formatted_prompt, response_text)
+
     @property
     def total_tokens_used(self) -> int:
         """Get the total tokens used so far."""
         return self._total_tokens_used
 
+    @property
+    def total_cached_tokens(self) -> int:
+        """Get the total tokens of responses served from the LLM cache."""
+        return self._total_cached_tokens
+
+    @property
+    def cache_hits(self) -> int:
+        """Get the number of responses served from the LLM cache."""
+        return self._cache_hits
+
+    @property
+    def cache_misses(self) -> int:
+        """Get the number of LLM calls made because of LLM cache misses."""
+        return self._cache_misses
+
     def _count_tokens(self, text: str) -> int:
         tokens = globals_helper.tokenizer(text)
         return len(tokens)
@@ -278,9 +413,7 @@ class LLMPredictor(BaseLLMPredictor):
         If retry_on_throttling is true, we will retry on rate limit errors.
 
         """
-        llm_chain = LLMChain(
-            prompt=prompt.get_langchain_prompt(llm=self._llm), llm=self._llm
-        )
+        llm_chain = LLMChain(prompt=self._get_langchain_prompt(prompt), llm=self._llm)
 
         # Note: we don't pass formatted_prompt to llm_chain.predict because
         # langchain does the same formatting under the hood
@@ -300,12 +433,15 @@ class LLMPredictor(BaseLLMPredictor):
 
         """
         formatted_prompt = prompt.format(llm=self._llm, **prompt_args)
-        llm_prediction = await self._apredict(prompt, **prompt_args)
+        cache_key, cached_prediction = self._lookup_llm_cache(formatted_prompt)
+        if cached_prediction is None:
+            llm_prediction = await self._apredict(prompt, **prompt_args)
+            self._update_llm_cache(cache_key, llm_prediction)
+        else:
+            llm_prediction = cached_prediction
         logger.debug(llm_prediction)
 
-        # We assume that the value of formatted_prompt is exactly the thing
-        # eventually sent to OpenAI, or whatever LLM downstream
-        prompt_tokens_count = self._count_tokens(formatted_prompt)
-        prediction_tokens_count = self._count_tokens(llm_prediction)
-        self._total_tokens_used += prompt_tokens_count + prediction_tokens_count
+        self._update_token_usage(
+            formatted_prompt, llm_prediction, is_cached=cached_prediction is not None
+        )
         return llm_prediction, formatted_prompt
@@ -0,0 +1,149 @@
+"""LLM response cache.
+
+Caches LLM responses, keyed by the fully formatted prompt and the LLM params,
+so that repeated prompts do not call the LLM again.
+
+"""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+DEFAULT_LRU_SIZE = 1000
+
+
+class BaseLLMCache(ABC):
+    """Base LLM response cache.
+
+    Args:
+        ttl (Optional[float]): Time to live of cached responses, in seconds.
+            Defaults to None (responses never expire).
+
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        """Init params."""
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0")
+        self._ttl = ttl
+
+    def _is_expired(self, created_at: float) -> bool:
+        """Check whether a response created at `created_at` has expired."""
+        return self._ttl is not None and time.time() - created_at > self._ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Get response for key, or None if the key is not cached or expired."""
+
+    @abstractmethod
+    def put(self, key: str, response: str) -> None:
+        """Put response for key."""
+
+
+class InMemoryLLMCache(BaseLLMCache):
+    """In-memory LRU LLM response cache.
+
+    Args:
+        max_size (int): Maximum number of responses to keep.
+            Least recently used responses are evicted first.
+        ttl (Optional[float]): Time to live of cached responses, in seconds.
+
+    """
+
+    def __init__(
+        self, max_size: int = DEFAULT_LRU_SIZE, ttl: Optional[float] = None
+    ) -> None:
+        """Init params."""
+        super().__init__(ttl=ttl)
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        self._max_size = max_size
+        # key -> (response, created_at)
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get response for key."""
+        with self._lock:
+            if key not in self._cache:
+                return None
+            response, created_at = self._cache[key]
+            if self._is_expired(created_at):
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: str) -> None:
+        """Put response for key."""
+        with self._lock:
+            self._cache[key] = (response, time.time())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Get number of cached responses."""
+        return len(self._cache)
+
+
+class SQLiteLLMCache(BaseLLMCache):
+    """SQLite LLM response cache.
+
+    Responses are persisted in a local SQLite file, so the cache survives
+    across processes.
+
+    Args:
+        path (str): Path to the SQLite file. Use ":memory:" for a
+            non-persistent cache.
+        ttl (Optional[float]): Time to live of cached responses, in seconds.
+
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None) -> None:
+        """Init params."""
+        super().__init__(ttl=ttl)
+        self._path = path
+        # NOTE: the connection is shared across threads, guarded by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Get response for key."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self._is_expired(created_at):
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM llm_responses WHERE key = ?", (key,)
+                    )
+                return None
+            return response
+
+    def put(self, key: str, response: str) -> None:
+        """Put response for key."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self._conn.close()
@@ -1,7 +1,7 @@
 """Wrapper functions around an LLM chain."""
 
 import logging
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import openai
 from langchain import LLMChain
@@ -53,6 +53,15 @@ class ChatGPTLLMPredictor(LLMPredictor):
         )
         self.prepend_messages = prepend_messages
 
+    def _get_llm_cache_params(self) -> Dict[str, Any]:
+        """Add prepend_messages to the LLM cache params."""
+        cache_params = super()._get_llm_cache_params()
+        if self.prepend_messages:
+            cache_params["prepend_messages"] = [
+                repr(message) for message in self.prepend_messages
+            ]
+        return cache_params
+
     def _get_langchain_prompt(
         self, prompt: Prompt
     ) -> Union[ChatPromptTemplate, BasePromptTemplate]:
@@ -0,0 +1,267 @@
+"""Scheduler for async LLM calls."""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from typing import Any, List, Optional, Tuple
+
+import openai
+
+from gpt_index.llm_predictor.base import BaseLLMPredictor
+from gpt_index.prompts.base import Prompt
+from gpt_index.utils import AdaptiveBackoff, ErrorToRetry, globals_helper
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_MAX_RETRIES = 10
+
+DEFAULT_ERRORS_TO_RETRY = [
+    ErrorToRetry(openai.error.RateLimitError),
+    ErrorToRetry(openai.error.ServiceUnavailableError),
+    ErrorToRetry(openai.error.TryAgain),
+    ErrorToRetry(openai.error.APIConnectionError, lambda e: e.should_retry),
+]
+
+
+class RateLimiter:
+    """Rate limiter over a per-minute budget.
+
+    Up to a minute's worth of budget can be used in a burst, after which the
+    budget is refilled continuously. Callers reserve an amount and wait for
+    the returned number of seconds; reservations that go over the budget are
+    paid back by later callers waiting longer.
+
+    Args:
+        limit_per_minute (float): Budget (e.g. requests or tokens) per minute.
+
+    """
+
+    def __init__(self, limit_per_minute: float) -> None:
+        """Init params."""
+        if limit_per_minute <= 0:
+            raise ValueError("limit_per_minute must be > 0")
+        self._capacity = limit_per_minute
+        self._rate = limit_per_minute / 60.0
+        self._available = limit_per_minute
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Reserve an amount of the budget.
+
+        Returns:
+            float: seconds to wait before the amount may be used.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(
+                self._capacity,
+                self._available + (now - self._last_refill) * self._rate,
+            )
+            self._last_refill = now
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available / self._rate
+
+
+class LLMScheduler:
+    """Scheduler for async LLM calls.
+
+    All LLM calls made by index builders (and response synthesis) are
+    submitted through the scheduler of the service context, with `predict`
+    (blocking) or `apredict` (async). The scheduler bounds the number of
+    calls in flight, keeps calls under optional requests-per-minute and
+    tokens-per-minute limits, and backs off when calls are throttled, with a
+    backoff shared by all calls. Throttled async calls are retried by the
+    scheduler; blocking calls rely on the retries of the LLM predictor.
+
+    Args:
+        max_in_flight (Optional[int]): Maximum number of concurrent LLM calls.
+            No limit if None. Defaults to 16.
+        requests_per_minute (Optional[float]): Maximum number of LLM calls
+            per minute. No limit if None.
+        tokens_per_minute (Optional[float]): Maximum number of tokens (prompt
+            and response) per minute. No limit if None.
+        max_retries (int): Maximum number of tries for a throttled async call,
+            including the first. Defaults to 10.
+        errors_to_retry (Optional[List[ErrorToRetry]]): Errors to retry.
+            Defaults to OpenAI rate limit and availability errors.
+
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = DEFAULT_MAX_IN_FLIGHT,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        errors_to_retry: Optional[List[ErrorToRetry]] = None,
+    ) -> None:
+        """Init params."""
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise ValueError("max_in_flight must be > 0")
+        if max_retries <= 0:
+            raise ValueError("max_retries must be > 0")
+        self._max_in_flight = max_in_flight
+        self._request_limiter = (
+            RateLimiter(requests_per_minute) if requests_per_minute else None
+        )
+        self._token_limiter = (
+            RateLimiter(tokens_per_minute) if tokens_per_minute else None
+        )
+        self._max_retries = max_retries
+        self._errors_to_retry = (
+            errors_to_retry if errors_to_retry is not None else DEFAULT_ERRORS_TO_RETRY
+        )
+        self._backoff = AdaptiveBackoff()
+        # NOTE: semaphores are bound to an event loop, keep one per loop
+        self._semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # bounds blocking calls made from several threads
+        self._thread_semaphore = (
+            threading.BoundedSemaphore(max_in_flight)
+            if max_in_flight is not None
+            else None
+        )
+
+    def _get_semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Get the semaphore of the running event loop."""
+        if self._max_in_flight is None:
+            return None
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self._max_in_flight)
+        return self._semaphores[loop]
+
+    def _is_retryable_error(self, error: Exception) -> bool:
+        """Check whether an LLM call should be retried after an error."""
+        for error_to_retry in self._errors_to_retry:
+            if isinstance(error, error_to_retry.exception_cls):
+                check_fn = error_to_retry.check_fn
+                return check_fn is None or check_fn(error)
+        return False
+
+    def _get_num_prompt_tokens(self, prompt: Prompt, **prompt_args: Any) -> int:
+        """Get the number of prompt tokens, if limiting tokens per minute."""
+        if self._token_limiter is None:
+            return 0
+        return len(globals_helper.tokenizer(prompt.format(**prompt_args)))
+
+    def _reserve_rate_limits(self, num_tokens: int) -> float:
+        """Reserve a call within the rate limits, return the seconds to wait."""
+        wait_secs = 0.0
+        if self._request_limiter is not None:
+            wait_secs = max(wait_secs, self._request_limiter.reserve(1))
+        if self._token_limiter is not None:
+            wait_secs = max(wait_secs, self._token_limiter.reserve(num_tokens))
+        return wait_secs
+
+    def _should_retry(self, error: Exception, tries: int) -> bool:
+        """Check whether to retry a failed call, and back off if so."""
+        if not self._is_retryable_error(error) or tries >= self._max_retries:
+            return False
+        self._backoff.on_throttle()
+        logger.warning(
+            "LLM request failed (%s), backing off %.1fs",
+            type(error).__name__,
+            self._backoff.backoff_secs,
+        )
+        return True
+
+    def _on_success(self, response: str) -> None:
+        """Register a successful call."""
+        self._backoff.on_success()
+        if self._token_limiter is not None:
+            # the response tokens are paid back by later calls
+            self._token_limiter.reserve(len(globals_helper.tokenizer(response)))
+
+    async def _apredict(
+        self, llm_predictor: BaseLLMPredictor, prompt: Prompt, **prompt_args: Any
+    ) -> Tuple[str, str]:
+        """Make an LLM call, retrying with backoff if throttled."""
+        num_prompt_tokens = self._get_num_prompt_tokens(prompt, **prompt_args)
+        tries = 0
+        while True:
+            wait_secs = self._reserve_rate_limits(num_prompt_tokens)
+            await asyncio.sleep(max(wait_secs, self._backoff.get_wait_secs()))
+            try:
+                response, formatted_prompt = await llm_predictor.apredict(
+                    prompt, **prompt_args
+                )
+            except Exception as e:
+                tries += 1
+                if not self._should_retry(e, tries):
+                    raise
+                continue
+            self._on_success(response)
+            return response, formatted_prompt
+
+    async def apredict(
+        self, llm_predictor: BaseLLMPredictor, prompt: Prompt, **prompt_args: Any
+    ) -> Tuple[str, str]:
+        """Schedule an async LLM call.
+
+        Args:
+            llm_predictor (BaseLLMPredictor): LLM predictor to make the call with.
+            prompt (Prompt): Prompt to use for prediction.
+
+        Returns:
+            Tuple[str, str]: Tuple of the predicted answer and the formatted prompt.
+
+        """
+        semaphore = self._get_semaphore()
+        if semaphore is None:
+            return await self._apredict(llm_predictor, prompt, **prompt_args)
+        async with semaphore:
+            return await self._apredict(llm_predictor, prompt, **prompt_args)
+
+    def _predict(
+        self, llm_predictor: BaseLLMPredictor, prompt: Prompt, **prompt_args: Any
+    ) -> Tuple[str, str]:
+        """Make a blocking LLM call within the rate limits.
+
+        Blocking calls are not retried here, since `LLMPredictor.predict`
+        already retries throttled calls. A call that is still throttled slows
+        down the other scheduled calls through the shared backoff.
+
+        """
+        num_prompt_tokens = self._get_num_prompt_tokens(prompt, **prompt_args)
+        wait_secs = self._reserve_rate_limits(num_prompt_tokens)
+        wait_secs = max(wait_secs, self._backoff.get_wait_secs())
+        if wait_secs > 0:
+            time.sleep(wait_secs)
+        try:
+            response, formatted_prompt = llm_predictor.predict(prompt, **prompt_args)
+        except Exception as e:
+            if self._is_retryable_error(e):
+                self._backoff.on_throttle()
+            raise
+        self._on_success(response)
+        return response, formatted_prompt
+
+    def predict(
+        self, llm_predictor: BaseLLMPredictor, prompt: Prompt, **prompt_args: Any
+    ) -> Tuple[str, str]:
+        """Schedule a blocking LLM call.
+
+        Blocking calls share the rate limits and backoff of async calls, and
+        calls from several threads are bounded by `max_in_flight`.
+
+        Args:
+            llm_predictor (BaseLLMPredictor): LLM predictor to make the call with.
+            prompt (Prompt): Prompt to use for prediction.
+
+        Returns:
+            Tuple[str, str]: Tuple of the predicted answer and the formatted prompt.
+
+        """
+        if self._thread_semaphore is None:
+            return self._predict(llm_predictor, prompt, **prompt_args)
+        with self._thread_semaphore:
+            return self._predict(llm_predictor, prompt, **prompt_args)
@@ -1,4 +1,5 @@
 """Simple node parser."""
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Sequence
 
 from gpt_index.data_structs.node_v2 import Node
@@ -6,6 +7,34 @@ from gpt_index.langchain_helpers.text_splitter import TextSplitter, TokenTextSpl
 from gpt_index.node_parser.node_utils import get_nodes_from_document
 from gpt_index.readers.schema.base import Document
 from gpt_index.node_parser.interface import NodeParser
+from gpt_index.utils import globals_helper
+
+# NOTE: per-process state of parser workers, set by _init_worker
+_worker_text_splitter: Optional[TextSplitter] = None
+_worker_include_prev_next_rel: bool = True
+
+
+def _init_worker(text_splitter: TextSplitter, include_prev_next_rel: bool) -> None:
+    """Initialize a parser worker process."""
+    global _worker_text_splitter, _worker_include_prev_next_rel
+    _worker_text_splitter = text_splitter
+    _worker_include_prev_next_rel = include_prev_next_rel
+    # load the tokenizer once per worker, not once per document
+    globals_helper.tokenizer
+
+
+def _get_nodes_from_document_in_worker(
+    document: Document, include_extra_info: bool
+) -> List[Node]:
+    """Parse a document into nodes in a parser worker process."""
+    if _worker_text_splitter is None:
+        raise ValueError("Parser worker is not initialized.")
+    return get_nodes_from_document(
+        document,
+        _worker_text_splitter,
+        include_extra_info,
+        include_prev_next_rel=_worker_include_prev_next_rel,
+    )
 
 
 class SimpleNodeParser(NodeParser):
@@ -17,6 +46,8 @@ class SimpleNodeParser(NodeParser):
         text_splitter (Optional[TextSplitter]): text splitter
         include_extra_info (bool): whether to include extra info in nodes
         include_prev_next_rel (bool): whether to include prev/next relationships
+        num_workers (Optional[int]): number of worker processes used to parse
+            documents. Defaults to None (parse in the current process).
 
     """
 
@@ -25,11 +56,15 @@ class SimpleNodeParser(NodeParser):
         text_splitter: Optional[TextSplitter] = None,
         include_extra_info: bool = True,
         include_prev_next_rel: bool = True,
+        num_workers: Optional[int] = None,
     ) -> None:
         """Init params."""
         self._text_splitter = text_splitter or TokenTextSplitter()
         self._include_extra_info = include_extra_info
         self._include_prev_next_rel = include_prev_next_rel
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
+        self._num_workers = num_workers
 
     def get_nodes_from_documents(
         self,
@@ -43,6 +78,15 @@ class SimpleNodeParser(NodeParser):
             include_extra_info (bool): whether to include extra info in nodes
 
         """
+        if (
+            self._num_workers is not None
+            and self._num_workers > 1
+            and len(documents) > 1
+        ):
+            return self._get_nodes_from_documents_parallel(
+                documents, include_extra_info
+            )
+
         all_nodes: List[Node] = []
         for document in documents:
             nodes = get_nodes_from_document(
@@ -53,3 +97,32 @@ class SimpleNodeParser(NodeParser):
             )
             all_nodes.extend(nodes)
         return all_nodes
+
+    def _get_nodes_from_documents_parallel(
+        self,
+        documents: Sequence[Document],
+        include_extra_info: bool,
+    ) -> List[Node]:
+        """Parse documents into nodes over a pool of worker processes.
+
+        Documents are sharded over the workers, and nodes are collected in
+        document order. Each document is parsed by a single worker, so
+        prev/next relationships within a document are preserved.
+
+        """
+        num_workers = min(len(documents), self._num_workers or 1)
+        chunksize = max(1, len(documents) // (num_workers * 4))
+        all_nodes: List[Node] = []
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(self._text_splitter, self._include_prev_next_rel),
+        ) as executor:
+            for nodes in executor.map(
+                _get_nodes_from_document_in_worker,
+                documents,
+                [include_extra_info] * len(documents),
+                chunksize=chunksize,
+            ):
+                all_nodes.extend(nodes)
+        return all_nodes
@@ -74,7 +74,7 @@ class SentenceEmbeddingOptimizer(BaseTokenUsageOptimizer):
             query_bundle.embedding = self.embed_model.get_agg_embedding_from_queries(
                 query_bundle.embedding_strs
             )
-        text_embeddings = self.embed_model._get_text_embeddings(split_text)
+        text_embeddings = self.embed_model._get_text_embeddings_with_backoff(split_text)
         num_top_k = None
         threshold = None
         if self._percentile_cutoff is not None:
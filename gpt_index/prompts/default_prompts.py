@@ -52,6 +52,25 @@ DEFAULT_INSERT_PROMPT_TMPL = (
 )
 DEFAULT_INSERT_PROMPT = TreeInsertPrompt(DEFAULT_INSERT_PROMPT_TMPL)
 
+# insert multiple new chunks at once
+DEFAULT_INSERT_BATCH_PROMPT_TMPL = (
+    "Context information is below. It is provided in a numbered list "
+    "(1 to {num_chunks}),"
+    "where each item in the list corresponds to a summary.\n"
+    "---------------------\n"
+    "{context_list}"
+    "---------------------\n"
+    "Given the context information, here are new pieces of information, "
+    "also provided in a numbered list:\n"
+    "{new_chunk_text}\n"
+    "For each new piece of information, in order, answer with the number "
+    "corresponding to the summary that should be updated, i.e. the summary "
+    "that is most relevant to it. "
+    "Provide the numbers in the following format: "
+    "'ANSWER: <number>, <number>, ...'\n"
+)
+DEFAULT_INSERT_BATCH_PROMPT = TreeInsertPrompt(DEFAULT_INSERT_BATCH_PROMPT_TMPL)
+
 
 # # single choice
 DEFAULT_QUERY_PROMPT_TMPL = (
@@ -27,7 +27,9 @@ class ChatGPTRetrievalPluginReader(BaseReader):
         self._batch_size = batch_size
 
         self._s = requests.Session()
-        self._s.mount("http://", HTTPAdapter(max_retries=self._retries))
+        adapter = HTTPAdapter(max_retries=self._retries)
+        self._s.mount("http://", adapter)
+        self._s.mount("https://", adapter)
 
     def load_data(
         self,
@@ -39,7 +41,7 @@ class ChatGPTRetrievalPluginReader(BaseReader):
         """Load data from ChatGPT Retrieval Plugin."""
         headers = {"Authorization": f"Bearer {self._bearer_token}"}
         queries = [{"query": query, "top_k": top_k}]
-        res = requests.post(
+        res = self._s.post(
             f"{self._endpoint_url}/query", headers=headers, json={"queries": queries}
         )
         documents: List[Document] = []
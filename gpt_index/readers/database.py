@@ -1,14 +1,21 @@
 """Database Reader."""
 
-from typing import Any, List, Optional
+from typing import Any, Generator, List, Optional, Sequence
 
-from sqlalchemy import text
+from sqlalchemy import select, text
 from sqlalchemy.engine import Engine
 
 from gpt_index.langchain_helpers.sql_wrapper import SQLDatabase
 from gpt_index.readers.base import BaseReader
 from gpt_index.readers.schema.base import Document
 
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _get_row_text(row: Sequence[Any]) -> str:
+    """Get the text of a row."""
+    return ", ".join([str(entry) for entry in row])
+
 
 class DatabaseReader(BaseReader):
     """Simple Database reader.
@@ -92,6 +99,75 @@ class DatabaseReader(BaseReader):
 
             for item in result.fetchall():
                 # fetch each item
-                doc_str = ", ".join([str(entry) for entry in item])
-                documents.append(Document(doc_str))
+                documents.append(Document(_get_row_text(item)))
         return documents
+
+    def lazy_load_data(
+        self, query: str, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Generator[Document, None, None]:
+        """Query and lazily load data from the Database, one Document per row.
+
+        Rows are streamed with a server-side cursor (where the database
+        driver supports it) and fetched `batch_size` rows at a time, so that
+        the whole result set is never held in memory.
+
+        Args:
+            query (str): Query parameter to filter tables and rows.
+            batch_size (int): Number of rows fetched at a time.
+
+        Returns:
+            Generator[Document, None, None]: A generator of Document objects.
+        """
+        if query is None:
+            raise ValueError("A query parameter is necessary to filter the data")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        with self.sql_database.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, max_row_buffer=batch_size
+            ).execute(text(query))
+            for rows in result.partitions(batch_size):
+                for row in rows:
+                    yield Document(_get_row_text(row))
+
+    def lazy_load_table(
+        self,
+        table_name: str,
+        key_column: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        start_after: Optional[Any] = None,
+    ) -> Generator[Document, None, None]:
+        """Lazily load a table with keyset pagination, one Document per row.
+
+        Rows are loaded in order of `key_column` (which must be unique), in
+        pages of `batch_size` rows, each with its own short query. The key
+        of each row is kept in the `extra_info` of its Document, so that an
+        interrupted load can be resumed by passing the key of the last
+        processed Document as `start_after`.
+
+        Args:
+            table_name (str): Name of the table to load.
+            key_column (str): Unique, sortable column to paginate on.
+            batch_size (int): Number of rows per page.
+            start_after (Optional[Any]): Only load rows with a key greater
+                than this one. Loads the whole table if None.
+
+        Returns:
+            Generator[Document, None, None]: A generator of Document objects.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        table = self.sql_database.metadata_obj.tables[table_name]
+        key = table.c[key_column]
+        last_key = start_after
+        while True:
+            stmt = select(table).order_by(key).limit(batch_size)
+            if last_key is not None:
+                stmt = stmt.where(key > last_key)
+            with self.sql_database.engine.connect() as connection:
+                rows = connection.execute(stmt).fetchall()
+            for row in rows:
+                last_key = row._mapping[key_column]
+                yield Document(_get_row_text(row), extra_info={key_column: last_key})
+            if len(rows) < batch_size:
+                break
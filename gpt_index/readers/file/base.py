@@ -1,8 +1,24 @@
 """Simple reader that reads files of different formats from a directory."""
+import hashlib
+import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, Generator, List, Optional, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from gpt_index.readers.base import BaseReader
 from gpt_index.readers.file.base_parser import BaseParser, ImageParserOutput
@@ -33,6 +49,63 @@ DEFAULT_FILE_EXTRACTOR: Dict[str, BaseParser] = {
 
 logger = logging.getLogger(__name__)
 
+FileData = Union[str, List[str], ImageParserOutput]
+
+# NOTE: per-process state of file loading workers, set by _init_worker
+_worker_file_extractor: Dict[str, BaseParser] = {}
+_worker_errors: str = "ignore"
+
+
+def _load_file(
+    input_file: Path, file_extractor: Dict[str, BaseParser], errors: str
+) -> FileData:
+    """Load the data of a file, with the parser of its extension if any."""
+    if input_file.suffix in file_extractor:
+        parser = file_extractor[input_file.suffix]
+        if not parser.parser_config_set:
+            parser.init_parser()
+        return parser.parse_file(input_file, errors=errors)
+    else:
+        # do standard read
+        with open(input_file, "r", errors=errors, encoding="utf8") as f:
+            return f.read()
+
+
+def _init_worker(file_extractor: Dict[str, BaseParser], errors: str) -> None:
+    """Initialize a file loading worker process."""
+    global _worker_file_extractor, _worker_errors
+    _worker_file_extractor = file_extractor
+    _worker_errors = errors
+
+
+def _load_file_in_worker(input_file: Path) -> FileData:
+    """Load the data of a file in a file loading worker process."""
+    return _load_file(input_file, _worker_file_extractor, _worker_errors)
+
+
+def _get_file_hash(input_file: Path) -> str:
+    """Get the hash of the content of a file."""
+    file_hash = hashlib.sha256()
+    with open(input_file, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+@dataclass
+class IncrementalLoadResult:
+    """Result of an incremental load of a directory.
+
+    Args:
+        documents (List[Document]): Documents of the new or modified files.
+        deleted_doc_ids (List[str]): Ids of the documents previously loaded
+            from the modified or removed files.
+
+    """
+
+    documents: List[Document]
+    deleted_doc_ids: List[str]
+
 
 class SimpleDirectoryReader(BaseReader):
     """Simple directory reader.
@@ -60,6 +133,8 @@ class SimpleDirectoryReader(BaseReader):
         file_metadata (Optional[Callable[str, Dict]]): A function that takes
             in a filename and returns a Dict of metadata for the Document.
             Default is None.
+        num_workers (Optional[int]): Number of worker processes used to parse
+            files. Defaults to None (parse in the current process).
     """
 
     def __init__(
@@ -74,12 +149,15 @@ class SimpleDirectoryReader(BaseReader):
         file_extractor: Optional[Dict[str, BaseParser]] = None,
         num_files_limit: Optional[int] = None,
         file_metadata: Optional[Callable[[str], Dict]] = None,
+        num_workers: Optional[int] = None,
     ) -> None:
         """Initialize with parameters."""
         super().__init__()
 
         if not input_dir and not input_files:
             raise ValueError("Must provide either `input_dir` or `input_files`.")
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
 
         self.errors = errors
 
@@ -101,6 +179,7 @@ class SimpleDirectoryReader(BaseReader):
 
         self.file_extractor = file_extractor or DEFAULT_FILE_EXTRACTOR
         self.file_metadata = file_metadata
+        self.num_workers = num_workers
 
     def _add_files(self, input_dir: Path) -> List[Path]:
         """Add files."""
@@ -156,6 +235,42 @@ class SimpleDirectoryReader(BaseReader):
 
         return new_input_files
 
+    def _iter_file_data(
+        self, input_files: Sequence[Path]
+    ) -> Iterator[Tuple[Path, FileData]]:
+        """Iterate over the data of files, in order, as they are parsed."""
+        if self.num_workers is None or self.num_workers == 1 or len(input_files) <= 1:
+            for input_file in input_files:
+                yield input_file, _load_file(
+                    input_file, self.file_extractor, self.errors
+                )
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(len(input_files), self.num_workers),
+            initializer=_init_worker,
+            initargs=(self.file_extractor, self.errors),
+        ) as executor:
+            yield from zip(input_files, executor.map(_load_file_in_worker, input_files))
+
+    def _get_file_documents(self, input_file: Path, data: FileData) -> List[Document]:
+        """Get the documents of a file from its data."""
+        metadata: Optional[dict] = None
+        if self.file_metadata is not None:
+            metadata = self.file_metadata(str(input_file))
+
+        if isinstance(data, ImageParserOutput):
+            # process image
+            return [
+                ImageDocument(text=data.text, extra_info=metadata, image=data.image)
+            ]
+        elif isinstance(data, List):
+            # process list of str
+            return [Document(d, extra_info=deepcopy(metadata)) for d in data]
+        else:
+            # process single str
+            return [Document(str(data), extra_info=metadata)]
+
     def load_data(self, concatenate: bool = False) -> List[Document]:
         """Load data from the input directory.
 
@@ -168,50 +283,100 @@ class SimpleDirectoryReader(BaseReader):
             List[Document]: A list of documents.
 
         """
-        # TODO: refactor parser output interface
-        data: Union[str, List[str], ImageParserOutput] = ""
-        data_list: List[str] = []
-        metadata_list: List[Optional[dict]] = []
-        image_docs: List[ImageDocument] = []
+        text_docs: List[Document] = []
+        image_docs: List[Document] = []
+        for input_file, data in self._iter_file_data(self.input_files):
+            for doc in self._get_file_documents(input_file, data):
+                if isinstance(doc, ImageDocument):
+                    image_docs.append(doc)
+                else:
+                    text_docs.append(doc)
+
+        if concatenate:
+            text_docs = [Document("\n".join(doc.get_text() for doc in text_docs))]
+
+        return text_docs + image_docs
+
+    def lazy_load_data(self) -> Generator[Document, None, None]:
+        """Load data from the input directory lazily.
+
+        Documents are yielded file by file, as the files are parsed.
+        Unlike `load_data`, image docs are yielded in file order.
+
+        Returns:
+            Generator[Document, None, None]: A generator of documents.
+
+        """
+        for input_file, data in self._iter_file_data(self.input_files):
+            yield from self._get_file_documents(input_file, data)
+
+    def load_incremental_data(self, manifest_path: str) -> IncrementalLoadResult:
+        """Load data from the files that changed since the last load.
+
+        The manifest at `manifest_path` records the path, mtime, size and
+        content hash of each loaded file, and the ids of its documents.
+        Files whose mtime and size are unchanged are skipped without being
+        read, and files whose content hash is unchanged are not parsed.
+        The manifest is created if it does not exist, and updated in place.
+
+        Args:
+            manifest_path (str): Path to the JSON manifest.
+
+        Returns:
+            IncrementalLoadResult: Documents of the new or modified files, and
+                ids of the documents of the modified or removed files.
+
+        """
+        manifest: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+
+        new_manifest: Dict[str, Dict[str, Any]] = {}
+        changed_files: List[Path] = []
+        changed_paths = set()
         for input_file in self.input_files:
-            if input_file.suffix in self.file_extractor:
-                parser = self.file_extractor[input_file.suffix]
-                if not parser.parser_config_set:
-                    parser.init_parser()
-                data = parser.parse_file(input_file, errors=self.errors)
-            else:
-                # do standard read
-                with open(input_file, "r", errors=self.errors, encoding="utf8") as f:
-                    data = f.read()
-
-            metadata: Optional[dict] = None
-            if self.file_metadata is not None:
-                metadata = self.file_metadata(str(input_file))
-
-            if isinstance(data, ImageParserOutput):
-                # process image
-                image_docs.append(
-                    ImageDocument(text=data.text, extra_info=metadata, image=data.image)
-                )
-            elif isinstance(data, List):
-                # process list of str
-                data_list.extend(data)
-                repeated_metadata: List[Optional[dict]] = [
-                    deepcopy(metadata) for _ in range(len(data))
-                ]
-                metadata_list.extend(repeated_metadata)
+            stat = input_file.stat()
+            file_info: Dict[str, Any] = {"mtime": stat.st_mtime, "size": stat.st_size}
+            prev_file_info = manifest.get(str(input_file))
+            if prev_file_info is not None and all(
+                prev_file_info[key] == value for key, value in file_info.items()
+            ):
+                new_manifest[str(input_file)] = prev_file_info
+                continue
+            file_info["hash"] = _get_file_hash(input_file)
+            if (
+                prev_file_info is not None
+                and prev_file_info["hash"] == file_info["hash"]
+            ):
+                # touched but not modified
+                file_info["doc_ids"] = prev_file_info["doc_ids"]
             else:
-                # process single str
-                data_list.append(str(data))
-                metadata_list.append(metadata)
+                changed_files.append(input_file)
+                changed_paths.add(str(input_file))
+            new_manifest[str(input_file)] = file_info
 
-        if concatenate:
-            text_docs = [Document("\n".join(data_list))]
-        elif self.file_metadata is not None:
-            text_docs = [
-                Document(d, extra_info=m) for d, m in zip(data_list, metadata_list)
+        documents: List[Document] = []
+        for input_file, data in self._iter_file_data(changed_files):
+            file_documents = self._get_file_documents(input_file, data)
+            new_manifest[str(input_file)]["doc_ids"] = [
+                doc.get_doc_id() for doc in file_documents
             ]
-        else:
-            text_docs = [Document(d) for d in data_list]
+            documents.extend(file_documents)
+
+        deleted_doc_ids = [
+            doc_id
+            for path, file_info in manifest.items()
+            if path not in new_manifest or path in changed_paths
+            for doc_id in file_info["doc_ids"]
+        ]
 
-        return text_docs + cast(List[Document], image_docs)
+        with open(manifest_path, "w") as f:
+            json.dump(new_manifest, f)
+        logger.debug(
+            f"> [SimpleDirectoryReader] Changed files: {len(changed_files)}, "
+            f"deleted documents: {len(deleted_doc_ids)}"
+        )
+        return IncrementalLoadResult(
+            documents=documents, deleted_doc_ids=deleted_doc_ids
+        )
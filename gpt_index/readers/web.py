@@ -1,35 +1,157 @@
 """Web scraper."""
 import logging
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from gpt_index.constants import DEFAULT_POOL_SIZE
 from gpt_index.readers.base import BaseReader
 from gpt_index.readers.schema.base import Document
 
 logger = logging.getLogger(__name__)
 
+# maximum number of concurrent requests to the same host
+DEFAULT_MAX_REQUESTS_PER_HOST = 4
+
+T = TypeVar("T")
+S = TypeVar("S")
+
+
+def _fetch_all(
+    fetch_fn: Callable[[str], T],
+    urls: Sequence[str],
+    num_workers: Optional[int],
+    max_requests_per_host: int,
+) -> List[T]:
+    """Fetch urls in a thread pool, limiting concurrent requests per host.
+
+    Fetches sequentially if `num_workers` is None or 1. Results are in
+    the order of `urls`.
+
+    """
+    if num_workers is None or num_workers == 1 or len(urls) <= 1:
+        return [fetch_fn(url) for url in urls]
+
+    host_semaphores: Dict[str, threading.Semaphore] = defaultdict(
+        lambda: threading.Semaphore(max_requests_per_host)
+    )
+    lock = threading.Lock()
+
+    def _fetch(url: str) -> T:
+        with lock:
+            semaphore = host_semaphores[urlparse(url).netloc]
+        with semaphore:
+            return fetch_fn(url)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(_fetch, urls))
+
+
+def _convert_all(
+    convert_fn: Callable[[S], T], inputs: Sequence[S], num_workers: Optional[int]
+) -> List[T]:
+    """Convert fetched pages in a process pool.
+
+    `convert_fn` must be picklable (e.g. a module-level function).
+    `num_workers` is sized for fetching, so the pool is capped at the
+    number of CPUs. Converts in the current process if that leaves a
+    single worker.
+
+    """
+    num_processes = min(len(inputs), num_workers or 1, os.cpu_count() or 1)
+    if num_processes <= 1:
+        return [convert_fn(input) for input in inputs]
+    chunksize = max(1, len(inputs) // (num_processes * 4))
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        return list(executor.map(convert_fn, inputs, chunksize=chunksize))
+
+
+@dataclass
+class _CachedPage:
+    """Page cached for conditional GET requests."""
+
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
 
 class SimpleWebPageReader(BaseReader):
     """Simple web page reader.
 
     Reads pages from the web.
 
+    Pages are fetched over pooled keep-alive connections. Pages served
+    with an ETag or Last-Modified header are cached by the reader, and
+    later loads of the same url send a conditional GET: unchanged pages
+    are neither downloaded nor converted again.
+
     Args:
         html_to_text (bool): Whether to convert HTML to text.
             Requires `html2text` package.
+        num_workers (Optional[int]): Number of threads fetching pages (and of
+            processes converting HTML to text, capped at the number of CPUs).
+            Fetches sequentially if None.
+        max_requests_per_host (int): Maximum number of concurrent requests
+            to the same host. Defaults to 4.
+        timeout (Optional[float]): Timeout in seconds of each request.
 
     """
 
-    def __init__(self, html_to_text: bool = False) -> None:
+    def __init__(
+        self,
+        html_to_text: bool = False,
+        num_workers: Optional[int] = None,
+        max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST,
+        timeout: Optional[float] = None,
+    ) -> None:
         """Initialize with parameters."""
-        try:
-            import html2text  # noqa: F401
-        except ImportError:
-            raise ImportError(
-                "`html2text` package not found, please run `pip install html2text`"
-            )
+        if html_to_text:
+            try:
+                import html2text  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "`html2text` package not found, please run `pip install html2text`"
+                )
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
+        if max_requests_per_host <= 0:
+            raise ValueError("max_requests_per_host must be > 0")
         self._html_to_text = html_to_text
+        self._num_workers = num_workers
+        self._max_requests_per_host = max_requests_per_host
+        self._timeout = timeout
+        self._cache: Dict[str, _CachedPage] = {}
+
+        adapter = HTTPAdapter(pool_maxsize=max(DEFAULT_POOL_SIZE, num_workers or 1))
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _fetch(self, url: str) -> Tuple[Optional[requests.Response], str]:
+        """Fetch a page.
+
+        Returns the response and its text, or None and the cached text if
+        the page is unchanged.
+
+        """
+        headers = {}
+        cached_page = self._cache.get(url)
+        if cached_page is not None:
+            if cached_page.etag is not None:
+                headers["If-None-Match"] = cached_page.etag
+            if cached_page.last_modified is not None:
+                headers["If-Modified-Since"] = cached_page.last_modified
+        response = self._session.get(url, headers=headers, timeout=self._timeout)
+        if cached_page is not None and response.status_code == 304:
+            return None, cached_page.text
+        return response, response.text
 
     def load_data(self, urls: List[str]) -> List[Document]:
         """Load data from the input directory.
@@ -43,17 +165,33 @@ class SimpleWebPageReader(BaseReader):
         """
         if not isinstance(urls, list):
             raise ValueError("urls must be a list of strings.")
-        documents = []
-        for url in urls:
-            response = requests.get(url, headers=None).text
-            if self._html_to_text:
-                import html2text
-
-                response = html2text.html2text(response)
-
-            documents.append(Document(response))
+        fetched = _fetch_all(
+            self._fetch, urls, self._num_workers, self._max_requests_per_host
+        )
+
+        texts = [text for _, text in fetched]
+        if self._html_to_text:
+            import html2text
+
+            # only convert pages that were downloaded
+            changed_idxs = [i for i, (res, _) in enumerate(fetched) if res is not None]
+            converted_texts = _convert_all(
+                html2text.html2text,
+                [texts[i] for i in changed_idxs],
+                self._num_workers,
+            )
+            for i, converted_text in zip(changed_idxs, converted_texts):
+                texts[i] = converted_text
 
-        return documents
+        # cache the converted text, so unchanged pages are not converted again
+        for url, (response, _), text in zip(urls, fetched, texts):
+            if response is None:
+                continue
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag is not None or last_modified is not None:
+                self._cache[url] = _CachedPage(text, etag, last_modified)
+        return [Document(text) for text in texts]
 
 
 class TrafilaturaWebReader(BaseReader):
@@ -62,13 +200,26 @@ class TrafilaturaWebReader(BaseReader):
     Reads pages from the web.
     Requires the `trafilatura` package.
 
+    Unlike SimpleWebPageReader, pages are fetched by trafilatura, so
+    request timeouts follow trafilatura's own `DOWNLOAD_TIMEOUT` setting.
+
     """
 
-    def __init__(self, error_on_missing: bool = False) -> None:
+    def __init__(
+        self,
+        error_on_missing: bool = False,
+        num_workers: Optional[int] = None,
+        max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST,
+    ) -> None:
         """Initialize with parameters.
 
         Args:
             error_on_missing (bool): Throw an error when data cannot be parsed
+            num_workers (Optional[int]): Number of threads fetching pages (and
+                of processes extracting text, capped at the number of CPUs).
+                Fetches sequentially if None.
+            max_requests_per_host (int): Maximum number of concurrent requests
+                to the same host. Defaults to 4.
         """
         self.error_on_missing = error_on_missing
         try:
@@ -77,6 +228,12 @@ class TrafilaturaWebReader(BaseReader):
             raise ImportError(
                 "`trafilatura` package not found, please run `pip install trafilatura`"
             )
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
+        if max_requests_per_host <= 0:
+            raise ValueError("max_requests_per_host must be > 0")
+        self._num_workers = num_workers
+        self._max_requests_per_host = max_requests_per_host
 
     def load_data(self, urls: List[str]) -> List[Document]:
         """Load data from the urls.
@@ -92,14 +249,24 @@ class TrafilaturaWebReader(BaseReader):
 
         if not isinstance(urls, list):
             raise ValueError("urls must be a list of strings.")
-        documents = []
-        for url in urls:
-            downloaded = trafilatura.fetch_url(url)
+        downloaded_pages = _fetch_all(
+            trafilatura.fetch_url, urls, self._num_workers, self._max_requests_per_host
+        )
+        downloaded_urls = []
+        for url, downloaded in zip(urls, downloaded_pages):
             if not downloaded:
                 if self.error_on_missing:
                     raise ValueError(f"Trafilatura fails to get string from url: {url}")
                 continue
-            response = trafilatura.extract(downloaded)
+            downloaded_urls.append(url)
+
+        responses = _convert_all(
+            trafilatura.extract,
+            [downloaded for downloaded in downloaded_pages if downloaded],
+            self._num_workers,
+        )
+        documents = []
+        for url, response in zip(downloaded_urls, responses):
             if not response:
                 if self.error_on_missing:
                     raise ValueError(f"Trafilatura fails to parse page: {url}")
@@ -203,14 +370,31 @@ class RssReader(BaseReader):
 
     Reads content from an RSS feed.
 
+    Feeds served with an ETag or Last-Modified header are cached by the
+    reader, and later loads of the same url send a conditional GET:
+    unchanged feeds are neither downloaded nor converted again.
+
+    Feeds are fetched by `feedparser`, which takes no request timeout;
+    use `socket.setdefaulttimeout` to bound slow feeds.
+
     """
 
-    def __init__(self, html_to_text: bool = False) -> None:
+    def __init__(
+        self,
+        html_to_text: bool = False,
+        num_workers: Optional[int] = None,
+        max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST,
+    ) -> None:
         """Initialize with parameters.
 
         Args:
             html_to_text (bool): Whether to convert HTML to text.
                 Requires `html2text` package.
+            num_workers (Optional[int]): Number of threads fetching feeds (and
+                of processes converting HTML to text, capped at the number of
+                CPUs). Fetches sequentially if None.
+            max_requests_per_host (int): Maximum number of concurrent requests
+                to the same host. Defaults to 4.
 
         """
         try:
@@ -227,7 +411,24 @@ class RssReader(BaseReader):
                 raise ImportError(
                     "`html2text` package not found, please run `pip install html2text`"
                 )
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
+        if max_requests_per_host <= 0:
+            raise ValueError("max_requests_per_host must be > 0")
         self._html_to_text = html_to_text
+        self._num_workers = num_workers
+        self._max_requests_per_host = max_requests_per_host
+        # url -> (etag, modified, documents)
+        self._cache: Dict[str, Tuple[Optional[str], Optional[str], List[Document]]] = {}
+
+    def _fetch(self, url: str) -> Any:
+        """Fetch a feed, conditionally on the cached version."""
+        import feedparser
+
+        etag, modified = None, None
+        if url in self._cache:
+            etag, modified, _ = self._cache[url]
+        return feedparser.parse(url, etag=etag, modified=modified)
 
     def load_data(self, urls: List[str]) -> List[Document]:
         """Load data from RSS feeds.
@@ -239,30 +440,45 @@ class RssReader(BaseReader):
             List[Document]: List of documents.
 
         """
-        import feedparser
-
         if not isinstance(urls, list):
             raise ValueError("urls must be a list of strings.")
 
-        documents = []
+        parsed_feeds = _fetch_all(
+            self._fetch, urls, self._num_workers, self._max_requests_per_host
+        )
 
-        for url in urls:
-            parsed = feedparser.parse(url)
+        feed_documents: Dict[str, List[Document]] = {}
+        changed_feeds = []
+        for url, parsed in zip(urls, parsed_feeds):
+            if parsed.get("status") == 304 and url in self._cache:
+                feed_documents[url] = self._cache[url][2]
+            else:
+                changed_feeds.append((url, parsed))
+
+        all_data = []
+        for _, parsed in changed_feeds:
             for entry in parsed.entries:
                 if "content" in entry:
-                    data = entry.content[0].value
+                    all_data.append(entry.content[0].value)
                 else:
-                    data = entry.description or entry.summary
-
-                if self._html_to_text:
-                    import html2text
+                    all_data.append(entry.description or entry.summary)
+        if self._html_to_text:
+            import html2text
 
-                    data = html2text.html2text(data)
+            all_data = _convert_all(html2text.html2text, all_data, self._num_workers)
 
+        data_iter = iter(all_data)
+        for url, parsed in changed_feeds:
+            documents = []
+            for entry in parsed.entries:
                 extra_info = {"title": entry.title, "link": entry.link}
-                documents.append(Document(data, extra_info=extra_info))
+                documents.append(Document(next(data_iter), extra_info=extra_info))
+            feed_documents[url] = documents
+            etag, modified = parsed.get("etag"), parsed.get("modified")
+            if etag or modified:
+                self._cache[url] = (etag, modified, documents)
 
-        return documents
+        return [document for url in urls for document in feed_documents[url]]
 
 
 if __name__ == "__main__":
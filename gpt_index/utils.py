@@ -2,11 +2,14 @@
 
 import random
 import sys
+import threading
 import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import islice
 from typing import (
     Any,
@@ -14,6 +17,7 @@ from typing import (
     Generator,
     List,
     Optional,
+    Sequence,
     Set,
     Type,
     cast,
@@ -87,6 +91,35 @@ class GlobalsHelper:
 
 globals_helper = GlobalsHelper()
 
+# token counts of texts up to this many characters are memoized
+MAX_CACHED_TOKEN_COUNT_TEXT_LEN = 2000
+TOKEN_COUNT_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+def _count_tokens_cached(tokenizer: Callable[[str], List], text: str) -> int:
+    """Count tokens, memoized on (tokenizer, text)."""
+    return len(tokenizer(text))
+
+
+def count_tokens(text: str, tokenizer: Optional[Callable[[str], List]] = None) -> int:
+    """Count the number of tokens in text.
+
+    Counts of short texts (e.g. words, sentences and empty prompts) are memoized
+    in a bounded LRU cache shared across callers, so repeated pieces of text
+    are only tokenized once. Longer texts are not cached to bound memory use.
+
+    Args:
+        text (str): Text to count tokens for.
+        tokenizer (Optional[Callable[[str], List]]): Tokenizer to use.
+            Defaults to the global tokenizer.
+
+    """
+    tokenizer = tokenizer or globals_helper.tokenizer
+    if len(text) > MAX_CACHED_TOKEN_COUNT_TEXT_LEN:
+        return len(tokenizer(text))
+    return _count_tokens_cached(tokenizer, text)
+
 
 def get_new_id(d: Set) -> str:
     """Get a new ID."""
@@ -187,6 +220,65 @@ def retry_on_exceptions_with_backoff(
             backoff_secs = min(backoff_secs * 2, max_backoff_secs)
 
 
+class AdaptiveBackoff:
+    """Backoff shared across concurrent workers.
+
+    Each throttling error doubles the backoff delay (up to `max_backoff_secs`),
+    and all workers wait until the backoff window has passed before sending the
+    next request. Each success halves the delay, so the request rate recovers
+    once throttling stops.
+
+    Args:
+        min_backoff_secs (float): Backoff delay after the first throttling error.
+            Defaults to 0.5.
+        max_backoff_secs (float): Maximum backoff delay. Defaults to 60.
+
+    """
+
+    def __init__(
+        self, min_backoff_secs: float = 0.5, max_backoff_secs: float = 60.0
+    ) -> None:
+        """Init params."""
+        self._min_backoff_secs = min_backoff_secs
+        self._max_backoff_secs = max_backoff_secs
+        self._backoff_secs = 0.0
+        self._backoff_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def backoff_secs(self) -> float:
+        """Get the current backoff delay."""
+        return self._backoff_secs
+
+    def get_wait_secs(self) -> float:
+        """Get the time left until the backoff window has passed."""
+        return max(0.0, self._backoff_until - time.monotonic())
+
+    def wait(self) -> None:
+        """Block until the backoff window has passed."""
+        wait_secs = self.get_wait_secs()
+        if wait_secs > 0:
+            time.sleep(wait_secs)
+
+    def on_throttle(self) -> None:
+        """Register a throttling error."""
+        with self._lock:
+            self._backoff_secs = min(
+                max(self._backoff_secs * 2, self._min_backoff_secs),
+                self._max_backoff_secs,
+            )
+            self._backoff_until = max(
+                self._backoff_until, time.monotonic() + self._backoff_secs
+            )
+
+    def on_success(self) -> None:
+        """Register a successful request."""
+        with self._lock:
+            self._backoff_secs /= 2
+            if self._backoff_secs < self._min_backoff_secs:
+                self._backoff_secs = 0.0
+
+
 def truncate_text(text: str, max_length: int) -> str:
     """Truncate text to a maximum length."""
     return text[: max_length - 3] + "..."
@@ -204,3 +296,33 @@ def iter_batch(iterable: Union[Iterable, Generator], size: int) -> Iterable:
         if len(b) == 0:
             break
         yield b
+
+
+def run_batches(
+    fn: Callable[[Any], Any],
+    batches: Sequence[Any],
+    num_workers: Optional[int] = None,
+    progress_fn: Optional[Callable[[Iterable], Iterable]] = None,
+) -> None:
+    """Run a function on each batch, in a thread pool if there are many workers.
+
+    Batches are run sequentially if `num_workers` is None or 1. Errors raised
+    by `fn` are re-raised in the caller.
+
+    Args:
+        fn (Callable[[Any], Any]): Function to run on each batch.
+        batches (Sequence[Any]): Batches to run `fn` on.
+        num_workers (Optional[int]): Number of threads to use.
+        progress_fn (Optional[Callable[[Iterable], Iterable]]): Optional wrapper
+            around the results as they complete, e.g. a progress bar.
+
+    """
+    progress_fn = progress_fn or (lambda results: results)
+    if num_workers is None or num_workers == 1 or len(batches) <= 1:
+        for _ in progress_fn(map(fn, batches)):
+            pass
+        return
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # consume the results to surface errors raised in the workers
+        for _ in progress_fn(executor.map(fn, batches)):
+            pass
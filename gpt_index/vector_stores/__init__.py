@@ -11,10 +11,12 @@ from gpt_index.vector_stores.opensearch import (
 from gpt_index.vector_stores.pinecone import PineconeVectorStore
 from gpt_index.vector_stores.qdrant import QdrantVectorStore
 from gpt_index.vector_stores.simple import SimpleVectorStore
+from gpt_index.vector_stores.simple_ivf import SimpleIVFVectorStore
 from gpt_index.vector_stores.weaviate import WeaviateVectorStore
 
 __all__ = [
     "SimpleVectorStore",
+    "SimpleIVFVectorStore",
     "FaissVectorStore",
     "PineconeVectorStore",
     "WeaviateVectorStore",
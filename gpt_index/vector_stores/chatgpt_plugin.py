@@ -7,7 +7,9 @@ import requests
 from requests.adapters import HTTPAdapter, Retry
 from tqdm.auto import tqdm
 
+from gpt_index.constants import DEFAULT_POOL_SIZE
 from gpt_index.data_structs.node_v2 import Node, DocumentRelationship
+from gpt_index.utils import run_batches
 from gpt_index.vector_stores.types import (
     NodeEmbeddingResult,
     VectorStore,
@@ -60,6 +62,8 @@ class ChatGPTRetrievalPluginClient(VectorStore):
         bearer_token (Optional[str]): Bearer token for the ChatGPT Retrieval Plugin.
         retries (Optional[Retry]): Retry object for the ChatGPT Retrieval Plugin.
         batch_size (int): Batch size for the ChatGPT Retrieval Plugin.
+        num_workers (Optional[int]): Maximum number of batches uploaded
+            concurrently. Uploads sequentially if None.
     """
 
     stores_text: bool = True
@@ -71,16 +75,26 @@ class ChatGPTRetrievalPluginClient(VectorStore):
         bearer_token: Optional[str] = None,
         retries: Optional[Retry] = None,
         batch_size: int = 100,
+        num_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize params."""
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
         self._endpoint_url = endpoint_url
         self._bearer_token = bearer_token or os.getenv("BEARER_TOKEN")
         self._retries = retries
         self._batch_size = batch_size
+        self._num_workers = num_workers
 
+        # keep-alive connections are pooled, with one connection per worker
+        adapter = HTTPAdapter(
+            max_retries=self._retries,
+            pool_maxsize=max(DEFAULT_POOL_SIZE, num_workers or 1),
+        )
         self._s = requests.Session()
-        self._s.mount("http://", HTTPAdapter(max_retries=self._retries))
+        self._s.mount("http://", adapter)
+        self._s.mount("https://", adapter)
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> "VectorStore":
@@ -98,23 +112,35 @@ class ChatGPTRetrievalPluginClient(VectorStore):
             "endpoint_url": self._endpoint_url,
             "batch_size": self._batch_size,
             "retries": self._retries,
+            "num_workers": self._num_workers,
         }
 
+    def _upload_batch(self, docs: List[Dict]) -> None:
+        """Upload a batch of documents."""
+        headers = {"Authorization": f"Bearer {self._bearer_token}"}
+        res = self._s.post(
+            f"{self._endpoint_url}/upsert",
+            headers=headers,
+            json={"documents": docs},
+        )
+        res.raise_for_status()
+
     def add(
         self,
         embedding_results: List[NodeEmbeddingResult],
     ) -> List[str]:
         """Add embedding_results to index."""
-        headers = {"Authorization": f"Bearer {self._bearer_token}"}
-
         docs_to_upload = convert_docs_to_json(embedding_results)
-        for i in tqdm(range(0, len(docs_to_upload), self._batch_size)):
-            i_end = min(i + self._batch_size, len(docs_to_upload))
-            self._s.post(
-                f"{self._endpoint_url}/upsert",
-                headers=headers,
-                json={"documents": docs_to_upload[i:i_end]},
-            )
+        batches = [
+            docs_to_upload[i : i + self._batch_size]
+            for i in range(0, len(docs_to_upload), self._batch_size)
+        ]
+        run_batches(
+            self._upload_batch,
+            batches,
+            num_workers=self._num_workers,
+            progress_fn=lambda results: tqdm(results, total=len(batches)),
+        )
 
         return [result.id for result in embedding_results]
 
@@ -132,19 +158,40 @@ class ChatGPTRetrievalPluginClient(VectorStore):
         query: VectorStoreQuery,
     ) -> VectorStoreQueryResult:
         """Get nodes for response."""
-        if query.query_str is None:
+        return self.query_batch([query])[0]
+
+    def query_batch(
+        self,
+        queries: List[VectorStoreQuery],
+    ) -> List[VectorStoreQueryResult]:
+        """Get nodes for several queries, in a single request.
+
+        Args:
+            queries (List[VectorStoreQuery]): Queries to run.
+
+        Returns:
+            List[VectorStoreQueryResult]: One result per query, in order.
+
+        """
+        if any(query.query_str is None for query in queries):
             raise ValueError("query_str must be provided")
         headers = {"Authorization": f"Bearer {self._bearer_token}"}
         # TODO: add metadata filter
-        queries = [{"query": query.query_str, "top_k": query.similarity_top_k}]
-        res = requests.post(
-            f"{self._endpoint_url}/query", headers=headers, json={"queries": queries}
+        queries_json = [
+            {"query": query.query_str, "top_k": query.similarity_top_k}
+            for query in queries
+        ]
+        res = self._s.post(
+            f"{self._endpoint_url}/query",
+            headers=headers,
+            json={"queries": queries_json},
         )
 
-        nodes = []
-        similarities = []
-        ids = []
+        query_results = []
         for query_result in res.json()["results"]:
+            nodes = []
+            similarities = []
+            ids = []
             for result in query_result["results"]:
                 result_id = result["id"]
                 result_txt = result["text"]
@@ -158,8 +205,8 @@ class ChatGPTRetrievalPluginClient(VectorStore):
                 nodes.append(node)
                 similarities.append(result_score)
                 ids.append(result_id)
+            query_results.append(
+                VectorStoreQueryResult(nodes=nodes, similarities=similarities, ids=ids)
+            )
 
-            # NOTE: there should only be one query
-            break
-
-        return VectorStoreQueryResult(nodes=nodes, similarities=similarities, ids=ids)
+        return query_results
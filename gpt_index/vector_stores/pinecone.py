@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional, cast, Callable
 from functools import partial
 
 from gpt_index.data_structs.node_v2 import Node, DocumentRelationship
+from gpt_index.utils import run_batches
 from gpt_index.vector_stores.types import (
     NodeEmbeddingResult,
     VectorStore,
@@ -21,6 +22,8 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 100
+
 
 def get_metadata_from_node_info(
     node_info: Dict[str, Any], field_prefix: str
@@ -43,16 +46,28 @@ def get_node_info_from_metadata(
     return node_extra_info
 
 
-def build_dict(input_batch: List[List[int]]) -> List[Dict[str, Any]]:
+def build_dict(
+    input_batch: List[List[int]],
+    attention_mask_batch: Optional[List[List[int]]] = None,
+) -> List[Dict[str, Any]]:
     """Build a list of sparse dictionaries from a batch of input_ids.
 
+    If `attention_mask_batch` is given, padding tokens (with a mask of 0)
+    are skipped.
+
     NOTE: taken from https://www.pinecone.io/learn/hybrid-search-intro/.
 
     """
     # store a batch of sparse embeddings
     sparse_emb = []
     # iterate through input batch
-    for token_ids in input_batch:
+    for i, token_ids in enumerate(input_batch):
+        if attention_mask_batch is not None:
+            token_ids = [
+                token_id
+                for token_id, mask in zip(token_ids, attention_mask_batch[i])
+                if mask
+            ]
         indices = []
         values = []
         # convert the input_ids list to a dictionary of key to frequency values
@@ -74,9 +89,9 @@ def generate_sparse_vectors(
 
     """
     # create batch of input_ids
-    inputs = tokenizer(context_batch)["input_ids"]
-    # create sparse dictionaries
-    sparse_embeds = build_dict(inputs)
+    inputs = tokenizer(context_batch)
+    # create sparse dictionaries, skipping padding if the tokenizer pads
+    sparse_embeds = build_dict(inputs["input_ids"], inputs.get("attention_mask"))
     return sparse_embeds
 
 
@@ -89,10 +104,10 @@ def get_default_tokenizer() -> Callable:
     from transformers import BertTokenizerFast
 
     orig_tokenizer = BertTokenizerFast.from_pretrained("bert-base-uncased")
-    # set some default arguments, so input is just a list of strings
+    # set some default arguments, so input is just a list of strings.
+    # NOTE: no padding, since texts in a batch are counted separately
     tokenizer = partial(
         orig_tokenizer,
-        padding=True,
         truncation=True,
         max_length=512,
     )
@@ -118,6 +133,10 @@ class PineconeVectorStore(VectorStore):
         delete_kwargs (Optional[Dict]): delete kwargs during `delete` call.
         add_sparse_vector (bool): whether to add sparse vector to index.
         tokenizer (Optional[Callable]): tokenizer to use to generate sparse
+        batch_size (int): number of vectors per `upsert` call. Sparse vectors
+            are also generated one batch at a time. Defaults to 100.
+        num_workers (Optional[int]): maximum number of batches upserted
+            concurrently (in a thread pool). Upserts sequentially if None.
 
     """
 
@@ -135,9 +154,15 @@ class PineconeVectorStore(VectorStore):
         delete_kwargs: Optional[Dict] = None,
         add_sparse_vector: bool = False,
         tokenizer: Optional[Callable] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        num_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize params."""
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        if num_workers is not None and num_workers <= 0:
+            raise ValueError("num_workers must be > 0")
         import_err_msg = (
             "`pinecone` package not found, please run `pip install pinecone-client`"
         )
@@ -191,6 +216,8 @@ class PineconeVectorStore(VectorStore):
         if tokenizer is None:
             tokenizer = get_default_tokenizer()
         self._tokenizer = tokenizer
+        self._batch_size = batch_size
+        self._num_workers = num_workers
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> "VectorStore":
@@ -208,65 +235,74 @@ class PineconeVectorStore(VectorStore):
             "query_kwargs": self._query_kwargs,
             "delete_kwargs": self._delete_kwargs,
             "add_sparse_vector": self._add_sparse_vector,
+            "batch_size": self._batch_size,
+            "num_workers": self._num_workers,
+        }
+
+    def _get_entry(self, result: NodeEmbeddingResult) -> Dict[str, Any]:
+        """Get the Pinecone entry of an embedding result."""
+        node = result.node
+        metadata = {
+            "text": node.get_text(),
+            # NOTE: this is the reference to source doc
+            "doc_id": result.doc_id,
+            "id": result.id,
+        }
+        if node.extra_info:
+            # TODO: check if overlap with default metadata keys
+            metadata.update(get_metadata_from_node_info(node.extra_info, "extra_info"))
+        if node.node_info:
+            # TODO: check if overlap with default metadata keys
+            metadata.update(get_metadata_from_node_info(node.node_info, "node_info"))
+        # if additional metadata keys overlap with the default keys,
+        # then throw an error
+        intersecting_keys = set(metadata.keys()).intersection(
+            self._metadata_filters.keys()
+        )
+        if intersecting_keys:
+            raise ValueError(
+                "metadata_filters keys overlap with default "
+                f"metadata keys: {intersecting_keys}"
+            )
+        metadata.update(self._metadata_filters)
+
+        return {
+            "id": result.id,
+            "values": result.embedding,
+            "metadata": metadata,
         }
 
+    def _upsert_batch(self, entries: List[Dict[str, Any]]) -> None:
+        """Upsert a batch of entries, with one tokenizer call for sparse vectors."""
+        if self._add_sparse_vector:
+            sparse_vectors = generate_sparse_vectors(
+                [entry["metadata"]["text"] for entry in entries], self._tokenizer
+            )
+            for entry, sparse_vector in zip(entries, sparse_vectors):
+                entry["sparse_values"] = sparse_vector
+        self._pinecone_index.upsert(entries, **self._pinecone_kwargs)
+
     def add(
         self,
         embedding_results: List[NodeEmbeddingResult],
     ) -> List[str]:
         """Add embedding results to index.
 
+        Entries are upserted in batches of `batch_size`, concurrently
+        if `num_workers` is set.
+
         Args
             embedding_results: List[NodeEmbeddingResult]: list of embedding results
 
         """
-        ids = []
-        for result in embedding_results:
-            new_id = result.id
-            node = result.node
-            text_embedding = result.embedding
-
-            metadata = {
-                "text": node.get_text(),
-                # NOTE: this is the reference to source doc
-                "doc_id": result.doc_id,
-                "id": new_id,
-            }
-            if node.extra_info:
-                # TODO: check if overlap with default metadata keys
-                metadata.update(
-                    get_metadata_from_node_info(node.extra_info, "extra_info")
-                )
-            if node.node_info:
-                # TODO: check if overlap with default metadata keys
-                metadata.update(
-                    get_metadata_from_node_info(node.node_info, "node_info")
-                )
-            # if additional metadata keys overlap with the default keys,
-            # then throw an error
-            intersecting_keys = set(metadata.keys()).intersection(
-                self._metadata_filters.keys()
-            )
-            if intersecting_keys:
-                raise ValueError(
-                    "metadata_filters keys overlap with default "
-                    f"metadata keys: {intersecting_keys}"
-                )
-            metadata.update(self._metadata_filters)
-
-            entry = {
-                "id": new_id,
-                "values": text_embedding,
-                "metadata": metadata,
-            }
-            if self._add_sparse_vector:
-                sparse_vector = generate_sparse_vectors(
-                    [node.get_text()], self._tokenizer
-                )[0]
-                entry.update({"sparse_values": sparse_vector})
-            self._pinecone_index.upsert([entry], **self._pinecone_kwargs)
-            ids.append(new_id)
-        return ids
+        # build all entries first, so that invalid metadata fails before any upsert
+        entries = [self._get_entry(result) for result in embedding_results]
+        batches = [
+            entries[i : i + self._batch_size]
+            for i in range(0, len(entries), self._batch_size)
+        ]
+        run_batches(self._upsert_batch, batches, num_workers=self._num_workers)
+        return [result.id for result in embedding_results]
 
     def delete(self, doc_id: str, **delete_kwargs: Any) -> None:
         """Delete a document.
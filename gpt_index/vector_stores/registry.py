@@ -10,12 +10,14 @@ from gpt_index.vector_stores.opensearch import OpensearchVectorStore
 from gpt_index.vector_stores.pinecone import PineconeVectorStore
 from gpt_index.vector_stores.qdrant import QdrantVectorStore
 from gpt_index.vector_stores.simple import SimpleVectorStore
+from gpt_index.vector_stores.simple_ivf import SimpleIVFVectorStore
 from gpt_index.vector_stores.types import VectorStore
 from gpt_index.vector_stores.weaviate import WeaviateVectorStore
 
 
 class VectorStoreType(str, Enum):
     SIMPLE = "simple"
+    SIMPLE_IVF = "simple_ivf"
     WEAVIATE = "weaviate"
     QDRANT = "qdrant"
     PINECONE = "pinecone"
@@ -28,6 +30,7 @@ class VectorStoreType(str, Enum):
 
 VECTOR_STORE_TYPE_TO_VECTOR_STORE_CLASS: Dict[VectorStoreType, Type[VectorStore]] = {
     VectorStoreType.SIMPLE: SimpleVectorStore,
+    VectorStoreType.SIMPLE_IVF: SimpleIVFVectorStore,
     VectorStoreType.WEAVIATE: WeaviateVectorStore,
     VectorStoreType.QDRANT: QdrantVectorStore,
     VectorStoreType.MILVUS: MilvusVectorStore,
@@ -1,11 +1,17 @@
 """Simple vector store index."""
 
+import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Sequence, Set, cast
 
+import numpy as np
 from dataclasses_json import DataClassJsonMixin
 
-from gpt_index.indices.query.embedding_utils import get_top_k_embeddings
+from gpt_index.embeddings.base import SimilarityMode
+from gpt_index.indices.query.embedding_utils import (
+    get_batch_similarities_from_matrix,
+    get_top_k_indices,
+)
 from gpt_index.vector_stores.types import (
     NodeEmbeddingResult,
     VectorStore,
@@ -13,6 +19,9 @@ from gpt_index.vector_stores.types import (
     VectorStoreQuery,
 )
 
+EMBEDDINGS_FILE_NAME = "embeddings.npy"
+NORMS_FILE_NAME = "norms.npy"
+
 
 @dataclass
 class SimpleVectorStoreData(DataClassJsonMixin):
@@ -20,23 +29,43 @@ class SimpleVectorStoreData(DataClassJsonMixin):
 
     Args:
         embedding_dict (Optional[dict]): dict mapping doc_ids to embeddings.
+            Only used for serialization; SimpleVectorStore keeps embeddings
+            in a matrix.
         text_id_to_doc_id (Optional[dict]): dict mapping text_ids to doc_ids.
+        doc_id_to_text_ids (Optional[dict]): dict mapping doc_ids to text_ids.
+            Only used for serialization; rebuilt from `text_id_to_doc_id`
+            if missing.
 
     """
 
     embedding_dict: Dict[str, List[float]] = field(default_factory=dict)
     text_id_to_doc_id: Dict[str, str] = field(default_factory=dict)
+    doc_id_to_text_ids: Dict[str, List[str]] = field(default_factory=dict)
 
 
 class SimpleVectorStore(VectorStore):
     """Simple Vector Store.
 
     In this vector store, embeddings are stored within a simple, in-memory dictionary.
+    Embeddings are kept in a contiguous float32 matrix (along with their norms),
+    so that a query is a single matrix-vector product followed by a partial sort.
+
+    The embeddings can either be loaded from the `embedding_dict` of the data dict
+    (JSON format), or from binary `.npy` files written by `persist`, which
+    are memory-mapped so that vectors are only paged in when needed.
 
     Args:
         simple_vector_store_data_dict (Optional[dict]): data dict
             containing the embeddings and doc_ids. See SimpleVectorStoreData
             for more details.
+        similarity_mode (str): similarity mode used at query time.
+            One of "cosine" (default), "dot_product" or "euclidean".
+        embeddings_path (Optional[str]): path to a `.npy` file of embeddings,
+            one row per entry of `text_ids`.
+        norms_path (Optional[str]): path to a `.npy` file of the embedding norms.
+        text_ids (Optional[List[str]]): text ids of the rows of `embeddings_path`.
+        mmap (bool): whether to memory-map `embeddings_path` instead of
+            reading it into memory. Defaults to True.
     """
 
     stores_text: bool = False
@@ -44,6 +73,11 @@ class SimpleVectorStore(VectorStore):
     def __init__(
         self,
         simple_vector_store_data_dict: Optional[dict] = None,
+        similarity_mode: str = SimilarityMode.DEFAULT,
+        embeddings_path: Optional[str] = None,
+        norms_path: Optional[str] = None,
+        text_ids: Optional[List[str]] = None,
+        mmap: bool = True,
         **kwargs: Any,
     ) -> None:
         """Initialize params."""
@@ -51,6 +85,47 @@ class SimpleVectorStore(VectorStore):
             self._data = SimpleVectorStoreData()
         else:
             self._data = SimpleVectorStoreData.from_dict(simple_vector_store_data_dict)
+        self._similarity_mode = SimilarityMode(similarity_mode)
+
+        # NOTE: the matrix may have extra capacity; only the first
+        # `len(self._text_ids)` rows are valid.
+        self._text_ids: List[str] = []
+        self._text_id_to_row: Dict[str, int] = {}
+        self._embedding_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+
+        if embeddings_path is not None:
+            if text_ids is None or norms_path is None:
+                raise ValueError(
+                    "text_ids and norms_path must be provided with embeddings_path."
+                )
+            # NOTE: copy-on-write, so in-place deletes never touch the file
+            self._embedding_matrix = np.load(
+                embeddings_path, mmap_mode="c" if mmap else None
+            )
+            self._norms = np.load(norms_path)
+            self._text_ids = list(text_ids)
+            self._text_id_to_row = {
+                text_id: row_idx for row_idx, text_id in enumerate(self._text_ids)
+            }
+        else:
+            self._add_rows(
+                list(self._data.embedding_dict.keys()),
+                list(self._data.embedding_dict.values()),
+            )
+        # the matrix is the source of truth for embeddings,
+        # `embedding_dict` is only filled in for serialization
+        self._data.embedding_dict = {}
+
+        # reverse map, so that deletes do not scan `text_id_to_doc_id`
+        self._doc_id_to_text_ids: Dict[str, Set[str]] = {}
+        if self._data.doc_id_to_text_ids:
+            for doc_id, doc_text_ids in self._data.doc_id_to_text_ids.items():
+                self._doc_id_to_text_ids[doc_id] = set(doc_text_ids)
+        else:
+            for text_id, doc_id in self._data.text_id_to_doc_id.items():
+                self._doc_id_to_text_ids.setdefault(doc_id, set()).add(text_id)
+        self._data.doc_id_to_text_ids = {}
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> "SimpleVectorStore":
@@ -64,13 +139,117 @@ class SimpleVectorStore(VectorStore):
     @property
     def config_dict(self) -> dict:
         """Get config dict."""
+        data_dict = self._get_data_dict(
+            embedding_dict={text_id: self.get(text_id) for text_id in self._text_ids}
+        )
+        return {
+            "simple_vector_store_data_dict": data_dict,
+            "similarity_mode": self._similarity_mode.value,
+        }
+
+    def _get_data_dict(self, embedding_dict: Dict[str, List[float]]) -> dict:
+        """Get the data dict for serialization."""
+        data = SimpleVectorStoreData(
+            embedding_dict=embedding_dict,
+            text_id_to_doc_id=self._data.text_id_to_doc_id,
+            doc_id_to_text_ids={
+                doc_id: sorted(doc_text_ids)
+                for doc_id, doc_text_ids in self._doc_id_to_text_ids.items()
+            },
+        )
+        return data.to_dict()
+
+    def persist(self, persist_dir: str) -> dict:
+        """Persist embeddings to binary files in `persist_dir`.
+
+        Embeddings and their norms are written as `.npy` files, and only
+        ids and metadata are kept in the returned config dict. File paths in
+        the config dict are relative to `persist_dir`.
+
+        Args:
+            persist_dir (str): directory to write the `.npy` files to.
+
+        Returns:
+            dict: config dict that can be passed to `from_dict`, once the file
+                paths are joined with `persist_dir`.
+
+        """
+        num_rows = len(self._text_ids)
+        for file_name, array in [
+            (EMBEDDINGS_FILE_NAME, self._embedding_matrix[:num_rows]),
+            (NORMS_FILE_NAME, self._norms[:num_rows]),
+        ]:
+            # NOTE: write to a temp file first, since `array` may be
+            # memory-mapped from the file we are about to overwrite
+            file_path = os.path.join(persist_dir, file_name)
+            tmp_file_path = file_path + ".tmp"
+            with open(tmp_file_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_file_path, file_path)
         return {
-            "simple_vector_store_data_dict": self._data.to_dict(),
+            "simple_vector_store_data_dict": self._get_data_dict(embedding_dict={}),
+            "similarity_mode": self._similarity_mode.value,
+            "embeddings_path": EMBEDDINGS_FILE_NAME,
+            "norms_path": NORMS_FILE_NAME,
+            "text_ids": self._text_ids,
         }
 
+    def _add_rows(self, text_ids: List[str], embeddings: List[List[float]]) -> None:
+        """Add (or overwrite) rows of the embedding matrix."""
+        if len(text_ids) == 0:
+            return
+        new_rows = np.asarray(embeddings, dtype=np.float32)
+        if new_rows.ndim != 2:
+            raise ValueError("Embeddings must all have the same dimension.")
+        num_rows = len(self._text_ids)
+        if num_rows > 0 and new_rows.shape[1] != self._embedding_matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {new_rows.shape[1]} does not match "
+                f"vector store dimension {self._embedding_matrix.shape[1]}."
+            )
+        new_norms = np.linalg.norm(new_rows, axis=1)
+
+        # grow with amortized doubling to keep repeated adds cheap
+        capacity = len(self._embedding_matrix)
+        if num_rows == 0 or num_rows + len(text_ids) > capacity:
+            new_capacity = max(2 * capacity, num_rows + len(text_ids))
+            matrix = np.zeros((new_capacity, new_rows.shape[1]), dtype=np.float32)
+            norms = np.zeros(new_capacity, dtype=np.float32)
+            if num_rows > 0:
+                matrix[:num_rows] = self._embedding_matrix[:num_rows]
+                norms[:num_rows] = self._norms[:num_rows]
+            self._embedding_matrix = matrix
+            self._norms = norms
+
+        for text_id, row, norm in zip(text_ids, new_rows, new_norms):
+            row_idx = self._text_id_to_row.get(text_id)
+            if row_idx is None:
+                row_idx = len(self._text_ids)
+                self._text_ids.append(text_id)
+                self._text_id_to_row[text_id] = row_idx
+            self._embedding_matrix[row_idx] = row
+            self._norms[row_idx] = norm
+
+    def _delete_rows(self, text_ids: List[str]) -> None:
+        """Delete rows of the embedding matrix.
+
+        Each deleted row is overwritten by the current last row, so deletes are
+        O(dim) per row and the valid rows stay contiguous.
+
+        """
+        for text_id in text_ids:
+            row_idx = self._text_id_to_row.pop(text_id)
+            last_idx = len(self._text_ids) - 1
+            last_text_id = self._text_ids.pop()
+            if row_idx != last_idx:
+                self._embedding_matrix[row_idx] = self._embedding_matrix[last_idx]
+                self._norms[row_idx] = self._norms[last_idx]
+                self._text_ids[row_idx] = last_text_id
+                self._text_id_to_row[last_text_id] = row_idx
+
     def get(self, text_id: str) -> List[float]:
         """Get embedding."""
-        return self._data.embedding_dict[text_id]
+        return self._embedding_matrix[self._text_id_to_row[text_id]].tolist()
 
     def add(
         self,
@@ -78,39 +257,73 @@ class SimpleVectorStore(VectorStore):
     ) -> List[str]:
         """Add embedding_results to index."""
         for result in embedding_results:
-            text_id = result.id
-            self._data.embedding_dict[text_id] = result.embedding
-            self._data.text_id_to_doc_id[text_id] = result.doc_id
+            prev_doc_id = self._data.text_id_to_doc_id.get(result.id)
+            if prev_doc_id is not None:
+                self._doc_id_to_text_ids[prev_doc_id].discard(result.id)
+            self._data.text_id_to_doc_id[result.id] = result.doc_id
+            self._doc_id_to_text_ids.setdefault(result.doc_id, set()).add(result.id)
+        self._add_rows(
+            [result.id for result in embedding_results],
+            [result.embedding for result in embedding_results],
+        )
         return [result.id for result in embedding_results]
 
     def delete(self, doc_id: str, **delete_kwargs: Any) -> None:
         """Delete a document."""
-        text_ids_to_delete = set()
-        for text_id, doc_id_ in self._data.text_id_to_doc_id.items():
-            if doc_id == doc_id_:
-                text_ids_to_delete.add(text_id)
+        self.delete_many([doc_id], **delete_kwargs)
+
+    def delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete documents.
 
-        for text_id in text_ids_to_delete:
-            del self._data.embedding_dict[text_id]
-            del self._data.text_id_to_doc_id[text_id]
+        Uses the doc_id -> text_ids reverse map, so this is O(number of
+        deleted embeddings) rather than a scan over every stored embedding.
+
+        """
+        text_ids_to_delete = []
+        for doc_id in doc_ids:
+            for text_id in self._doc_id_to_text_ids.pop(doc_id, set()):
+                del self._data.text_id_to_doc_id[text_id]
+                text_ids_to_delete.append(text_id)
+        self._delete_rows(text_ids_to_delete)
 
     def query(
         self,
         query: VectorStoreQuery,
     ) -> VectorStoreQueryResult:
         """Get nodes for response."""
-        # TODO: consolidate with get_query_text_embedding_similarities
-        items = self._data.embedding_dict.items()
-        node_ids = [t[0] for t in items]
-        embeddings = [t[1] for t in items]
-
-        query_embedding = cast(List[float], query.query_embedding)
-
-        top_similarities, top_ids = get_top_k_embeddings(
-            query_embedding,
-            embeddings,
-            similarity_top_k=query.similarity_top_k,
-            embedding_ids=node_ids,
+        return self.query_batch([query])[0]
+
+    def query_batch(
+        self,
+        queries: List[VectorStoreQuery],
+    ) -> List[VectorStoreQueryResult]:
+        """Get nodes for a batch of queries.
+
+        Similarities between all queries and all embeddings are computed
+        with a single matrix product.
+
+        """
+        num_rows = len(self._text_ids)
+        if num_rows == 0 or len(queries) == 0:
+            return [VectorStoreQueryResult(similarities=[], ids=[]) for _ in queries]
+
+        query_embeddings = [cast(List[float], q.query_embedding) for q in queries]
+        batch_similarities = get_batch_similarities_from_matrix(
+            query_embeddings,
+            self._embedding_matrix[:num_rows],
+            norms=self._norms[:num_rows],
+            mode=self._similarity_mode,
         )
 
-        return VectorStoreQueryResult(similarities=top_similarities, ids=top_ids)
+        results = []
+        for query, similarities in zip(queries, batch_similarities):
+            top_indices = get_top_k_indices(
+                similarities, similarity_top_k=query.similarity_top_k
+            )
+            results.append(
+                VectorStoreQueryResult(
+                    similarities=[float(similarities[i]) for i in top_indices],
+                    ids=[self._text_ids[i] for i in top_indices],
+                )
+            )
+        return results
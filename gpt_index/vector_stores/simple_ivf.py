@@ -0,0 +1,435 @@
+"""Simple IVF vector store.
+
+An approximate nearest neighbor (ANN) vector store in pure NumPy, based on an
+inverted file index (IVF-flat): embeddings are clustered with k-means, and a
+query only scores the embeddings in the `nprobe` clusters closest to it.
+
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, cast
+
+import numpy as np
+from dataclasses_json import DataClassJsonMixin
+
+from gpt_index.embeddings.base import SimilarityMode
+from gpt_index.indices.query.embedding_utils import (
+    get_batch_similarities_from_matrix,
+    get_top_k_indices,
+)
+from gpt_index.vector_stores.types import (
+    NodeEmbeddingResult,
+    VectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+
+DEFAULT_NPROBE = 8
+DEFAULT_TRAIN_THRESHOLD = 10000
+DEFAULT_KMEANS_ITERS = 10
+# max number of training embeddings per cluster
+MAX_POINTS_PER_CLUSTER = 256
+# number of embeddings assigned to clusters at a time, to bound memory
+ASSIGN_BATCH_SIZE = 4096
+# compact the embedding matrix once this fraction of rows are deleted
+COMPACT_RATIO = 0.5
+
+
+@dataclass
+class SimpleIVFVectorStoreData(DataClassJsonMixin):
+    """Simple IVF Vector Store Data container.
+
+    Args:
+        embedding_dict (Optional[dict]): dict mapping text_ids to embeddings.
+            Only used for serialization.
+        text_id_to_doc_id (Optional[dict]): dict mapping text_ids to doc_ids.
+        centroids (Optional[List[List[float]]]): cluster centroids, if trained.
+            Only used for serialization.
+
+    """
+
+    embedding_dict: Dict[str, List[float]] = field(default_factory=dict)
+    text_id_to_doc_id: Dict[str, str] = field(default_factory=dict)
+    centroids: Optional[List[List[float]]] = None
+
+
+class SimpleIVFVectorStore(VectorStore):
+    """Simple IVF Vector Store.
+
+    A local approximate nearest neighbor vector store, with no dependencies
+    beyond NumPy. Embeddings are kept in a float32 matrix and clustered into
+    `nlist` clusters (inverted lists) with k-means. A query is scored against
+    the centroids, and then only against the embeddings of the `nprobe`
+    closest clusters.
+
+    Until the store holds `train_threshold` embeddings, queries are exact
+    (brute force). Once the threshold is reached, the clusters are trained
+    automatically; call `train` to retrain them after the data has changed a lot.
+    New embeddings are added to their closest cluster. Deletes mark rows as
+    deleted (tombstones), and the matrix is compacted once half the rows
+    are deleted.
+
+    Args:
+        simple_ivf_vector_store_data_dict (Optional[dict]): data dict
+            containing the embeddings, doc_ids and centroids.
+            See SimpleIVFVectorStoreData for more details.
+        nlist (Optional[int]): number of clusters. Defaults to the square root
+            of the number of embeddings at training time.
+        nprobe (int): number of clusters scanned per query. Higher values give
+            better recall at the cost of latency. Can be changed at any time.
+        train_threshold (int): number of embeddings at which the clusters are
+            trained automatically.
+        similarity_mode (str): similarity mode used at query time.
+            One of "cosine" (default), "dot_product" or "euclidean".
+        seed (int): random seed for k-means.
+
+    """
+
+    stores_text: bool = False
+
+    def __init__(
+        self,
+        simple_ivf_vector_store_data_dict: Optional[dict] = None,
+        nlist: Optional[int] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        train_threshold: int = DEFAULT_TRAIN_THRESHOLD,
+        similarity_mode: str = SimilarityMode.DEFAULT,
+        seed: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize params."""
+        if simple_ivf_vector_store_data_dict is None:
+            self._data = SimpleIVFVectorStoreData()
+        else:
+            self._data = SimpleIVFVectorStoreData.from_dict(
+                simple_ivf_vector_store_data_dict
+            )
+        if nlist is not None and nlist <= 0:
+            raise ValueError("nlist must be > 0")
+        if nprobe <= 0:
+            raise ValueError("nprobe must be > 0")
+        self._nlist = nlist
+        self.nprobe = nprobe
+        self._train_threshold = train_threshold
+        self._similarity_mode = SimilarityMode(similarity_mode)
+        self._seed = seed
+
+        # NOTE: the matrix may have extra capacity; only the first
+        # `len(self._text_ids)` rows are used, and deleted rows are
+        # marked in `self._alive`
+        self._text_ids: List[str] = []
+        self._text_id_to_row: Dict[str, int] = {}
+        self._embedding_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._num_deleted = 0
+
+        self._centroids: Optional[np.ndarray] = None
+        self._centroid_norms = np.zeros(0, dtype=np.float32)
+        self._inverted_lists: List[List[int]] = []
+        # cached numpy copies of the inverted lists, reset when a list changes
+        self._list_arrays: List[Optional[np.ndarray]] = []
+
+        self._doc_id_to_text_ids: Dict[str, Set[str]] = {}
+        for text_id, doc_id in self._data.text_id_to_doc_id.items():
+            self._doc_id_to_text_ids.setdefault(doc_id, set()).add(text_id)
+
+        if self._data.centroids is not None:
+            self._set_centroids(np.asarray(self._data.centroids, dtype=np.float32))
+        self._add_rows(
+            list(self._data.embedding_dict.keys()),
+            list(self._data.embedding_dict.values()),
+        )
+        # the matrix and centroids are the source of truth,
+        # the data container is only filled in for serialization
+        self._data.embedding_dict = {}
+        self._data.centroids = None
+
+    @classmethod
+    def from_dict(cls, config_dict: Dict[str, Any]) -> "SimpleIVFVectorStore":
+        return cls(**config_dict)
+
+    @property
+    def client(self) -> None:
+        """Get client."""
+        return None
+
+    @property
+    def config_dict(self) -> dict:
+        """Get config dict."""
+        data = SimpleIVFVectorStoreData(
+            embedding_dict={
+                text_id: self.get(text_id) for text_id in self._text_id_to_row
+            },
+            text_id_to_doc_id=self._data.text_id_to_doc_id,
+            centroids=None if self._centroids is None else self._centroids.tolist(),
+        )
+        return {
+            "simple_ivf_vector_store_data_dict": data.to_dict(),
+            "nlist": self._nlist,
+            "nprobe": self.nprobe,
+            "train_threshold": self._train_threshold,
+            "similarity_mode": self._similarity_mode.value,
+            "seed": self._seed,
+        }
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the clusters have been trained."""
+        return self._centroids is not None
+
+    def get(self, text_id: str) -> List[float]:
+        """Get embedding."""
+        return self._embedding_matrix[self._text_id_to_row[text_id]].tolist()
+
+    def _set_centroids(self, centroids: np.ndarray) -> None:
+        """Set centroids, and reset the inverted lists."""
+        self._centroids = centroids
+        self._centroid_norms = np.linalg.norm(centroids, axis=1)
+        self._inverted_lists = [[] for _ in range(len(centroids))]
+        self._list_arrays = [None for _ in range(len(centroids))]
+
+    def _get_labels(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Get the closest centroid of each vector, in batches."""
+        centroid_norms = np.linalg.norm(centroids, axis=1)
+        labels = np.zeros(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), ASSIGN_BATCH_SIZE):
+            similarities = get_batch_similarities_from_matrix(
+                vectors[start : start + ASSIGN_BATCH_SIZE],
+                centroids,
+                norms=centroid_norms,
+                mode=self._similarity_mode,
+            )
+            labels[start : start + ASSIGN_BATCH_SIZE] = similarities.argmax(axis=1)
+        return labels
+
+    def _assign_rows(self, rows: np.ndarray) -> None:
+        """Add rows to the inverted lists of their closest centroids."""
+        if self._centroids is None or len(rows) == 0:
+            return
+        labels = self._get_labels(self._embedding_matrix[rows], self._centroids)
+        for row, label in zip(rows.tolist(), labels.tolist()):
+            self._inverted_lists[label].append(row)
+            self._list_arrays[label] = None
+
+    def _get_list_array(self, list_idx: int) -> np.ndarray:
+        """Get an inverted list as a numpy array."""
+        list_array = self._list_arrays[list_idx]
+        if list_array is None:
+            list_array = np.asarray(self._inverted_lists[list_idx], dtype=np.int64)
+            self._list_arrays[list_idx] = list_array
+        return list_array
+
+    def _kmeans(self, vectors: np.ndarray, k: int) -> np.ndarray:
+        """Cluster vectors with k-means, and return the centroids."""
+        rng = np.random.default_rng(self._seed)
+        if self._similarity_mode == SimilarityMode.DEFAULT:
+            # spherical k-means for cosine similarity
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+        for _ in range(DEFAULT_KMEANS_ITERS):
+            labels = self._get_labels(vectors, centroids)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, vectors)
+            non_empty = counts > 0
+            centroids[non_empty] = sums[non_empty] / counts[non_empty, np.newaxis]
+            # re-seed empty clusters with random vectors
+            num_empty = int((~non_empty).sum())
+            if num_empty > 0:
+                centroids[~non_empty] = vectors[rng.choice(len(vectors), num_empty)]
+        return centroids
+
+    def train(self) -> None:
+        """Train the clusters on the current embeddings.
+
+        Clusters are trained with k-means on a sample of at most
+        `MAX_POINTS_PER_CLUSTER` embeddings per cluster, and then every
+        embedding is assigned to its closest cluster.
+
+        """
+        num_rows = len(self._text_ids)
+        rows = np.flatnonzero(self._alive[:num_rows])
+        if len(rows) == 0:
+            return
+        nlist = self._nlist or max(1, int(np.sqrt(len(rows))))
+        nlist = min(nlist, len(rows))
+
+        rng = np.random.default_rng(self._seed)
+        max_train_size = nlist * MAX_POINTS_PER_CLUSTER
+        if len(rows) > max_train_size:
+            train_rows = np.sort(rng.choice(rows, max_train_size, replace=False))
+        else:
+            train_rows = rows
+        centroids = self._kmeans(self._embedding_matrix[train_rows], nlist)
+        self._set_centroids(centroids)
+        self._assign_rows(rows)
+
+    def _add_rows(self, text_ids: List[str], embeddings: List[List[float]]) -> None:
+        """Add (or overwrite) rows of the embedding matrix."""
+        # NOTE: the last embedding wins for duplicate text ids
+        last_idx_by_text_id = {text_id: idx for idx, text_id in enumerate(text_ids)}
+        if len(last_idx_by_text_id) == 0:
+            return
+        new_rows = np.asarray(embeddings, dtype=np.float32)
+        if new_rows.ndim != 2:
+            raise ValueError("Embeddings must all have the same dimension.")
+        new_rows = new_rows[list(last_idx_by_text_id.values())]
+        text_ids = list(last_idx_by_text_id.keys())
+
+        num_rows = len(self._text_ids)
+        if num_rows > 0 and new_rows.shape[1] != self._embedding_matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {new_rows.shape[1]} does not match "
+                f"vector store dimension {self._embedding_matrix.shape[1]}."
+            )
+        for text_id in text_ids:
+            if text_id in self._text_id_to_row:
+                self._delete_row(text_id)
+
+        # grow with amortized doubling to keep repeated adds cheap
+        capacity = len(self._embedding_matrix)
+        if num_rows == 0 or num_rows + len(text_ids) > capacity:
+            new_capacity = max(2 * capacity, num_rows + len(text_ids))
+            matrix = np.zeros((new_capacity, new_rows.shape[1]), dtype=np.float32)
+            norms = np.zeros(new_capacity, dtype=np.float32)
+            alive = np.zeros(new_capacity, dtype=bool)
+            if num_rows > 0:
+                matrix[:num_rows] = self._embedding_matrix[:num_rows]
+                norms[:num_rows] = self._norms[:num_rows]
+                alive[:num_rows] = self._alive[:num_rows]
+            self._embedding_matrix = matrix
+            self._norms = norms
+            self._alive = alive
+
+        new_row_idxs = np.arange(num_rows, num_rows + len(text_ids))
+        self._embedding_matrix[new_row_idxs] = new_rows
+        self._norms[new_row_idxs] = np.linalg.norm(new_rows, axis=1)
+        self._alive[new_row_idxs] = True
+        for text_id, row_idx in zip(text_ids, new_row_idxs.tolist()):
+            self._text_ids.append(text_id)
+            self._text_id_to_row[text_id] = row_idx
+
+        if self._centroids is not None:
+            self._assign_rows(new_row_idxs)
+        elif len(self._text_id_to_row) >= self._train_threshold:
+            self.train()
+
+    def _delete_row(self, text_id: str) -> None:
+        """Mark the row of a text id as deleted."""
+        row_idx = self._text_id_to_row.pop(text_id)
+        self._alive[row_idx] = False
+        self._num_deleted += 1
+
+    def compact(self) -> None:
+        """Drop deleted rows from the embedding matrix and inverted lists."""
+        num_rows = len(self._text_ids)
+        alive_rows = np.flatnonzero(self._alive[:num_rows])
+        new_row_idxs = np.full(num_rows, -1, dtype=np.int64)
+        new_row_idxs[alive_rows] = np.arange(len(alive_rows))
+
+        self._embedding_matrix = self._embedding_matrix[alive_rows]
+        self._norms = self._norms[alive_rows]
+        self._alive = np.ones(len(alive_rows), dtype=bool)
+        self._text_ids = [self._text_ids[row_idx] for row_idx in alive_rows.tolist()]
+        self._text_id_to_row = {
+            text_id: row_idx for row_idx, text_id in enumerate(self._text_ids)
+        }
+        for list_idx in range(len(self._inverted_lists)):
+            rows = new_row_idxs[self._get_list_array(list_idx)]
+            self._inverted_lists[list_idx] = rows[rows >= 0].tolist()
+            self._list_arrays[list_idx] = None
+        self._num_deleted = 0
+
+    def add(
+        self,
+        embedding_results: List[NodeEmbeddingResult],
+    ) -> List[str]:
+        """Add embedding_results to index."""
+        for result in embedding_results:
+            prev_doc_id = self._data.text_id_to_doc_id.get(result.id)
+            if prev_doc_id is not None:
+                self._doc_id_to_text_ids[prev_doc_id].discard(result.id)
+            self._data.text_id_to_doc_id[result.id] = result.doc_id
+            self._doc_id_to_text_ids.setdefault(result.doc_id, set()).add(result.id)
+        self._add_rows(
+            [result.id for result in embedding_results],
+            [result.embedding for result in embedding_results],
+        )
+        return [result.id for result in embedding_results]
+
+    def delete(self, doc_id: str, **delete_kwargs: Any) -> None:
+        """Delete a document."""
+        self.delete_many([doc_id], **delete_kwargs)
+
+    def delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete documents, compacting at most once."""
+        for doc_id in doc_ids:
+            for text_id in self._doc_id_to_text_ids.pop(doc_id, set()):
+                del self._data.text_id_to_doc_id[text_id]
+                self._delete_row(text_id)
+        if self._num_deleted > COMPACT_RATIO * len(self._text_ids):
+            self.compact()
+
+    def query(
+        self,
+        query: VectorStoreQuery,
+    ) -> VectorStoreQueryResult:
+        """Get nodes for response."""
+        return self.query_batch([query])[0]
+
+    def query_batch(
+        self,
+        queries: List[VectorStoreQuery],
+    ) -> List[VectorStoreQueryResult]:
+        """Get nodes for a batch of queries.
+
+        Queries are scored against the centroids with a single matrix product.
+        Then each query is scored against the embeddings of its `nprobe`
+        closest clusters (or against all embeddings, if not trained yet).
+
+        """
+        if len(self._text_id_to_row) == 0 or len(queries) == 0:
+            return [VectorStoreQueryResult(similarities=[], ids=[]) for _ in queries]
+
+        query_embeddings = [cast(List[float], q.query_embedding) for q in queries]
+        num_rows = len(self._text_ids)
+        if self._centroids is None:
+            all_rows = np.flatnonzero(self._alive[:num_rows])
+            candidate_rows = [all_rows for _ in queries]
+        else:
+            centroid_similarities = get_batch_similarities_from_matrix(
+                query_embeddings,
+                self._centroids,
+                norms=self._centroid_norms,
+                mode=self._similarity_mode,
+            )
+            candidate_rows = []
+            for similarities in centroid_similarities:
+                probe_idxs = get_top_k_indices(similarities, self.nprobe)
+                rows = np.concatenate(
+                    [self._get_list_array(idx) for idx in probe_idxs.tolist()]
+                )
+                candidate_rows.append(rows[self._alive[rows]])
+
+        results = []
+        for query, query_embedding, rows in zip(
+            queries, query_embeddings, candidate_rows
+        ):
+            similarities = get_batch_similarities_from_matrix(
+                [query_embedding],
+                self._embedding_matrix[rows],
+                norms=self._norms[rows],
+                mode=self._similarity_mode,
+            )[0]
+            top_idxs = get_top_k_indices(
+                similarities, similarity_top_k=query.similarity_top_k
+            )
+            results.append(
+                VectorStoreQueryResult(
+                    similarities=[float(similarities[i]) for i in top_idxs],
+                    ids=[self._text_ids[rows[i]] for i in top_idxs],
+                )
+            )
+        return results
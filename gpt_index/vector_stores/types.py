@@ -2,7 +2,7 @@
 
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Dict, List, Optional, Protocol, Sequence, runtime_checkable
 
 from enum import Enum
 from gpt_index.data_structs.node_v2 import Node
@@ -92,6 +92,16 @@ class VectorStore(Protocol):
         """Delete doc."""
         ...
 
+    def delete_many(self, doc_ids: Sequence[str], **delete_kwargs: Any) -> None:
+        """Delete docs.
+
+        By default, this deletes each doc separately.
+        Meant to be overriden by vector stores that can delete many docs at once.
+
+        """
+        for doc_id in doc_ids:
+            self.delete(doc_id, **delete_kwargs)
+
     def query(
         self,
         query: VectorStoreQuery,
@@ -102,3 +112,15 @@ class VectorStore(Protocol):
     ) -> VectorStoreQueryResult:
         """Query vector store."""
         ...
+
+    def query_batch(
+        self,
+        queries: List[VectorStoreQuery],
+    ) -> List[VectorStoreQueryResult]:
+        """Query vector store with a batch of queries.
+
+        By default, this runs each query separately.
+        Meant to be overriden by vector stores that can answer many queries at once.
+
+        """
+        return [self.query(query) for query in queries]
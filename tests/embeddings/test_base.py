@@ -1,7 +1,15 @@
 """Embeddings."""
+import asyncio
+import os
+import threading
+from tempfile import TemporaryDirectory
 from typing import Any, List
 from unittest.mock import patch
 
+import openai
+import pytest
+
+from gpt_index.embeddings.cache import InMemoryEmbeddingCache, SQLiteEmbeddingCache
 from gpt_index.embeddings.openai import OpenAIEmbedding
 
 
@@ -65,3 +73,231 @@ def test_get_queued_text_embedings(
     for i in range(20, 24):
         assert result_ids[i] == f"id:{i-20}"
         assert result_embeddings[i] == [0, 0, 0, 1, 0]
+
+
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+def test_get_queued_text_embeddings_cache(
+    mock_get_text_embeddings: Any, _mock_get_text_embedding: Any
+) -> None:
+    """Test get queued text embeddings with an embedding cache."""
+    embed_model = OpenAIEmbedding(
+        embed_batch_size=2, embedding_cache=InMemoryEmbeddingCache()
+    )
+    texts = ["Hello world.", "This is a test.", "Hello world.", "This is a test."]
+    for i, text in enumerate(texts):
+        embed_model.queue_text_for_embeddding(f"id:{i}", text)
+    result_ids, result_embeddings = embed_model.get_queued_text_embeddings()
+    assert result_ids == ["id:0", "id:1", "id:2", "id:3"]
+    assert result_embeddings == [mock_get_text_embedding(text) for text in texts]
+    # duplicate texts are only embedded once
+    assert mock_get_text_embeddings.call_count == 1
+    assert embed_model.cache_misses == 2
+    assert embed_model.cache_hits == 2
+
+    # second pass is served entirely from the cache
+    for i, text in enumerate(texts):
+        embed_model.queue_text_for_embeddding(f"id:{i}", text)
+    embed_model.queue_text_for_embeddding("id:4", "This is another test.")
+    result_ids, result_embeddings = embed_model.get_queued_text_embeddings()
+    assert result_embeddings[-1] == [0, 0, 1, 0, 0]
+    assert mock_get_text_embeddings.call_args[0][0] == ["This is another test."]
+    assert embed_model.cache_misses == 3
+    assert embed_model.cache_hits == 6
+
+
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+def test_sqlite_embedding_cache(mock_get_text_embedding: Any) -> None:
+    """Test that the sqlite embedding cache persists across instances."""
+    with TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "embeddings.db")
+        embedding_cache = SQLiteEmbeddingCache(cache_path)
+        embed_model = OpenAIEmbedding(embedding_cache=embedding_cache)
+        assert embed_model.get_text_embedding("Hello world.") == [1, 0, 0, 0, 0]
+        embedding_cache.close()
+
+        embedding_cache = SQLiteEmbeddingCache(cache_path)
+        embed_model = OpenAIEmbedding(embedding_cache=embedding_cache)
+        total_tokens_used = embed_model.total_tokens_used
+        assert embed_model.get_text_embedding("Hello world.") == [1, 0, 0, 0, 0]
+        assert mock_get_text_embedding.call_count == 1
+        assert embed_model.cache_hits == 1
+        assert embed_model.total_tokens_used == total_tokens_used
+
+        # a different model does not share cache entries
+        embed_model = OpenAIEmbedding(
+            deployment_name="my-deployment", embedding_cache=embedding_cache
+        )
+        embed_model.get_text_embedding("Hello world.")
+        assert mock_get_text_embedding.call_count == 2
+        embedding_cache.close()
+
+
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+def test_get_queued_text_embeddings_num_workers(
+    mock_get_text_embeddings: Any,
+) -> None:
+    """Test that parallel batches keep the queue order."""
+    embed_model = OpenAIEmbedding(embed_batch_size=2, num_workers=4)
+    texts = ["Hello world.", "This is a test.", "This is another test."] * 5
+    for i, text in enumerate(texts):
+        embed_model.queue_text_for_embeddding(f"id:{i}", text)
+    result_ids, result_embeddings = embed_model.get_queued_text_embeddings()
+    assert result_ids == [f"id:{i}" for i in range(len(texts))]
+    assert result_embeddings == mock_get_text_embeddings(texts)
+    assert mock_get_text_embeddings.call_count == 8 + 1
+
+
+def test_aget_queued_text_embeddings_num_workers() -> None:
+    """Test that async batches are bounded by num_workers."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def mock_aget_text_embeddings(texts: List[str]) -> List[List[float]]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return mock_get_text_embeddings(texts)
+
+    embed_model = OpenAIEmbedding(embed_batch_size=1, num_workers=2)
+    text_queue = [(f"id:{i}", "Hello world.") for i in range(6)]
+    with patch.object(
+        OpenAIEmbedding, "_aget_text_embeddings", side_effect=mock_aget_text_embeddings
+    ):
+        result_ids, result_embeddings = asyncio.run(
+            embed_model.aget_queued_text_embeddings(text_queue)
+        )
+    assert result_ids == [f"id:{i}" for i in range(6)]
+    assert result_embeddings == [[1, 0, 0, 0, 0]] * 6
+    assert max_in_flight == 2
+
+
+@patch("gpt_index.utils.time.sleep")
+def test_get_queued_text_embeddings_throttled(mock_sleep: Any) -> None:
+    """Test that throttled batches are retried with backoff."""
+    lock = threading.Lock()
+    num_calls = 0
+
+    def mock_throttled_get_text_embeddings(texts: List[str]) -> List[List[float]]:
+        nonlocal num_calls
+        with lock:
+            num_calls += 1
+            if num_calls <= 2:
+                raise openai.error.RateLimitError("rate limited")
+        return mock_get_text_embeddings(texts)
+
+    embed_model = OpenAIEmbedding(embed_batch_size=1, num_workers=2)
+    for i in range(4):
+        embed_model.queue_text_for_embeddding(f"id:{i}", "This is a test.")
+    with patch.object(
+        OpenAIEmbedding,
+        "_get_text_embeddings",
+        side_effect=mock_throttled_get_text_embeddings,
+    ):
+        _, result_embeddings = embed_model.get_queued_text_embeddings()
+    assert result_embeddings == [[0, 1, 0, 0, 0]] * 4
+    assert num_calls == 6
+    assert mock_sleep.called
+
+    # non-throttling errors are raised right away
+    embed_model.queue_text_for_embeddding("id:0", "Invalid text.")
+    with patch.object(
+        OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+    ) as mock_embeddings:
+        with pytest.raises(ValueError):
+            embed_model.get_queued_text_embeddings()
+        assert mock_embeddings.call_count == 1
+
+
+@patch("gpt_index.utils.time.sleep")
+def test_get_queued_text_embeddings_throttled_api(mock_sleep: Any) -> None:
+    """Test that throttled API calls are retried only by the adaptive backoff."""
+    num_calls = 0
+
+    def mock_create(input: List[str], **kwargs: Any) -> Any:
+        nonlocal num_calls
+        num_calls += 1
+        if num_calls <= 2:
+            raise openai.error.RateLimitError("rate limited")
+        data = [
+            {"index": i, "embedding": mock_get_text_embedding(text)}
+            for i, text in enumerate(input)
+        ]
+        return openai.openai_object.OpenAIObject.construct_from({"data": data})
+
+    embed_model = OpenAIEmbedding()
+    embed_model.queue_text_for_embeddding("id:0", "This is a test.")
+    with patch.object(
+        openai.Embedding, "create", side_effect=mock_create
+    ), patch.object(
+        embed_model._backoff, "on_throttle", wraps=embed_model._backoff.on_throttle
+    ) as mock_on_throttle:
+        _, result_embeddings = embed_model.get_queued_text_embeddings()
+    assert result_embeddings == [[0, 1, 0, 0, 0]]
+    # every throttled API call reaches the adaptive backoff,
+    # instead of being retried by tenacity first
+    assert num_calls == 3
+    assert mock_on_throttle.call_count == 2
+
+
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+def test_get_queued_text_embeddings_max_tokens(mock_get_text_embeddings: Any) -> None:
+    """Test batching by cumulative token count."""
+    embed_model = OpenAIEmbedding(embed_batch_size=3, embed_batch_max_tokens=10)
+    # mock tokenizer: one token per character
+    embed_model._tokenizer = list
+
+    # capped at embed_batch_size texts per batch
+    assert embed_model._get_text_batches(["ab", "cd", "ef", "gh"]) == [
+        ["ab", "cd", "ef"],
+        ["gh"],
+    ]
+    assert embed_model._get_text_batches(["abcd", "efgh", "ij", "k"]) == [
+        ["abcd", "efgh", "ij"],
+        ["k"],
+    ]
+    assert embed_model._get_text_batches(["abcdef", "ghijk", "l"]) == [
+        ["abcdef"],
+        ["ghijk", "l"],
+    ]
+
+    # texts longer than the limit are embedded on their own
+    texts = ["Hello world.", "This is a test.", "Hello world."]
+    for i, text in enumerate(texts):
+        embed_model.queue_text_for_embeddding(f"id:{i}", text)
+    _, result_embeddings = embed_model.get_queued_text_embeddings()
+    assert mock_get_text_embeddings.call_count == 3
+    assert result_embeddings == [
+        [1, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0],
+        [1, 0, 0, 0, 0],
+    ]
+
+
+def test_openai_embedding_engines() -> None:
+    """Test resolving the OpenAI engines for queries and texts."""
+    embed_model = OpenAIEmbedding(mode="text_search", model="ada")
+    assert embed_model._get_query_engine() == "text-search-ada-query-001"
+    assert embed_model._get_text_engine() == "text-search-ada-doc-001"
+
+    # the deployment name takes precedence over mode and model
+    embed_model = OpenAIEmbedding(deployment_name="my-deployment")
+    assert embed_model._get_query_engine() == "my-deployment"
+    assert embed_model._get_text_engine() == "my-deployment"
+
+    embed_model = OpenAIEmbedding(mode="similarity", model="ada")
+    embed_model.model = "unknown"  # type: ignore
+    with pytest.raises(ValueError):
+        embed_model._get_query_engine()
@@ -191,6 +191,61 @@ def test_build_kg_similarity(
         assert embedding == mock_get_text_embedding(rel_text)
 
 
+async def mock_aextract_triplets(text: str) -> List[Tuple[str, str, str]]:
+    """Mock async extract triplets."""
+    return mock_extract_triplets(text)
+
+
+async def mock_aget_text_embeddings(texts: List[str]) -> List[List[float]]:
+    """Mock async get text embeddings."""
+    return mock_get_text_embeddings(texts)
+
+
+@patch_common
+@patch.object(
+    GPTKnowledgeGraphIndex, "_aextract_triplets", side_effect=mock_aextract_triplets
+)
+@patch.object(
+    OpenAIEmbedding, "_aget_text_embeddings", side_effect=mock_aget_text_embeddings
+)
+def test_build_kg_async(
+    _mock_aget_text_embeddings: Any,
+    _mock_aextract_triplets: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    struct_kwargs: Any,
+) -> None:
+    """Test building the knowledge graph with async calls."""
+    # the first triplet appears in two chunks
+    doc_text = (
+        "(foo, is, bar)\n"
+        "(hello, is not, world)\n"
+        "(Jane, is mother of, Bob)\n"
+        "(foo, is, bar)"
+    )
+    index = GPTKnowledgeGraphIndex.from_documents(
+        [Document(doc_text)], include_embeddings=True, use_async=True
+    )
+    assert _mock_aextract_triplets.call_count == 4
+    assert len(index.index_struct.table["foo"]) == 2
+
+    # triplets are de-duplicated and embedded in a single batch
+    _mock_aget_text_embeddings.assert_called_once_with(
+        [
+            "('foo', 'is', 'bar')",
+            "('hello', 'is not', 'world')",
+            "('Jane', 'is mother of', 'Bob')",
+        ]
+    )
+    rel_text_embeddings = index.index_struct.embedding_dict
+    assert len(rel_text_embeddings) == 3
+    for rel_text, embedding in rel_text_embeddings.items():
+        assert embedding == mock_get_text_embedding(rel_text)
+
+
 @patch_common
 @patch.object(
     GPTKnowledgeGraphIndex, "_extract_triplets", side_effect=mock_extract_triplets
@@ -9,6 +9,7 @@ from unittest.mock import patch
 
 import pytest
 from gpt_index.data_structs.node_v2 import Node
+from gpt_index.embeddings.openai import OpenAIEmbedding
 from gpt_index.indices.list.base import GPTListIndex
 from gpt_index.indices.list.embedding_query import GPTListIndexEmbeddingQuery
 from gpt_index.indices.service_context import ServiceContext
@@ -111,6 +112,40 @@ def test_refresh_list(
     assert test_node.text == "Test document 2, now with changes!"
 
 
+@patch_common
+def test_refresh_list_delete_removed(
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+) -> None:
+    """Test refresh with new, changed and removed documents."""
+    documents = [Document(f"Test document {i}", doc_id=str(i)) for i in range(4)]
+    list_index = GPTListIndex.from_documents(documents)
+
+    new_documents = [
+        documents[0],
+        Document("Test document 1, now with changes!", doc_id="1"),
+        Document("Test document 4", doc_id="4"),
+    ]
+    refreshed_docs = list_index.refresh(new_documents, delete_removed=True)
+    assert refreshed_docs == [False, True, True]
+
+    nodes = list_index.docstore.get_nodes(list_index.index_struct.nodes)
+    assert sorted(node.text for node in nodes) == [
+        "Test document 0",
+        "Test document 1, now with changes!",
+        "Test document 4",
+    ]
+    assert set(list_index.docstore.get_ref_doc_hashes().keys()) == {"0", "1", "4"}
+
+    # nothing changed since the last refresh
+    refreshed_docs = list_index.refresh(new_documents, delete_removed=True)
+    assert refreshed_docs == [False, False, False]
+    assert len(list_index.index_struct.nodes) == 3
+
+
 @patch_common
 def test_build_list_multiple(
     _mock_init: Any,
@@ -367,6 +402,55 @@ def test_embedding_query(
     assert str(response) == ("What is?:Hello world.")
 
 
+async def _mock_aget_query_embedding(query: str) -> List[float]:
+    """Mock async get query embedding."""
+    return [0, 0, 1, 0]
+
+
+async def _mock_aget_text_embeddings(texts: List[str]) -> List[List[float]]:
+    """Mock async get text embeddings."""
+    text_embed_map = {
+        "Hello world.": [1, 0, 0, 0],
+        "This is a test.": [0, 1, 0, 0],
+        "This is another test.": [0, 0, 1, 0],
+        "This is a test v2.": [0, 0, 0, 1],
+    }
+    return [text_embed_map[text] for text in texts]
+
+
+@patch_common
+@patch.object(LLMPredictor, "apredict", side_effect=mock_llmpredictor_apredict)
+@patch.object(
+    OpenAIEmbedding, "_aget_query_embedding", side_effect=_mock_aget_query_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_aget_text_embeddings", side_effect=_mock_aget_text_embeddings
+)
+def test_async_embedding_query(
+    _mock_atext_embeds: Any,
+    _mock_aquery_embed: Any,
+    _mock_async_predict: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    documents: List[Document],
+    struct_kwargs: Dict,
+) -> None:
+    """Test async embedding query."""
+    index_kwargs, query_kwargs = struct_kwargs
+    index = GPTListIndex.from_documents(documents, **index_kwargs)
+
+    query_str = "What is?"
+    task = index.aquery(query_str, mode="embedding", similarity_top_k=1, **query_kwargs)
+    response = asyncio.run(task)
+    assert str(response) == ("What is?:This is another test.")
+    # node embeddings are computed in a single batched async call
+    assert _mock_atext_embeds.call_count == 1
+    assert _mock_aquery_embed.call_count == 1
+
+
 @patch_common
 def test_extra_info(
     _mock_init: Any,
@@ -4,8 +4,10 @@ from typing import List
 
 import pytest
 
+from gpt_index.data_structs.node_v2 import DocumentRelationship
 from gpt_index.langchain_helpers.text_splitter import TokenTextSplitter
 from gpt_index.node_parser.node_utils import get_nodes_from_document
+from gpt_index.node_parser.simple import SimpleNodeParser
 from gpt_index.readers.schema.base import Document
 
 
@@ -65,3 +67,37 @@ def test_get_nodes_from_document_with_extra_info(
         chunk_size <= text_splitter._chunk_size for chunk_size in actual_chunk_sizes
     )
     assert all(["test_key: test_val" in n.get_text() for n in nodes])
+
+
+def test_simple_node_parser_num_workers(text_splitter: TokenTextSplitter) -> None:
+    """Test that parsing in worker processes matches parsing in process."""
+    documents = [
+        Document(
+            "Hello world.\nThis is a test.\nThis is another test.\n" * (i + 1),
+            doc_id=f"doc_{i}",
+        )
+        for i in range(5)
+    ]
+    nodes = SimpleNodeParser(text_splitter=text_splitter).get_nodes_from_documents(
+        documents
+    )
+    parallel_nodes = SimpleNodeParser(
+        text_splitter=text_splitter, num_workers=2
+    ).get_nodes_from_documents(documents)
+
+    assert [node.get_text() for node in parallel_nodes] == [
+        node.get_text() for node in nodes
+    ]
+    assert [node.ref_doc_id for node in parallel_nodes] == [
+        node.ref_doc_id for node in nodes
+    ]
+    # prev/next relationships are wired within each document
+    for prev_node, node in zip(parallel_nodes, parallel_nodes[1:]):
+        if prev_node.ref_doc_id == node.ref_doc_id:
+            assert prev_node.relationships[DocumentRelationship.NEXT] == node.doc_id
+            assert node.relationships[DocumentRelationship.PREVIOUS] == (
+                prev_node.doc_id
+            )
+        else:
+            assert DocumentRelationship.NEXT not in prev_node.relationships
+            assert DocumentRelationship.PREVIOUS not in node.relationships
@@ -1,6 +1,7 @@
 """Test response utils."""
 
-from typing import Any, List
+import asyncio
+from typing import Any, Generator, List, Tuple
 from unittest.mock import patch
 
 import pytest
@@ -10,10 +11,15 @@ from gpt_index.indices.prompt_helper import PromptHelper
 from gpt_index.indices.response.builder import ResponseBuilder, ResponseMode, TextChunk
 from gpt_index.indices.service_context import ServiceContext
 from gpt_index.langchain_helpers.chain_wrapper import LLMPredictor
+from gpt_index.prompts.base import Prompt
 from gpt_index.prompts.prompts import QuestionAnswerPrompt, RefinePrompt
 from gpt_index.readers.schema.base import Document
+from gpt_index.response.utils import get_response_text
 from tests.mock_utils.mock_decorator import patch_common
-from tests.mock_utils.mock_predict import mock_llmpredictor_predict
+from tests.mock_utils.mock_predict import (
+    mock_llmpredictor_apredict,
+    mock_llmpredictor_predict,
+)
 from tests.mock_utils.mock_prompts import MOCK_REFINE_PROMPT, MOCK_TEXT_QA_PROMPT
 
 
@@ -173,3 +179,124 @@ def test_tree_summarize_response(
     assert str(response) == (
         "What is?:This\n\nis\n\na\n\nbar\nThis\n" "This\n\nis\n\nanother\n\ntest\nThis"
     )
+
+
+@patch.object(LLMPredictor, "total_tokens_used", return_value=0)
+@patch.object(LLMPredictor, "apredict", side_effect=mock_llmpredictor_apredict)
+@patch.object(LLMPredictor, "predict", side_effect=mock_llmpredictor_predict)
+@patch.object(LLMPredictor, "__init__", return_value=None)
+def test_map_reduce_response(
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_apredict: Any,
+    _mock_total_tokens_used: Any,
+    documents: List[Document],
+) -> None:
+    """Test map-reduce response."""
+    mock_refine_prompt_tmpl = "{query_str}{existing_answer}{context_msg}"
+    mock_refine_prompt = RefinePrompt(mock_refine_prompt_tmpl)
+
+    mock_qa_prompt_tmpl = "{context_str}{query_str}"
+    mock_qa_prompt = QuestionAnswerPrompt(mock_qa_prompt_tmpl)
+
+    # same limits as the compact test: each compacted chunk holds 8 tokens
+    prompt_helper = PromptHelper(
+        11, 0, 0, tokenizer=mock_tokenizer, separator="\n\n", chunk_size_limit=4
+    )
+    service_context = ServiceContext.from_defaults(prompt_helper=prompt_helper)
+
+    query_str = "What is?"
+    texts = [
+        TextChunk("This\n\nis\n\na\n\nbar"),
+        TextChunk("This\n\nis\n\na\n\ntest"),
+        TextChunk("This\n\nis\n\nanother\n\ntest"),
+        TextChunk("This\n\nis\n\na\n\nfoo"),
+    ]
+
+    builder = ResponseBuilder(
+        service_context,
+        mock_qa_prompt,
+        mock_refine_prompt,
+        texts=texts,
+    )
+    response = builder.get_response(
+        query_str, mode=ResponseMode.MAP_REDUCE, num_children=2
+    )
+    # map: each compacted chunk is answered
+    map_contexts = [
+        call.kwargs["context_str"] for call in _mock_predict.call_args_list[:2]
+    ]
+    assert map_contexts == [
+        "This\n\nis\n\na\n\nbar\n\nThis\n\nis\n\na\n\ntest",
+        "This\n\nis\n\nanother\n\ntest\n\nThis\n\nis\n\na\n\nfoo",
+    ]
+    # reduce: the partial answers are summarized with a tree
+    assert _mock_predict.call_count > 2
+    assert str(response).startswith("What is?:What is?:")
+    # no event loop is used without use_async
+    assert _mock_apredict.call_count == 0
+
+    # with use_async, the chunks are answered concurrently
+    async_builder = ResponseBuilder(
+        service_context,
+        mock_qa_prompt,
+        mock_refine_prompt,
+        texts=texts,
+        use_async=True,
+    )
+    async_response = async_builder.get_response(
+        query_str, mode=ResponseMode.MAP_REDUCE, num_children=2
+    )
+    assert str(async_response) == str(response)
+    assert _mock_apredict.call_count > 2
+
+    # the async path gives the same answer
+    async_response = asyncio.run(
+        builder.aget_response(query_str, mode=ResponseMode.MAP_REDUCE, num_children=2)
+    )
+    assert str(async_response) == str(response)
+
+
+def mock_llmpredictor_stream(
+    prompt: Prompt, **prompt_args: Any
+) -> Tuple[Generator, str]:
+    """Mock stream method of LLMPredictor."""
+    response, formatted_prompt = mock_llmpredictor_predict(prompt, **prompt_args)
+    return (token for token in response.split(":")), formatted_prompt
+
+
+@patch_common
+@patch.object(LLMPredictor, "stream", side_effect=mock_llmpredictor_stream)
+def test_streaming_response(
+    _mock_stream: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    documents: List[Document],
+) -> None:
+    """Test that only the last refine step is streamed."""
+    prompt_helper = PromptHelper(MAX_CHUNK_SIZE, NUM_OUTPUTS, MAX_CHUNK_OVERLAP)
+    service_context = ServiceContext.from_defaults(prompt_helper=prompt_helper)
+    query_str = "What is?"
+
+    builder = ResponseBuilder(
+        service_context,
+        MOCK_TEXT_QA_PROMPT,
+        MOCK_REFINE_PROMPT,
+        texts=[TextChunk(documents[0].get_text())],
+        streaming=True,
+    )
+    response = builder.get_response(query_str)
+    assert isinstance(response, Generator)
+    assert get_response_text(response) == (
+        "What is?"
+        "Hello world."
+        "This is a test."
+        "This is another test."
+        "This is a test v2."
+    )
+    # the first three LLM calls are not streamed
+    assert _mock_predict.call_count == 3
+    assert _mock_stream.call_count == 1
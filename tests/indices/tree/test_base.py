@@ -1,5 +1,6 @@
 """Test tree index."""
 
+import asyncio
 from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import patch
 
@@ -19,6 +20,7 @@ from gpt_index.readers.schema.base import Document
 from tests.mock_utils.mock_decorator import patch_common
 from tests.mock_utils.mock_predict import (
     mock_llmchain_predict,
+    mock_llmpredictor_apredict,
     mock_llmpredictor_predict,
 )
 from tests.mock_utils.mock_prompts import (
@@ -218,6 +220,31 @@ def test_query(
     assert str(response) == ("What is?:Hello world.")
 
 
+@patch_common
+@patch.object(LLMPredictor, "apredict", side_effect=mock_llmpredictor_apredict)
+def test_async_query(
+    _mock_apredict: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    documents: List[Document],
+    struct_kwargs: Dict,
+) -> None:
+    """Test async query."""
+    index_kwargs, query_kwargs = struct_kwargs
+    tree = GPTTreeIndex.from_documents(documents, **index_kwargs)
+    num_predict_calls = _mock_predict.call_count
+
+    query_str = "What is?"
+    response = asyncio.run(tree.aquery(query_str, mode="default", **query_kwargs))
+    assert str(response) == ("What is?:Hello world.")
+    # node selection and synthesis both go through apredict
+    assert _mock_predict.call_count == num_predict_calls
+    assert _mock_apredict.call_count > 0
+
+
 @patch_common
 @patch.object(LLMPredictor, "apredict", side_effect=mock_llmpredictor_predict)
 def test_summarize_query(
@@ -315,6 +342,81 @@ def test_insert(
     assert nodes[0].ref_doc_id == "new_doc_test"
 
 
+def _check_batch_inserted_tree(tree: GPTTreeIndex) -> None:
+    """Check the tree after a batch insert of the new doc."""
+    # Before:
+    # "Hello world.\nThis is a test." and "This is another test.\nThis is a
+    # test v2." are the root nodes, with two children each
+    # After:
+    # "Hello world.\nThis is a test.\nThis is a new doc." (left root) has one
+    # child, the previous left root, which now has children "Hello world." and
+    # "This is a test.\nThis is a new doc."
+    left_root = _get_left_or_right_node(tree.docstore, tree.index_struct, None)
+    right_root = _get_left_or_right_node(
+        tree.docstore, tree.index_struct, None, left=False
+    )
+    assert left_root.text == "Hello world.\nThis is a test.\nThis is a new doc."
+    assert right_root.text == (
+        "This is another test.\nThis is a test v2.\nThis is another new doc."
+    )
+    assert len(tree.index_struct.get_children(left_root)) == 1
+    assert len(tree.index_struct.get_children(right_root)) == 2
+    left_root2 = _get_left_or_right_node(tree.docstore, tree.index_struct, left_root)
+    assert left_root2.text == "Hello world.\nThis is a test.\nThis is a new doc."
+    left_root3 = _get_left_or_right_node(tree.docstore, tree.index_struct, left_root2)
+    right_root3 = _get_left_or_right_node(
+        tree.docstore, tree.index_struct, left_root2, left=False
+    )
+    assert left_root3.text == "Hello world."
+    assert right_root3.text == "This is a test.\nThis is a new doc."
+
+
+@patch_common
+@patch.object(LLMPredictor, "apredict", side_effect=mock_llmpredictor_apredict)
+def test_insert_batch(
+    _mock_apredict: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    documents: List[Document],
+    struct_kwargs: Dict,
+) -> None:
+    """Test batched insert."""
+    index_kwargs, _ = struct_kwargs
+    # the mock insert prompt selects the left root node for the first new node
+    # only, so the second new node is inserted under the root
+    new_doc = Document("This is a new doc.\nThis is another new doc.")
+
+    # sync: LLM calls are made sequentially, without an event loop
+    tree = GPTTreeIndex.from_documents(documents, batch_insert=True, **index_kwargs)
+    num_predict_calls = _mock_predict.call_count
+    tree.insert(new_doc)
+    _check_batch_inserted_tree(tree)
+    # one insert prompt, two summaries per consolidation, one summary update
+    assert _mock_predict.call_count == num_predict_calls + 6
+    assert _mock_apredict.call_count == 0
+
+    # use_async: LLM calls of a level are made concurrently
+    tree = GPTTreeIndex.from_documents(
+        documents, batch_insert=True, use_async=True, **index_kwargs
+    )
+    num_apredict_calls = _mock_apredict.call_count
+    num_predict_calls = _mock_predict.call_count
+    tree.insert(new_doc)
+    _check_batch_inserted_tree(tree)
+    assert _mock_apredict.call_count == num_apredict_calls + 6
+    assert _mock_predict.call_count == num_predict_calls
+
+    # async insert
+    tree = GPTTreeIndex.from_documents(documents, **index_kwargs)
+    num_apredict_calls = _mock_apredict.call_count
+    asyncio.run(tree.ainsert(new_doc))
+    _check_batch_inserted_tree(tree)
+    assert _mock_apredict.call_count == num_apredict_calls + 6
+
+
 def _mock_tokenizer(text: str) -> int:
     """Mock tokenizer that splits by spaces."""
     return len(text.split(" "))
@@ -1,7 +1,12 @@
 """Test vector store indexes."""
 
+import asyncio
+import json
 import sys
-from typing import Any, Dict, List, Tuple, cast
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, cast
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -9,6 +14,7 @@ import pytest
 
 from gpt_index.data_structs.node_v2 import DocumentRelationship, Node
 from gpt_index.embeddings.openai import OpenAIEmbedding
+from gpt_index.langchain_helpers.chain_wrapper import LLMPredictor
 from gpt_index.indices.vector_store.vector_indices import (
     GPTFaissIndex,
     GPTSimpleVectorIndex,
@@ -16,6 +22,7 @@ from gpt_index.indices.vector_store.vector_indices import (
 from gpt_index.readers.schema.base import Document
 from gpt_index.vector_stores.simple import SimpleVectorStore
 from tests.mock_utils.mock_decorator import patch_common
+from tests.mock_utils.mock_predict import mock_llmpredictor_apredict
 from tests.mock_utils.mock_prompts import MOCK_REFINE_PROMPT, MOCK_TEXT_QA_PROMPT
 
 
@@ -361,6 +368,138 @@ def test_simple_insert(
         assert (node.text, embedding) in actual_node_tups
 
 
+@patch_common
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+def test_simple_from_document_iter(
+    _mock_embeds: Any,
+    _mock_embed: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    struct_kwargs: Dict,
+) -> None:
+    """Test building GPTSimpleVectorIndex from a document iterator."""
+    index_kwargs, query_kwargs = struct_kwargs
+    texts = [
+        "Hello world.",
+        "This is a test.",
+        "This is another test.",
+        "This is a test v2.",
+        "This is a test v3.",
+    ]
+    num_pulled = 0
+
+    def document_iter() -> Iterator[Document]:
+        nonlocal num_pulled
+        for i, text in enumerate(texts):
+            num_pulled += 1
+            yield Document(text, doc_id=f"doc_{i}")
+
+    index = GPTSimpleVectorIndex.from_document_iter(
+        document_iter(), batch_size=2, **index_kwargs
+    )
+    assert num_pulled == 5
+    assert len(index.index_struct.nodes_dict) == 5
+    for i in range(5):
+        assert index.docstore.get_document_hash(f"doc_{i}") is not None
+    assert _mock_embeds.call_count == 3
+
+    index.insert_iter(
+        iter([Document("This is bar test.", doc_id="doc_5")]), batch_size=2
+    )
+    assert len(index.index_struct.nodes_dict) == 6
+
+    # an empty iterator builds an empty index
+    index = GPTSimpleVectorIndex.from_document_iter(iter([]), **index_kwargs)
+    assert len(index.index_struct.nodes_dict) == 0
+
+
+@patch_common
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+def test_simple_refresh(
+    _mock_embeds: Any,
+    _mock_embed: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_splitter_overlap: Any,
+    _mock_splitter: Any,
+    struct_kwargs: Dict,
+) -> None:
+    """Test that refresh deletes and re-embeds changed documents in bulk."""
+    index_kwargs, _ = struct_kwargs
+    documents = [
+        Document("Hello world.", doc_id="doc_0"),
+        Document("This is a test.", doc_id="doc_1"),
+        Document("This is another test.", doc_id="doc_2"),
+    ]
+    index = GPTSimpleVectorIndex.from_documents(documents, **index_kwargs)
+    _mock_embeds.reset_mock()
+
+    new_documents = [
+        documents[0],
+        Document("This is a test v2.", doc_id="doc_1"),
+        Document("This is a test v3.", doc_id="doc_3"),
+    ]
+    refreshed_docs = index.refresh(new_documents, delete_removed=True)
+    assert refreshed_docs == [False, True, True]
+    # both changed documents are embedded in a single batch
+    assert _mock_embeds.call_count == 1
+
+    assert set(index.index_struct.doc_id_dict.keys()) == {"doc_0", "doc_1", "doc_3"}
+    assert len(index.index_struct.nodes_dict) == 3
+    assert isinstance(index._vector_store, SimpleVectorStore)
+    assert sorted(
+        index._vector_store.get(text_id) for text_id in index.index_struct.nodes_dict
+    ) == [[0, 0, 0, 0, 1], [0, 0, 0, 1, 0], [1, 0, 0, 0, 0]]
+
+
+@patch_common
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+def test_simple_update_reuses_embeddings(
+    _mock_embeds: Any,
+    _mock_embed: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_splitter_overlap: Any,
+    _mock_splitter: Any,
+    struct_kwargs: Dict,
+) -> None:
+    """Test that updating a document only embeds its changed nodes."""
+    index_kwargs, _ = struct_kwargs
+    document = Document("Hello world.\nThis is a test.", doc_id="doc_0")
+    index = GPTSimpleVectorIndex.from_documents([document], **index_kwargs)
+    _mock_embeds.reset_mock()
+
+    index.update(Document("Hello world.\nThis is a test v2.", doc_id="doc_0"))
+    _mock_embeds.assert_called_once_with(["This is a test v2."])
+
+    assert len(index.index_struct.nodes_dict) == 2
+    assert isinstance(index._vector_store, SimpleVectorStore)
+    for text_id, node_id in index.index_struct.nodes_dict.items():
+        node = index.docstore.get_node(node_id)
+        assert node.embedding is None
+        assert index._vector_store.get(text_id) == mock_get_text_embedding(node.text)
+
+
 @patch_common
 @patch.object(
     OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
@@ -425,6 +564,17 @@ def test_simple_delete(
         embedding = index._vector_store.get(text_id)
         assert (node.text, embedding, node.ref_doc_id) in actual_node_tups
 
+    # test delete many
+    index.delete_many(["test_id_0", "test_id_2", "test_id_missing"])
+    assert set(index.index_struct.doc_id_dict.keys()) == {"test_id_1", "test_id_3"}
+    assert len(index.index_struct.nodes_dict) == 2
+    for text_id in index.index_struct.nodes_dict.keys():
+        assert index._vector_store.get(text_id) in (
+            [0, 1, 0, 0, 0],
+            [0, 0, 0, 1, 0],
+        )
+    assert len(index._vector_store._text_ids) == 2
+
 
 @patch_common
 @patch.object(
@@ -472,6 +622,161 @@ def test_simple_query(
     assert str(response) == ("What is?:This is bar test.")
 
 
+def mock_get_query_embeddings(queries: List[str]) -> List[List[float]]:
+    """Mock get query embeddings."""
+    query_to_embedding = {
+        "What is?": [0, 0, 1, 0, 0],
+        "Hello?": [1, 0, 0, 0, 0],
+        "Test v2?": [0, 0, 0, 1, 0],
+    }
+    return [query_to_embedding[query] for query in queries]
+
+
+async def mock_aget_query_embeddings(queries: List[str]) -> List[List[float]]:
+    """Mock async get query embeddings."""
+    return mock_get_query_embeddings(queries)
+
+
+@patch_common
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+@patch.object(
+    OpenAIEmbedding, "_get_query_embeddings", side_effect=mock_get_query_embeddings
+)
+@patch.object(
+    OpenAIEmbedding, "_aget_query_embeddings", side_effect=mock_aget_query_embeddings
+)
+@patch.object(LLMPredictor, "apredict", side_effect=mock_llmpredictor_apredict)
+def test_simple_query_batch(
+    _mock_apredict: Any,
+    _mock_aquery_embeds: Any,
+    _mock_query_embeds: Any,
+    _mock_text_embeds: Any,
+    _mock_text_embed: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    documents: List[Document],
+    struct_kwargs: Dict,
+) -> None:
+    """Test batched queries."""
+    index_kwargs, query_kwargs = struct_kwargs
+    index = GPTSimpleVectorIndex.from_documents(documents, **index_kwargs)
+
+    responses = index.query_batch(["What is?", "Hello?", "Test v2?"], **query_kwargs)
+    assert [str(response) for response in responses] == [
+        "What is?:This is another test.",
+        "Hello?:Hello world.",
+        "Test v2?:This is a test v2.",
+    ]
+    # all queries are embedded in a single call
+    assert _mock_query_embeds.call_count == 1
+    # without use_async, responses are synthesized sequentially
+    assert _mock_apredict.call_count == 0
+
+    # similarity scores are tracked per query
+    assert responses[0].source_nodes[0].score == pytest.approx(1.0)
+    assert responses[1].source_nodes[0].score == pytest.approx(1.0)
+
+    responses = index.query_batch(
+        ["Hello?", "Test v2?"], use_async=True, **query_kwargs
+    )
+    assert [str(response) for response in responses] == [
+        "Hello?:Hello world.",
+        "Test v2?:This is a test v2.",
+    ]
+    assert _mock_apredict.call_count == 2
+
+    query_threads: List[int] = []
+    orig_query_batch = SimpleVectorStore.query_batch
+
+    def _query_batch(self: SimpleVectorStore, queries: Any) -> Any:
+        query_threads.append(threading.get_ident())
+        return orig_query_batch(self, queries)
+
+    with patch.object(SimpleVectorStore, "query_batch", _query_batch):
+        responses = asyncio.run(
+            index.aquery_batch(["Hello?", "Test v2?"], **query_kwargs)
+        )
+    assert [str(response) for response in responses] == [
+        "Hello?:Hello world.",
+        "Test v2?:This is a test v2.",
+    ]
+    # the vector store is queried outside of the event loop's thread
+    assert len(query_threads) == 1
+    assert query_threads[0] != threading.get_ident()
+    # the async path embeds and synthesizes without blocking calls
+    assert _mock_aquery_embeds.call_count == 1
+    assert _mock_query_embeds.call_count == 2
+    assert _mock_apredict.call_count == 4
+
+
+@patch_common
+@patch.object(
+    OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
+)
+@patch.object(
+    OpenAIEmbedding, "_get_text_embeddings", side_effect=mock_get_text_embeddings
+)
+@patch.object(
+    OpenAIEmbedding, "get_query_embedding", side_effect=mock_get_query_embedding
+)
+def test_simple_save_load_dir(
+    _mock_query_embed: Any,
+    _mock_text_embeds: Any,
+    _mock_text_embed: Any,
+    _mock_init: Any,
+    _mock_predict: Any,
+    _mock_total_tokens_used: Any,
+    _mock_split_text_overlap: Any,
+    _mock_split_text: Any,
+    documents: List[Document],
+    struct_kwargs: Dict,
+) -> None:
+    """Test saving and loading with the binary directory format."""
+    index_kwargs, query_kwargs = struct_kwargs
+    index = GPTSimpleVectorIndex.from_documents(documents, **index_kwargs)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index.save_to_dir(tmpdir)
+        with open(Path(tmpdir) / "index.json", "r") as f:
+            index_dict = json.load(f)
+        # embeddings are not stored in the JSON file
+        vector_store_data = index_dict["vector_store"]["__data__"]
+        assert (
+            vector_store_data["simple_vector_store_data_dict"]["embedding_dict"] == {}
+        )
+
+        new_index = GPTSimpleVectorIndex.load_from_dir(tmpdir)
+        vector_store = cast(SimpleVectorStore, new_index._vector_store)
+        assert isinstance(vector_store._embedding_matrix, np.memmap)
+
+        response = new_index.query("What is?", **query_kwargs)
+        assert str(response) == ("What is?:This is another test.")
+
+        # deletes and inserts don't modify the saved files
+        new_index.delete(documents[0].get_doc_id())
+        new_index.insert(Document(text="This is bar test."))
+        response = new_index.query("What is?", **query_kwargs)
+        assert str(response) == ("What is?:This is bar test.")
+
+        reloaded_index = GPTSimpleVectorIndex.load_from_dir(tmpdir, mmap=False)
+        response = reloaded_index.query("What is?", **query_kwargs)
+        assert str(response) == ("What is?:This is another test.")
+
+        # saving over the memory-mapped files
+        new_index.save_to_dir(tmpdir)
+        reloaded_index = GPTSimpleVectorIndex.load_from_dir(tmpdir)
+        response = reloaded_index.query("What is?", **query_kwargs)
+        assert str(response) == ("What is?:This is bar test.")
+
+
 @patch_common
 @patch.object(
     OpenAIEmbedding, "_get_text_embedding", side_effect=mock_get_text_embedding
@@ -677,7 +982,7 @@ def test_simple_check_ids(
     assert response.source_nodes[0].node.ref_doc_id == "ref_doc_id_test"
     assert response.source_nodes[0].node.doc_id == "node3"
     vector_store = cast(SimpleVectorStore, index._vector_store)
-    assert "node3" in vector_store._data.embedding_dict
+    assert vector_store.get("node3") == [0, 0, 1, 0, 0]
     assert "node3" in vector_store._data.text_id_to_doc_id
 
 
@@ -0,0 +1,91 @@
+"""Test ChatGPT retrieval plugin client."""
+
+import threading
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from gpt_index.data_structs.node_v2 import Node
+from gpt_index.vector_stores.chatgpt_plugin import ChatGPTRetrievalPluginClient
+from gpt_index.vector_stores.types import NodeEmbeddingResult, VectorStoreQuery
+
+
+class MockSession:
+    """Mock requests session, recording the requests made."""
+
+    def __init__(self) -> None:
+        """Init params."""
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def post(self, url: str, json: Dict[str, Any], **kwargs: Any) -> Any:
+        """Mock post."""
+        with self._lock:
+            self.requests.append({"url": url, "json": json})
+        response = MagicMock()
+        if url.endswith("/query"):
+            response.json.return_value = {
+                "results": [
+                    {
+                        "query": query["query"],
+                        "results": [
+                            {
+                                "id": f"{query['query']}_{i}",
+                                "text": f"text {i}",
+                                "score": 1.0 / (i + 1),
+                                "source_id": "doc",
+                            }
+                            for i in range(query["top_k"])
+                        ],
+                    }
+                    for query in json["queries"]
+                ]
+            }
+        return response
+
+
+def test_add() -> None:
+    """Test batched and concurrent upload of documents."""
+    embedding_results = [
+        NodeEmbeddingResult(
+            id=f"node_{i}", node=Node(text=f"text {i}"), embedding=[], doc_id="doc"
+        )
+        for i in range(5)
+    ]
+    for num_workers in [None, 2]:
+        client = ChatGPTRetrievalPluginClient(
+            "http://localhost", "token", batch_size=2, num_workers=num_workers
+        )
+        session = MockSession()
+        client._s = session  # type: ignore
+        ids = client.add(embedding_results)
+        assert ids == [f"node_{i}" for i in range(5)]
+
+        assert len(session.requests) == 3
+        uploaded_ids = sorted(
+            doc["id"]
+            for request in session.requests
+            for doc in request["json"]["documents"]
+        )
+        assert uploaded_ids == ids
+
+
+def test_query_batch() -> None:
+    """Test that several queries are sent in one request."""
+    client = ChatGPTRetrievalPluginClient("http://localhost", "token")
+    session = MockSession()
+    client._s = session  # type: ignore
+
+    results = client.query_batch(
+        [
+            VectorStoreQuery(query_str="foo", similarity_top_k=1),
+            VectorStoreQuery(query_str="bar", similarity_top_k=2),
+        ]
+    )
+    assert len(session.requests) == 1
+    assert results[0].ids == ["foo_0"]
+    assert results[1].ids == ["bar_0", "bar_1"]
+    assert results[1].similarities == [1.0, 0.5]
+
+    result = client.query(VectorStoreQuery(query_str="foo", similarity_top_k=2))
+    assert result.ids == ["foo_0", "foo_1"]
+    assert len(session.requests) == 2
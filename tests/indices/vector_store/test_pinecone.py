@@ -6,10 +6,16 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from gpt_index.data_structs.node_v2 import Node
 from gpt_index.embeddings.openai import OpenAIEmbedding
 from gpt_index.indices.vector_store.vector_indices import GPTPineconeIndex
 
 from gpt_index.readers.schema.base import Document
+from gpt_index.vector_stores.pinecone import (
+    PineconeVectorStore,
+    generate_sparse_vectors,
+)
+from gpt_index.vector_stores.types import NodeEmbeddingResult
 from tests.indices.vector_store.utils import MockPineconeIndex
 from tests.mock_utils.mock_decorator import patch_common
 from tests.mock_utils.mock_prompts import MOCK_REFINE_PROMPT, MOCK_TEXT_QA_PROMPT
@@ -108,8 +114,87 @@ def test_build_pinecone(
         documents=documents,
         pinecone_index=pinecone_index,
         tokenizer=mock_tokenizer,
-        **index_kwargs
+        **index_kwargs,
     )
 
     response = index.query("What is?", **query_kwargs)
     assert str(response) == ("What is?:This is another test.")
+
+
+class MockPaddingTokenizer:
+    """Mock tokenizer that pads a batch of texts to the same length."""
+
+    def __call__(self, texts: List[str]) -> Dict[str, List[List[int]]]:
+        """Mock tokenize."""
+        input_ids = [[len(token) for token in text.split()] for text in texts]
+        max_len = max(len(token_ids) for token_ids in input_ids)
+        return {
+            "input_ids": [
+                token_ids + [0] * (max_len - len(token_ids)) for token_ids in input_ids
+            ],
+            "attention_mask": [
+                [1] * len(token_ids) + [0] * (max_len - len(token_ids))
+                for token_ids in input_ids
+            ],
+        }
+
+
+def test_generate_sparse_vectors_padding() -> None:
+    """Test that padding tokens are not counted in sparse vectors."""
+    sparse_vectors = generate_sparse_vectors(
+        ["a bb", "a bb ccc dddd"], MockPaddingTokenizer()
+    )
+    assert sparse_vectors == [
+        {"indices": [1, 2], "values": [1.0, 1.0]},
+        {"indices": [1, 2, 3, 4], "values": [1.0, 1.0, 1.0, 1.0]},
+    ]
+
+
+class MockBatchTokenizer:
+    """Mock tokenizer over a batch of texts, counting calls."""
+
+    def __init__(self) -> None:
+        """Init params."""
+        self.num_calls = 0
+
+    def __call__(self, texts: List[str]) -> Dict[str, List[List[int]]]:
+        """Mock tokenize."""
+        self.num_calls += 1
+        return {"input_ids": [[len(token) for token in text.split()] for text in texts]}
+
+
+def test_add_batched() -> None:
+    """Test batched (and concurrent) upserts in PineconeVectorStore."""
+    # NOTE: mock pinecone import
+    sys.modules["pinecone"] = MagicMock()
+    embedding_results = [
+        NodeEmbeddingResult(
+            id=f"node_{i}",
+            node=Node(text=f"text {i}"),
+            embedding=[float(i), 0.0],
+            doc_id="doc",
+        )
+        for i in range(5)
+    ]
+
+    for num_workers in [None, 2]:
+        pinecone_index = MockPineconeIndex()
+        pinecone_index.upsert = MagicMock(  # type: ignore
+            side_effect=pinecone_index.upsert
+        )
+        tokenizer = MockBatchTokenizer()
+        vector_store = PineconeVectorStore(
+            pinecone_index=pinecone_index,
+            add_sparse_vector=True,
+            tokenizer=tokenizer,
+            batch_size=2,
+            num_workers=num_workers,
+        )
+        ids = vector_store.add(embedding_results)
+        assert ids == [f"node_{i}" for i in range(5)]
+        # one upsert and one tokenizer call per batch
+        assert pinecone_index.upsert.call_count == 3
+        assert tokenizer.num_calls == 3
+        entries = sorted(pinecone_index._tuples, key=lambda entry: entry["id"])
+        assert [entry["id"] for entry in entries] == ids
+        assert entries[0]["sparse_values"] == {"indices": [4, 1], "values": [1.0, 1.0]}
@@ -0,0 +1,139 @@
+"""Test simple vector store."""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from gpt_index.data_structs.node_v2 import Node
+from gpt_index.embeddings.base import SimilarityMode
+from gpt_index.vector_stores.simple import SimpleVectorStore
+from gpt_index.vector_stores.types import NodeEmbeddingResult, VectorStoreQuery
+
+
+def _get_embedding_results() -> List[NodeEmbeddingResult]:
+    """Get embedding results."""
+    embeddings = {
+        "a": [1.0, 0.0, 0.0],
+        "b": [0.0, 2.0, 0.0],
+        "c": [0.0, 0.0, 3.0],
+        "d": [1.0, 1.0, 0.0],
+    }
+    return [
+        NodeEmbeddingResult(
+            id=text_id, node=Node(text=text_id), embedding=emb, doc_id=f"doc_{text_id}"
+        )
+        for text_id, emb in embeddings.items()
+    ]
+
+
+def test_query_similarity_modes() -> None:
+    """Test top k ordering for each similarity mode."""
+    query = VectorStoreQuery(query_embedding=[1.0, 0.1, 0.0], similarity_top_k=2)
+
+    vector_store = SimpleVectorStore()
+    vector_store.add(_get_embedding_results())
+    result = vector_store.query(query)
+    assert result.ids == ["a", "d"]
+    assert result.similarities is not None
+    assert result.similarities[0] == pytest.approx(1 / np.sqrt(1.01), rel=1e-5)
+
+    vector_store = SimpleVectorStore(similarity_mode=SimilarityMode.DOT_PRODUCT)
+    vector_store.add(_get_embedding_results())
+    result = vector_store.query(query)
+    assert result.ids == ["d", "a"]
+    assert result.similarities == pytest.approx([1.1, 1.0])
+
+    vector_store = SimpleVectorStore(similarity_mode=SimilarityMode.EUCLIDEAN)
+    vector_store.add(_get_embedding_results())
+    result = vector_store.query(query)
+    assert result.ids == ["a", "d"]
+    assert result.similarities == pytest.approx([-0.1, -0.9], rel=1e-5)
+
+
+def test_add_delete_keeps_matrix_in_sync() -> None:
+    """Test that deletes and re-adds are reflected in queries."""
+    vector_store = SimpleVectorStore()
+    vector_store.add(_get_embedding_results())
+    vector_store.delete("doc_a")
+
+    query = VectorStoreQuery(query_embedding=[1.0, 0.0, 0.0], similarity_top_k=10)
+    result = vector_store.query(query)
+    assert result.ids is not None
+    assert set(result.ids) == {"b", "c", "d"}
+    assert result.ids[0] == "d"
+
+    # overwrite an existing id
+    vector_store.add(
+        [
+            NodeEmbeddingResult(
+                id="c", node=Node(text="c"), embedding=[1.0, 0.0, 0.0], doc_id="doc_c"
+            )
+        ]
+    )
+    result = vector_store.query(query)
+    assert result.ids is not None
+    assert len(result.ids) == 3
+    assert result.ids[0] == "c"
+
+    # load from the saved config
+    new_vector_store = SimpleVectorStore.from_dict(vector_store.config_dict)
+    new_result = new_vector_store.query(query)
+    assert new_result.ids == result.ids
+
+
+def test_query_empty() -> None:
+    """Test querying an empty vector store."""
+    vector_store = SimpleVectorStore()
+    result = vector_store.query(VectorStoreQuery(query_embedding=[1.0, 0.0]))
+    assert result.ids == []
+    assert result.similarities == []
+
+
+def test_query_batch() -> None:
+    """Test that batched queries match individual queries."""
+    vector_store = SimpleVectorStore()
+    vector_store.add(_get_embedding_results())
+    queries = [
+        VectorStoreQuery(query_embedding=[1.0, 0.1, 0.0], similarity_top_k=2),
+        VectorStoreQuery(query_embedding=[0.0, 0.0, 1.0], similarity_top_k=1),
+        VectorStoreQuery(query_embedding=[0.0, 1.0, 0.0], similarity_top_k=3),
+    ]
+    batch_results = vector_store.query_batch(queries)
+    assert len(batch_results) == 3
+    for query, batch_result in zip(queries, batch_results):
+        result = vector_store.query(query)
+        assert batch_result.ids == result.ids
+        assert batch_result.similarities == pytest.approx(result.similarities)
+    assert batch_results[1].ids == ["c"]
+
+
+def test_delete_many() -> None:
+    """Test deleting many docs, and persisting the doc_id -> text_ids map."""
+    vector_store = SimpleVectorStore()
+    embedding_results = _get_embedding_results()
+    # move "d" to the same doc as "c"
+    embedding_results[3].doc_id = "doc_c"
+    vector_store.add(embedding_results)
+
+    config_dict = vector_store.config_dict
+    assert config_dict["simple_vector_store_data_dict"]["doc_id_to_text_ids"] == {
+        "doc_a": ["a"],
+        "doc_b": ["b"],
+        "doc_c": ["c", "d"],
+    }
+
+    vector_store.delete_many(["doc_a", "doc_c", "doc_missing"])
+    query = VectorStoreQuery(query_embedding=[1.0, 1.0, 1.0], similarity_top_k=10)
+    assert vector_store.query(query).ids == ["b"]
+
+    # the reverse map is restored on load
+    new_vector_store = SimpleVectorStore.from_dict(vector_store.config_dict)
+    new_vector_store.delete("doc_b")
+    assert new_vector_store.query(query).ids == []
+
+    # the reverse map is rebuilt when loading data saved without it
+    del config_dict["simple_vector_store_data_dict"]["doc_id_to_text_ids"]
+    new_vector_store = SimpleVectorStore.from_dict(config_dict)
+    new_vector_store.delete("doc_c")
+    assert new_vector_store.query(query).ids == ["a", "b"]
@@ -0,0 +1,135 @@
+"""Test simple IVF vector store."""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from gpt_index.data_structs.node_v2 import Node
+from gpt_index.vector_stores.registry import (
+    load_vector_store_from_dict,
+    save_vector_store_to_dict,
+)
+from gpt_index.vector_stores.simple import SimpleVectorStore
+from gpt_index.vector_stores.simple_ivf import SimpleIVFVectorStore
+from gpt_index.vector_stores.types import NodeEmbeddingResult, VectorStoreQuery
+
+
+def _get_embedding_results(
+    num_embeddings: int = 500, dim: int = 16, num_docs: int = 50
+) -> List[NodeEmbeddingResult]:
+    """Get clustered random embedding results."""
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(10, dim))
+    embeddings = centers[rng.integers(0, 10, num_embeddings)] + 0.1 * rng.normal(
+        size=(num_embeddings, dim)
+    )
+    return [
+        NodeEmbeddingResult(
+            id=f"text_{i}",
+            node=Node(text=f"text_{i}"),
+            embedding=embedding.tolist(),
+            doc_id=f"doc_{i % num_docs}",
+        )
+        for i, embedding in enumerate(embeddings)
+    ]
+
+
+def _get_queries(num_queries: int = 20, dim: int = 16) -> List[VectorStoreQuery]:
+    """Get random queries."""
+    rng = np.random.default_rng(0)
+    return [
+        VectorStoreQuery(query_embedding=embedding.tolist(), similarity_top_k=5)
+        for embedding in rng.normal(size=(num_queries, dim))
+    ]
+
+
+def test_untrained_matches_brute_force() -> None:
+    """Test that queries are exact below the train threshold."""
+    embedding_results = _get_embedding_results()
+    exact_store = SimpleVectorStore()
+    exact_store.add(embedding_results)
+    ivf_store = SimpleIVFVectorStore()
+    ivf_store.add(embedding_results)
+    assert not ivf_store.is_trained
+
+    for query in _get_queries():
+        assert ivf_store.query(query).ids == exact_store.query(query).ids
+
+
+def test_recall() -> None:
+    """Test recall of the trained store against brute force."""
+    embedding_results = _get_embedding_results()
+    exact_store = SimpleVectorStore()
+    exact_store.add(embedding_results)
+    ivf_store = SimpleIVFVectorStore(nlist=10, nprobe=3, train_threshold=100)
+    ivf_store.add(embedding_results)
+    assert ivf_store.is_trained
+
+    queries = _get_queries()
+    num_found = 0
+    for query, result in zip(queries, ivf_store.query_batch(queries)):
+        exact_ids = exact_store.query(query).ids
+        assert exact_ids is not None and result.ids is not None
+        num_found += len(set(exact_ids) & set(result.ids))
+    assert num_found / (len(queries) * 5) >= 0.9
+
+    # probing every cluster is exact
+    ivf_store.nprobe = 10
+    for query in queries:
+        assert ivf_store.query(query).ids == exact_store.query(query).ids
+
+
+def test_delete_and_overwrite() -> None:
+    """Test deletes, overwrites and compaction of a trained store."""
+    ivf_store = SimpleIVFVectorStore(nlist=4, nprobe=4, train_threshold=10)
+    ivf_store.add(_get_embedding_results(num_embeddings=100, num_docs=10))
+    query = VectorStoreQuery(query_embedding=[1.0] * 16, similarity_top_k=100)
+
+    ivf_store.delete("doc_0")
+    result = ivf_store.query(query)
+    assert result.ids is not None
+    assert len(result.ids) == 90
+    assert "text_0" not in result.ids
+
+    # overwrite an existing id
+    ivf_store.add(
+        [
+            NodeEmbeddingResult(
+                id="text_1",
+                node=Node(text="text_1"),
+                embedding=[1.0] * 16,
+                doc_id="doc_1",
+            )
+        ]
+    )
+    result = ivf_store.query(query)
+    assert result.ids is not None
+    assert len(result.ids) == 90
+    assert result.ids[0] == "text_1"
+    assert ivf_store.get("text_1") == [1.0] * 16
+
+    # deleting more than half of the rows compacts the matrix
+    for doc_idx in range(1, 6):
+        ivf_store.delete(f"doc_{doc_idx}")
+    result = ivf_store.query(query)
+    assert result.ids is not None
+    assert len(result.ids) == 40
+    assert all(int(text_id.split("_")[1]) % 10 >= 6 for text_id in result.ids)
+    assert len(ivf_store._text_ids) < 101
+
+
+def test_save_load() -> None:
+    """Test saving and loading through the vector store registry."""
+    ivf_store = SimpleIVFVectorStore(nlist=10, nprobe=2, train_threshold=100)
+    ivf_store.add(_get_embedding_results())
+
+    new_ivf_store = load_vector_store_from_dict(save_vector_store_to_dict(ivf_store))
+    assert isinstance(new_ivf_store, SimpleIVFVectorStore)
+    assert new_ivf_store.is_trained
+    assert new_ivf_store.nprobe == 2
+    for query in _get_queries():
+        new_result = new_ivf_store.query(query)
+        result = ivf_store.query(query)
+        assert new_result.ids == result.ids
+        assert new_result.similarities == pytest.approx(result.similarities)
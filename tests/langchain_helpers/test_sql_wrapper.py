@@ -0,0 +1,38 @@
+"""Test SQL wrapper."""
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+from gpt_index.langchain_helpers.sql_wrapper import SQLDatabase
+
+
+def test_insert_many_into_table() -> None:
+    """Test that bulk inserts keep the order of the rows."""
+    engine = create_engine("sqlite:///:memory:")
+    metadata_obj = MetaData(bind=engine)
+    Table(
+        "test_table",
+        metadata_obj,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(16)),
+        Column("count", Integer),
+    )
+    metadata_obj.create_all()
+    sql_database = SQLDatabase(engine)
+
+    # ids are assigned in insertion order
+    sql_database.insert_many_into_table(
+        "test_table",
+        [
+            {"name": "name0", "count": 0},
+            {"name": "name1"},
+            {"name": "name2", "count": 2},
+            {"name": "name3"},
+        ],
+    )
+    _, result = sql_database.run_sql("SELECT id, name, count FROM test_table")
+    assert [tuple(row) for row in result["result"]] == [
+        (1, "name0", 0),
+        (2, "name1", None),
+        (3, "name2", 2),
+        (4, "name3", None),
+    ]
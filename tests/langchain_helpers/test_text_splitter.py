@@ -1,4 +1,6 @@
 """Test text splitter."""
+from typing import List
+
 from gpt_index.langchain_helpers.text_splitter import (
     SentenceSplitter,
     TokenTextSplitter,
@@ -19,6 +21,25 @@ def test_split_token() -> None:
     assert chunks == ["foo bar", "bar hello", "hello world"]
 
 
+def test_split_token_tokenizes_splits_once() -> None:
+    """Test that each split is only tokenized once."""
+    tokenized_texts: List[str] = []
+
+    def tokenizer(text: str) -> List[str]:
+        tokenized_texts.append(text)
+        return text.split(" ")
+
+    words = [f"word{i}" for i in range(20)]
+    text_splitter = TokenTextSplitter(
+        chunk_size=5, chunk_overlap=2, tokenizer=tokenizer
+    )
+    chunks = text_splitter.split_text(" ".join(words) + " " + " ".join(words))
+    assert chunks[0] == " ".join(words[:5])
+    # each unique word is tokenized once, the rest are chunk-level checks
+    word_counts = [text for text in tokenized_texts if " " not in text]
+    assert sorted(word_counts) == sorted(words)
+
+
 def test_truncate_token() -> None:
     """Test truncate normal token."""
     # tiktoken will say length is ~5k
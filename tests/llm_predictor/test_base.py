@@ -1,8 +1,17 @@
 """LLM predictor tests."""
 
-from typing import Any, Tuple
+import asyncio
+import os
+from tempfile import TemporaryDirectory
+from typing import Any, Generator, List, Tuple
 from unittest.mock import patch
 
+from langchain import OpenAI
+from langchain.chat_models import ChatOpenAI
+from langchain.schema import SystemMessage
+
+from gpt_index.llm_predictor.cache import InMemoryLLMCache, SQLiteLLMCache
+from gpt_index.llm_predictor.chatgpt import ChatGPTLLMPredictor
 from gpt_index.llm_predictor.structured import LLMPredictor, StructuredLLMPredictor
 from gpt_index.output_parsers.base import BaseOutputParser
 from gpt_index.prompts.prompts import Prompt, SimpleInputPrompt
@@ -43,3 +52,122 @@ def test_struct_llm_predictor(mock_init: Any, mock_predict: Any) -> None:
         prompt, query_str="hello world"
     )
     assert llm_prediction == "hello world"
+
+
+def mock_llmpredictor_inner_predict(prompt: Prompt, **prompt_args: Any) -> str:
+    """Mock LLMPredictor _predict."""
+    return prompt_args["query_str"].upper()
+
+
+async def mock_llmpredictor_inner_apredict(prompt: Prompt, **prompt_args: Any) -> str:
+    """Mock LLMPredictor _apredict."""
+    return mock_llmpredictor_inner_predict(prompt, **prompt_args)
+
+
+@patch.object(LLMPredictor, "_apredict", side_effect=mock_llmpredictor_inner_apredict)
+@patch.object(LLMPredictor, "_predict", side_effect=mock_llmpredictor_inner_predict)
+def test_llm_predictor_cache(mock_predict: Any, mock_apredict: Any) -> None:
+    """Test LLM predictor with a response cache."""
+    llm = OpenAI(temperature=0, openai_api_key="fake")
+    llm_predictor = LLMPredictor(llm=llm, llm_cache=InMemoryLLMCache())
+    prompt = SimpleInputPrompt("{query_str}")
+    llm_prediction, _ = llm_predictor.predict(prompt, query_str="hello world")
+    assert llm_prediction == "HELLO WORLD"
+    total_tokens_used = llm_predictor.total_tokens_used
+    assert total_tokens_used > 0
+
+    llm_prediction, _ = llm_predictor.predict(prompt, query_str="hello world")
+    assert llm_prediction == "HELLO WORLD"
+    llm_prediction, _ = asyncio.run(
+        llm_predictor.apredict(prompt, query_str="hello world")
+    )
+    assert llm_prediction == "HELLO WORLD"
+    assert mock_predict.call_count == 1
+    assert mock_apredict.call_count == 0
+    assert llm_predictor.cache_hits == 2
+    assert llm_predictor.cache_misses == 1
+    # cached responses are counted separately
+    assert llm_predictor.total_tokens_used == total_tokens_used
+    assert llm_predictor.total_cached_tokens == 2 * total_tokens_used
+
+    # different llm params are not served from the cache
+    llm_predictor._llm = OpenAI(temperature=0.5, openai_api_key="fake")
+    llm_predictor.predict(prompt, query_str="hello world")
+    assert mock_predict.call_count == 2
+
+
+@patch.object(LLMPredictor, "_predict", side_effect=mock_llmpredictor_inner_predict)
+def test_sqlite_llm_cache(mock_predict: Any) -> None:
+    """Test that the sqlite LLM cache persists responses and expires them."""
+    llm = OpenAI(temperature=0, openai_api_key="fake")
+    prompt = SimpleInputPrompt("{query_str}")
+    with TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "llm_cache.db")
+        llm_cache = SQLiteLLMCache(cache_path, ttl=60)
+        LLMPredictor(llm=llm, llm_cache=llm_cache).predict(prompt, query_str="hi")
+        llm_cache.close()
+
+        llm_cache = SQLiteLLMCache(cache_path, ttl=60)
+        llm_predictor = LLMPredictor(llm=llm, llm_cache=llm_cache)
+        llm_prediction, _ = llm_predictor.predict(prompt, query_str="hi")
+        assert llm_prediction == "HI"
+        assert mock_predict.call_count == 1
+
+        with patch("gpt_index.llm_predictor.cache.time.time", return_value=1e12):
+            llm_predictor.predict(prompt, query_str="hi")
+        assert mock_predict.call_count == 2
+        llm_cache.close()
+
+
+def mock_openai_stream(prompt: str, stop: Any = None) -> Generator:
+    """Mock OpenAI stream."""
+    for token in ["hello", " world"]:
+        yield {"choices": [{"text": token}]}
+
+
+def mock_chat_openai_stream(messages: List[dict], **kwargs: Any) -> Generator:
+    """Mock ChatOpenAI streamed completion."""
+    assert kwargs["stream"]
+    assert messages == [{"role": "user", "content": "hi"}]
+    yield {"choices": [{"delta": {"role": "assistant"}}]}
+    for token in ["hello", " world"]:
+        yield {"choices": [{"delta": {"content": token}}]}
+
+
+@patch.object(ChatOpenAI, "completion_with_retry", side_effect=mock_chat_openai_stream)
+@patch.object(OpenAI, "stream", side_effect=mock_openai_stream)
+def test_stream(mock_stream: Any, mock_chat_stream: Any) -> None:
+    """Test streaming with OpenAI and ChatOpenAI LLMs."""
+    prompt = SimpleInputPrompt("{query_str}")
+    for llm in [
+        OpenAI(temperature=0, openai_api_key="fake"),
+        ChatOpenAI(temperature=0, openai_api_key="fake"),
+    ]:
+        llm_predictor = LLMPredictor(llm=llm)
+        response_gen, formatted_prompt = llm_predictor.stream(prompt, query_str="hi")
+        assert formatted_prompt == "hi"
+        # tokens are counted once the stream is consumed
+        assert llm_predictor.total_tokens_used == 0
+        assert "".join(response_gen) == "hello world"
+        assert llm_predictor.total_tokens_used > 0
+    assert mock_stream.call_count == 1
+    assert mock_chat_stream.call_count == 1
+
+
+@patch.object(ChatOpenAI, "completion_with_retry")
+def test_stream_prepend_messages(mock_chat_stream: Any) -> None:
+    """Test that prepend_messages are sent when streaming."""
+    mock_chat_stream.return_value = iter(
+        [{"choices": [{"delta": {"content": "hello"}}]}]
+    )
+    prompt = SimpleInputPrompt("{query_str}")
+    llm_predictor = ChatGPTLLMPredictor(
+        llm=ChatOpenAI(temperature=0, openai_api_key="fake"),
+        prepend_messages=[SystemMessage(content="be brief")],
+    )
+    response_gen, _ = llm_predictor.stream(prompt, query_str="hi")
+    assert "".join(response_gen) == "hello"
+    assert mock_chat_stream.call_args.kwargs["messages"] == [
+        {"role": "system", "content": "be brief"},
+        {"role": "user", "content": "hi"},
+    ]
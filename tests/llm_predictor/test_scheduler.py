@@ -0,0 +1,125 @@
+"""LLM scheduler tests."""
+
+import asyncio
+from typing import Any, List, Tuple
+
+import openai
+import pytest
+
+from gpt_index.async_utils import run_async_tasks
+from gpt_index.llm_predictor.scheduler import LLMScheduler, RateLimiter
+from gpt_index.prompts.prompts import Prompt, SimpleInputPrompt
+from gpt_index.utils import AdaptiveBackoff
+
+
+class MockAsyncLLMPredictor:
+    """Mock LLM predictor tracking the number of calls in flight."""
+
+    def __init__(self, num_failures: int = 0) -> None:
+        """Init params."""
+        self.num_failures = num_failures
+        self.num_calls = 0
+        self.num_in_flight = 0
+        self.max_in_flight = 0
+
+    async def apredict(self, prompt: Prompt, **prompt_args: Any) -> Tuple[str, str]:
+        """Mock apredict."""
+        self.num_calls += 1
+        if self.num_failures > 0:
+            self.num_failures -= 1
+            raise openai.error.RateLimitError("rate limited")
+        self.num_in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.num_in_flight)
+        await asyncio.sleep(0.01)
+        self.num_in_flight -= 1
+        formatted_prompt = prompt.format(**prompt_args)
+        return formatted_prompt.upper(), formatted_prompt
+
+
+def test_max_in_flight() -> None:
+    """Test that the number of concurrent calls is bounded."""
+    llm_predictor = MockAsyncLLMPredictor()
+    scheduler = LLMScheduler(max_in_flight=2)
+    prompt = SimpleInputPrompt("{query_str}")
+    queries = [f"query {i}" for i in range(10)]
+
+    outputs: List[Tuple[str, str]] = run_async_tasks(
+        [scheduler.apredict(llm_predictor, prompt, query_str=q) for q in queries]
+    )
+    assert [output[0] for output in outputs] == [q.upper() for q in queries]
+    assert llm_predictor.max_in_flight == 2
+
+    # the scheduler can be reused across event loops
+    outputs = run_async_tasks(
+        [scheduler.apredict(llm_predictor, prompt, query_str=q) for q in queries]
+    )
+    assert len(outputs) == 10
+
+
+def test_retry() -> None:
+    """Test that throttled calls are retried."""
+    prompt = SimpleInputPrompt("{query_str}")
+    scheduler = LLMScheduler(max_retries=3)
+    scheduler._backoff = AdaptiveBackoff(min_backoff_secs=0.0)
+
+    llm_predictor = MockAsyncLLMPredictor(num_failures=2)
+    response, _ = asyncio.run(scheduler.apredict(llm_predictor, prompt, query_str="hi"))
+    assert response == "HI"
+    assert llm_predictor.num_calls == 3
+
+    llm_predictor = MockAsyncLLMPredictor(num_failures=3)
+    with pytest.raises(openai.error.RateLimitError):
+        asyncio.run(scheduler.apredict(llm_predictor, prompt, query_str="hi"))
+
+
+def test_rate_limiter() -> None:
+    """Test rate limiter."""
+    rate_limiter = RateLimiter(60)
+    # a minute's worth of budget can be used in a burst
+    assert all(rate_limiter.reserve(1) == 0 for _ in range(60))
+    # after which each request waits for the budget to refill
+    assert rate_limiter.reserve(1) == pytest.approx(1.0, abs=0.1)
+    assert rate_limiter.reserve(1) == pytest.approx(2.0, abs=0.1)
+
+
+class MockLLMPredictor:
+    """Mock blocking LLM predictor, failing a number of times."""
+
+    def __init__(self, num_failures: int = 0) -> None:
+        """Init params."""
+        self.num_failures = num_failures
+        self.num_calls = 0
+
+    def predict(self, prompt: Prompt, **prompt_args: Any) -> Tuple[str, str]:
+        """Mock predict."""
+        self.num_calls += 1
+        if self.num_failures > 0:
+            self.num_failures -= 1
+            raise openai.error.RateLimitError("rate limited")
+        formatted_prompt = prompt.format(**prompt_args)
+        return formatted_prompt.upper(), formatted_prompt
+
+
+def test_predict() -> None:
+    """Test blocking calls, which share the backoff and rate limits."""
+    prompt = SimpleInputPrompt("{query_str}")
+    scheduler = LLMScheduler(max_retries=3, requests_per_minute=60)
+    scheduler._backoff = AdaptiveBackoff(min_backoff_secs=0.01)
+
+    llm_predictor = MockLLMPredictor()
+    response, _ = scheduler.predict(llm_predictor, prompt, query_str="hi")
+    assert response == "HI"
+    assert llm_predictor.num_calls == 1
+
+    # throttled blocking calls are left to the predictor's own retries,
+    # but still back off the other scheduled calls
+    llm_predictor = MockLLMPredictor(num_failures=1)
+    with pytest.raises(openai.error.RateLimitError):
+        scheduler.predict(llm_predictor, prompt, query_str="hi")
+    assert llm_predictor.num_calls == 1
+    assert scheduler._backoff.backoff_secs > 0
+
+    # the blocking calls used the request budget of the scheduler
+    assert scheduler._request_limiter is not None
+    assert scheduler._request_limiter.reserve(0) == 0
+    assert scheduler._request_limiter._available == pytest.approx(58, abs=0.1)
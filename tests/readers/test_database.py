@@ -0,0 +1,58 @@
+"""Test database reader."""
+
+from tempfile import TemporaryDirectory
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+from gpt_index.langchain_helpers.sql_wrapper import SQLDatabase
+from gpt_index.readers.database import DatabaseReader
+
+
+def test_database_reader() -> None:
+    """Test bulk insert, streaming and keyset pagination."""
+    with TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{tmp_dir}/test.db")
+        metadata_obj = MetaData(bind=engine)
+        Table(
+            "test_table",
+            metadata_obj,
+            Column("id", Integer, primary_key=True),
+            Column("name", String(16)),
+            Column("count", Integer),
+        )
+        metadata_obj.create_all()
+        sql_database = SQLDatabase(engine)
+        # rows with different columns are inserted
+        sql_database.insert_many_into_table(
+            "test_table",
+            [{"id": i, "name": f"name{i}", "count": i} for i in range(4)]
+            + [{"id": 4, "name": "name4"}],
+        )
+
+        reader = DatabaseReader(sql_database=sql_database)
+        documents = reader.load_data("SELECT * FROM test_table")
+        assert [doc.get_text() for doc in documents] == [
+            "0, name0, 0",
+            "1, name1, 1",
+            "2, name2, 2",
+            "3, name3, 3",
+            "4, name4, None",
+        ]
+
+        lazy_documents = reader.lazy_load_data("SELECT * FROM test_table", batch_size=2)
+        assert [doc.get_text() for doc in lazy_documents] == [
+            doc.get_text() for doc in documents
+        ]
+
+        documents = list(reader.lazy_load_table("test_table", "id", batch_size=2))
+        assert [doc.get_text() for doc in documents][-1] == "4, name4, None"
+        assert [doc.extra_info for doc in documents] == [{"id": i} for i in range(5)]
+
+        # resume after the third row
+        documents = list(
+            reader.lazy_load_table("test_table", "id", batch_size=2, start_after=2)
+        )
+        assert [doc.get_text() for doc in documents] == [
+            "3, name3, 3",
+            "4, name4, None",
+        ]
@@ -1,5 +1,6 @@
 """Test file reader."""
 
+import os
 from tempfile import TemporaryDirectory
 from typing import Any, Dict
 
@@ -278,3 +279,54 @@ def test_excluded_files() -> None:
                         "test2.txt",
                         "test4.txt",
                     }
+
+
+def test_parallel_and_lazy_load() -> None:
+    """Test loading files in worker processes, and lazily."""
+    with TemporaryDirectory() as tmp_dir:
+        for i in range(4):
+            with open(f"{tmp_dir}/test{i}.txt", "w") as f:
+                f.write(f"test{i}")
+
+        reader = SimpleDirectoryReader(tmp_dir, num_workers=2)
+        documents = reader.load_data()
+        assert [doc.get_text() for doc in documents] == [f"test{i}" for i in range(4)]
+
+        documents = list(reader.lazy_load_data())
+        assert [doc.get_text() for doc in documents] == [f"test{i}" for i in range(4)]
+
+
+def test_load_incremental_data() -> None:
+    """Test loading only new or modified files."""
+    with TemporaryDirectory() as tmp_dir:
+        manifest_path = f"{tmp_dir}/manifest.json"
+        input_dir = f"{tmp_dir}/data"
+        os.mkdir(input_dir)
+        for i in range(3):
+            with open(f"{input_dir}/test{i}.txt", "w") as f:
+                f.write(f"test{i}")
+
+        result = SimpleDirectoryReader(input_dir).load_incremental_data(manifest_path)
+        assert [doc.get_text() for doc in result.documents] == [
+            "test0",
+            "test1",
+            "test2",
+        ]
+        assert result.deleted_doc_ids == []
+        doc_ids = [doc.get_doc_id() for doc in result.documents]
+
+        # nothing changed
+        result = SimpleDirectoryReader(input_dir).load_incremental_data(manifest_path)
+        assert result.documents == []
+        assert result.deleted_doc_ids == []
+
+        # touched but not modified, modified, removed and new files
+        os.utime(f"{input_dir}/test0.txt", (0, 0))
+        with open(f"{input_dir}/test1.txt", "w") as f:
+            f.write("test1 v2")
+        os.remove(f"{input_dir}/test2.txt")
+        with open(f"{input_dir}/test3.txt", "w") as f:
+            f.write("test3")
+        result = SimpleDirectoryReader(input_dir).load_incremental_data(manifest_path)
+        assert [doc.get_text() for doc in result.documents] == ["test1 v2", "test3"]
+        assert sorted(result.deleted_doc_ids) == sorted(doc_ids[1:])
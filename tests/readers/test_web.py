@@ -0,0 +1,160 @@
+"""Test web readers."""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
+
+from gpt_index.readers.web import RssReader, SimpleWebPageReader, _convert_all
+
+
+class MockSession:
+    """Mock requests session serving pages with ETags."""
+
+    def __init__(self) -> None:
+        """Init params."""
+        self.num_downloads = 0
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self.max_in_flight: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(
+        self, url: str, headers: Dict[str, str], timeout: Optional[float] = None
+    ) -> Any:
+        """Mock get."""
+        host = urlparse(url).netloc
+        with self._lock:
+            self._in_flight[host] += 1
+            self.max_in_flight[host] = max(
+                self.max_in_flight[host], self._in_flight[host]
+            )
+        time.sleep(0.01)
+        with self._lock:
+            self._in_flight[host] -= 1
+
+        response = MagicMock()
+        etag = f'"{url}"'
+        if headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response.text = ""
+        else:
+            self.num_downloads += 1
+            response.status_code = 200
+            response.text = f"page {url}"
+        response.headers = {"ETag": etag}
+        return response
+
+
+def test_simple_web_page_reader() -> None:
+    """Test concurrent fetching and conditional GET caching."""
+    urls = [f"http://host{i % 2}.com/{i}" for i in range(8)]
+    reader = SimpleWebPageReader(num_workers=8, max_requests_per_host=2)
+    session = MockSession()
+    reader._session = session  # type: ignore
+
+    documents = reader.load_data(urls)
+    assert [document.get_text() for document in documents] == [
+        f"page {url}" for url in urls
+    ]
+    assert session.num_downloads == 8
+    assert max(session.max_in_flight.values()) <= 2
+
+    # unchanged pages are served from the cache
+    documents = reader.load_data(urls + ["http://host0.com/new"])
+    assert [document.get_text() for document in documents] == [
+        f"page {url}" for url in urls + ["http://host0.com/new"]
+    ]
+    assert session.num_downloads == 9
+
+
+def test_simple_web_page_reader_html_to_text() -> None:
+    """Test that cached pages keep their converted text."""
+    html2text = MagicMock()
+    html2text.html2text.side_effect = lambda text: f"CONVERTED({text})"
+    with patch.dict(sys.modules, {"html2text": html2text}):
+        reader = SimpleWebPageReader(html_to_text=True)
+        session = MockSession()
+        reader._session = session  # type: ignore
+
+        urls = ["http://host.com/0", "http://host.com/1"]
+        expected_texts = [f"CONVERTED(page {url})" for url in urls]
+        documents = reader.load_data(urls)
+        assert [document.get_text() for document in documents] == expected_texts
+
+        # unchanged pages are neither downloaded nor converted again
+        documents = reader.load_data(urls)
+        assert [document.get_text() for document in documents] == expected_texts
+        assert session.num_downloads == 2
+        assert html2text.html2text.call_count == 2
+
+
+class _AttrDict(dict):
+    """Dict with attribute access, like feedparser's FeedParserDict."""
+
+    def __getattr__(self, name: str) -> Any:
+        return self[name]
+
+
+def _mock_parse(url: str, etag: Optional[str] = None, modified: Any = None) -> Any:
+    """Mock feedparser.parse, serving feeds with ETags."""
+    if etag == f'"{url}"':
+        return _AttrDict(status=304, entries=[])
+    entries = [
+        _AttrDict(title=f"{url} {i}", link=url, description=f"entry {url} {i}")
+        for i in range(2)
+    ]
+    return _AttrDict(status=200, etag=f'"{url}"', entries=entries)
+
+
+def test_rss_reader() -> None:
+    """Test that unchanged feeds are served from the cache."""
+    feedparser = MagicMock()
+    feedparser.parse.side_effect = _mock_parse
+    with patch.dict(sys.modules, {"feedparser": feedparser}):
+        reader = RssReader(num_workers=2)
+        urls = ["http://host.com/feed0", "http://host.com/feed1"]
+        expected_texts = [f"entry {url} {i}" for url in urls for i in range(2)]
+
+        documents = reader.load_data(urls)
+        assert [document.get_text() for document in documents] == expected_texts
+
+        # the second load sends the cached etags, and gets 304 responses
+        documents = reader.load_data(urls)
+        assert [document.get_text() for document in documents] == expected_texts
+        assert [
+            call.kwargs["etag"] for call in feedparser.parse.call_args_list[2:]
+        ] == [f'"{url}"' for url in urls]
+
+
+def test_convert_all() -> None:
+    """Test converting in a process pool."""
+    inputs: List[str] = [f"page {i}" for i in range(10)]
+    assert _convert_all(str.upper, inputs, num_workers=2) == [
+        f"PAGE {i}" for i in range(10)
+    ]
+    assert _convert_all(str.upper, inputs, num_workers=None) == [
+        f"PAGE {i}" for i in range(10)
+    ]
+
+
+def test_convert_all_caps_processes() -> None:
+    """Test that the process pool is capped at the number of CPUs."""
+    inputs = [f"page {i}" for i in range(10)]
+    with patch("gpt_index.readers.web.os.cpu_count", return_value=2), patch(
+        "gpt_index.readers.web.ProcessPoolExecutor"
+    ) as executor_cls:
+        executor_cls.return_value.__enter__.return_value.map.return_value = []
+        _convert_all(str.upper, inputs, num_workers=16)
+    executor_cls.assert_called_once_with(max_workers=2)
+
+    # a single CPU converts in the current process
+    with patch("gpt_index.readers.web.os.cpu_count", return_value=1), patch(
+        "gpt_index.readers.web.ProcessPoolExecutor"
+    ) as executor_cls:
+        assert _convert_all(str.upper, inputs, num_workers=16) == [
+            f"PAGE {i}" for i in range(10)
+        ]
+    executor_cls.assert_not_called()
@@ -1,14 +1,17 @@
 """Test utils."""
 
-from typing import Optional, Type, Union
+from typing import List, Optional, Type, Union
 
 import pytest
 
 from gpt_index.utils import (
+    MAX_CACHED_TOKEN_COUNT_TEXT_LEN,
     ErrorToRetry,
+    count_tokens,
     globals_helper,
     retry_on_exceptions_with_backoff,
     iter_batch,
+    run_batches,
 )
 
 
@@ -23,6 +26,25 @@ def test_tokenizer() -> None:
     assert len(tokenizer(text)) == 4
 
 
+def test_count_tokens() -> None:
+    """Test that token counts of short texts are memoized."""
+    tokenized_texts: List[str] = []
+
+    def tokenizer(text: str) -> List[str]:
+        tokenized_texts.append(text)
+        return text.split(" ")
+
+    assert count_tokens("hello world", tokenizer) == 2
+    assert count_tokens("hello world", tokenizer) == 2
+    assert tokenized_texts == ["hello world"]
+    assert count_tokens("hello world foo bar") == 4
+
+    long_text = "a " * MAX_CACHED_TOKEN_COUNT_TEXT_LEN
+    count_tokens(long_text, tokenizer)
+    count_tokens(long_text, tokenizer)
+    assert len(tokenized_texts) == 3
+
+
 call_count = 0
 
 
@@ -109,3 +131,18 @@ def test_iter_batch() -> None:
     assert list(iter_batch(gen, 3)) == [[0, 1, 2], [3, 4]]
 
     assert list(iter_batch([], 3)) == []
+
+
+@pytest.mark.parametrize("num_workers", [None, 1, 3])
+def test_run_batches(num_workers: Optional[int]) -> None:
+    """Check run_batches runs every batch and surfaces errors."""
+    seen: List[List[int]] = []
+    run_batches(seen.append, [[0, 1], [2, 3], [4]], num_workers=num_workers)
+    assert sorted(seen) == [[0, 1], [2, 3], [4]]
+
+    def _fail_on_last(batch: List[int]) -> None:
+        if 4 in batch:
+            raise ValueError("failed batch")
+
+    with pytest.raises(ValueError):
+        run_batches(_fail_on_last, [[0, 1], [2, 3], [4]], num_workers=num_workers)